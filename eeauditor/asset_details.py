@@ -0,0 +1,63 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import json
+
+# Key of the AssetDetailsCache within the Auditor cache handed to every Check
+ASSET_DETAILS_CACHE_KEY = "electriceye_asset_details"
+
+class AssetDetailsCache(object):
+    """
+    Per-run cache of base64 encoded `ProductFields.AssetDetails`, keyed by the identity of the Asset (its ARN or ID).
+    Every Check of an Auditor, and every rule a Check loops over, encodes the same Asset again, with this cache the Asset
+    is serialized once and all of its findings share the same encoded buffer. An entry is only reused for the very same
+    Asset object, a different object under the same ARN or ID (e.g., re-fetched by a Check) is encoded again
+    """
+
+    def __init__(self):
+        self.assets = {}
+        self.hits = 0
+
+    def encode(self, asset, assetId=None) -> bytes:
+        key = assetId if assetId is not None else id(asset)
+        entry = self.assets.get(key)
+        if entry is not None and entry[0] is asset:
+            self.hits += 1
+            return entry[1]
+
+        assetB64 = base64.b64encode(json.dumps(asset, default=str).encode("utf-8"))
+        # The Asset is held with its encoding so the id() of a freed Asset can never be matched to another object
+        self.assets[key] = (asset, assetB64)
+
+        return assetB64
+
+def encode_asset_details(cache: dict, asset, assetId: str = None) -> bytes:
+    """
+    Returns the base64 encoded JSON of an Asset for `ProductFields.AssetDetails`, the same value as
+    `base64.b64encode(json.dumps(asset, default=str).encode("utf-8"))`, from the AssetDetailsCache stored in the Auditor
+    `cache` so it lives exactly as long as the Auditor's run. Assets must not be modified after they are first encoded
+    """
+    # dict methods are used directly so the single-flight locking of a SingleFlightCache is never involved
+    assetDetailsCache = dict.get(cache, ASSET_DETAILS_CACHE_KEY)
+    if assetDetailsCache is None:
+        assetDetailsCache = dict.setdefault(cache, ASSET_DETAILS_CACHE_KEY, AssetDetailsCache())
+
+    return assetDetailsCache.encode(asset, assetId)
@@ -22,30 +22,17 @@ import datetime
 import botocore.exceptions
 from dateutil.parser import parse
 from check_register import CheckRegister
+import aws_inventory
 import base64
 import json
-from botocore.config import Config
-
-# Adding backoff and retries for SSM - this API gets throttled a lot
-config = Config(
-   retries = {
-      'max_attempts': 10,
-      'mode': 'adaptive'
-   }
-)
 
 registry = CheckRegister()
 
 def describe_volumes(cache, session):
-    ec2 = session.client("ec2")
     response = cache.get("describe_volumes")
     if response:
         return response
-    cache["describe_volumes"] = ec2.describe_volumes(
-        DryRun=False,
-        MaxResults=500,
-        Filters=[{"Name": "status", "Values": ["available", "in-use"]}]
-    )
+    cache["describe_volumes"] = {"Volumes": aws_inventory.describe_volumes(session)}
     return cache["describe_volumes"]
 
 def describe_instances(cache, session):
@@ -53,92 +40,37 @@ def describe_instances(cache, session):
     if response:
         return response
     
-    instanceList = []
-    
-    ec2 = session.client("ec2")
-    ssm = session.client("ssm", config=config)
-    # Enrich EC2 with SSM details - this is done for the EC2 Auditor - all others using EC2 don't matter too much
-    managedInstances = ssm.describe_instance_information()["InstanceInformationList"]
-
-    for page in ec2.get_paginator("describe_instances").paginate(
-            Filters=[
-                {
-                    "Name": "instance-state-name",
-                    "Values": [ 
-                        "running",
-                        "stopped" 
-                    ]
-                }
-            ]
-        ):
-        for r in page["Reservations"]:
-            for i in r["Instances"]:
-                # Use a list comprehension to attempt to get SSM info for the instance
-                managedInstanceInfo = [mnginst for mnginst in managedInstances if mnginst["InstanceId"] == i["InstanceId"]]
-                i["ManagedInstanceInformation"] = managedInstanceInfo
-                instanceList.append(i)
-
-        cache["describe_instances"] = instanceList
-        return cache["describe_instances"]
+    # Enrich EC2 with SSM details - copy the Instance as the inventory is shared with other Auditors
+    cache["describe_instances"] = [
+        {
+            **i,
+            "ManagedInstanceInformation": aws_inventory.get_managed_instance_information(session, i["InstanceId"])
+        } for i in aws_inventory.describe_instances(session)
+    ]
+    return cache["describe_instances"]
 
 # loop through DynamoDB tables
 def list_tables(cache, session):
-    dynamodb = session.client("dynamodb")
-    ddbTables = []
     response = cache.get("list_tables")
     if response:
         return response
-    paginator = dynamodb.get_paginator("list_tables")
-    if paginator:
-        for page in paginator.paginate():
-            for cluster in page["TableNames"]:
-                ddbTables.append(cluster)
-        cache["list_tables"] = ddbTables
-        return cache["list_tables"]
+    cache["list_tables"] = aws_inventory.list_tables(session)
+    return cache["list_tables"]
 
 # loop through RDS/Aurora DB Instances
 def describe_db_instances(cache, session):
-    rds = session.client("rds")
-    dbInstances = []
     response = cache.get("describe_db_instances")
     if response:
         return response
-    paginator = rds.get_paginator('describe_db_instances')
-    if paginator:
-        for page in paginator.paginate(
-            Filters=[
-                {
-                    "Name": "engine",
-                    "Values": [
-                        "aurora-mysql",
-                        "aurora-postgresql",
-                        "mariadb",
-                        "mysql",
-                        "oracle-ee",
-                        "oracle-ee-cdb",
-                        "oracle-se2",
-                        "oracle-se2-cdb",
-                        "postgres",
-                        "sqlserver-ee",
-                        "sqlserver-se",
-                        "sqlserver-ex",
-                        "sqlserver-web"
-                    ]
-                }
-            ]
-        ):
-            for dbinstance in page["DBInstances"]:
-                dbInstances.append(dbinstance)
-    cache["describe_db_instances"] = dbInstances
+    cache["describe_db_instances"] = aws_inventory.describe_db_instances(session)
     return cache["describe_db_instances"]
 
 # loop through EFS file systems
 def describe_file_systems(cache, session):
-    efs = session.client("efs")
     response = cache.get("describe_file_systems")
     if response:
         return response
-    cache["describe_file_systems"] = efs.describe_file_systems()
+    cache["describe_file_systems"] = {"FileSystems": aws_inventory.describe_file_systems(session)}
     return cache["describe_file_systems"]
 
 # loop through Neptune clusters
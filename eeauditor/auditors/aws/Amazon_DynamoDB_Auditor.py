@@ -20,6 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
+import aws_inventory
 import base64
 import json
 
@@ -29,19 +30,8 @@ def list_tables(cache, session):
     response = cache.get("list_tables")
     if response:
         return response
-    
-    dynamodb = session.client("dynamodb")
-    ddbTables = []
-    
-    for page in dynamodb.get_paginator("list_tables").paginate():
-        for table in page["TableNames"]:
-            ddbTables.append(
-                dynamodb.describe_table(
-                    TableName=table
-                )
-            )
 
-    cache["list_tables"] = ddbTables
+    cache["list_tables"] = aws_inventory.describe_tables(session)
     return cache["list_tables"]
 
 @registry.register_check("dynamodb")
@@ -20,6 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
+import aws_inventory
 import base64
 import json
 
@@ -29,14 +30,8 @@ def describe_volumes(cache, session):
     response = cache.get("describe_volumes")
     if response:
         return response
-    
-    ec2 = session.client("ec2")
 
-    cache["describe_volumes"] = ec2.describe_volumes(
-        DryRun=False,
-        MaxResults=500,
-        Filters=[{"Name": "status", "Values": ["available", "in-use"]}]
-    )["Volumes"]
+    cache["describe_volumes"] = aws_inventory.describe_volumes(session)
     return cache["describe_volumes"]
 
 def describe_snapshots(cache, session, awsAccountId):
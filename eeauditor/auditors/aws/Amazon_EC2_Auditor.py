@@ -24,6 +24,8 @@ import os
 import sys
 from botocore.config import Config
 from check_register import CheckRegister
+from asset_details import encode_asset_details
+import aws_inventory
 from botocore.exceptions import ClientError
 import requests
 import datetime
@@ -51,52 +53,28 @@ def describe_instances(cache, session):
         return response
     
     instanceList = []
-    
-    ec2 = session.client("ec2")
-    ssm = session.client("ssm", config=config)
-    # Enrich EC2 with SSM details - this is done for the EC2 Auditor - all others using EC2 don't matter too much
-    managedInstances = ssm.describe_instance_information()["InstanceInformationList"]
 
-    for page in ec2.get_paginator("describe_instances").paginate(
-            Filters=[
-                {
-                    "Name": "instance-state-name",
-                    "Values": [ 
-                        "running",
-                        "stopped" 
-                    ]
-                }
-            ]
-        ):
-        for r in page["Reservations"]:
-            for i in r["Instances"]:
-                # Skip Spot Instances, based on the fleet ID or status
-                try:
-                    if i["InstanceLifecycle"] == "spot":
-                        continue
-                except KeyError:
-                    pass
-                try:
-                    i["SpotInstanceRequestId"]
-                    continue
-                except KeyError:
-                    pass
-                # Use a list comprehension to attempt to get SSM info for the instance
-                managedInstanceInfo = [mnginst for mnginst in managedInstances if mnginst["InstanceId"] == i["InstanceId"]]
-                i["ManagedInstanceInformation"] = managedInstanceInfo
-                instanceList.append(i)
+    for i in aws_inventory.describe_instances(session):
+        # Skip Spot Instances, based on the fleet ID or status
+        if i.get("InstanceLifecycle") == "spot" or "SpotInstanceRequestId" in i:
+            continue
+        # Enrich EC2 with SSM details - copy the Instance as the inventory is shared with other Auditors
+        instanceList.append(
+            {
+                **i,
+                "ManagedInstanceInformation": aws_inventory.get_managed_instance_information(session, i["InstanceId"])
+            }
+        )
 
-        cache["describe_instances"] = instanceList
-        return cache["describe_instances"]
+    cache["describe_instances"] = instanceList
+    return cache["describe_instances"]
 
 def describe_elastic_ips(cache, session):
     response = cache.get("describe_elastic_ips")
     if response:
         return response
-    
-    ec2 = session.client("ec2")
 
-    cache["describe_elastic_ips"] = ec2.describe_addresses()["Addresses"]
+    cache["describe_elastic_ips"] = aws_inventory.describe_addresses(session)
     return cache["describe_elastic_ips"]
 
 def get_cisa_kev():
@@ -224,8 +202,7 @@ def ec2_imdsv2_check(cache: dict, session, awsAccountId: str, awsRegion: str, aw
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -480,8 +457,7 @@ def ec2_secure_enclave_check(cache: dict, session, awsAccountId: str, awsRegion:
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -661,8 +637,7 @@ def ec2_public_facing_check(cache: dict, session, awsAccountId: str, awsRegion:
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -835,8 +810,7 @@ def ec2_source_dest_verification_check(cache: dict, session, awsAccountId: str,
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -1145,8 +1119,7 @@ def ec2_ami_age_check(cache: dict, session, awsAccountId: str, awsRegion: str, a
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -1319,8 +1292,7 @@ def ec2_ami_status_check(cache: dict, session, awsAccountId: str, awsRegion: str
     iso8601Time = (datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat())
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -1878,8 +1850,7 @@ def ec2_instance_ssm_managed_check(cache: dict, session, awsAccountId: str, awsR
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2033,8 +2004,7 @@ def ec2_instance_linux_latest_ssm_agent_check(cache: dict, session, awsAccountId
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2196,8 +2166,7 @@ def ec2_instance_ssm_association_successful_check(cache: dict, session, awsAccou
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2355,8 +2324,7 @@ def ec2_instance_patch_manager_check(cache: dict, session, awsAccountId: str, aw
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2539,8 +2507,7 @@ def ec2_instance_scanned_by_inspector_check(cache: dict, session, awsAccountId:
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2731,8 +2698,7 @@ def ec2_instance_exploitable_vulnerability_check(cache: dict, session, awsAccoun
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for i in describe_instances(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -2914,8 +2880,7 @@ def aws_elastic_ip_assigned_check(cache: dict, session, awsAccountId: str, awsRe
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
     for eip in describe_elastic_ips(cache, session):
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(eip,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, eip, eip["AllocationId"])
         allocationId = eip["AllocationId"]
         publicIp = eip["PublicIp"]
         eipArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:elastic-ip/{allocationId}"     
@@ -3065,8 +3030,7 @@ def public_ec2_shodan_check(cache: dict, session, awsAccountId: str, awsRegion:
         if shodanApiKey is None:
             continue
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(i,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, i, i["InstanceId"])
         instanceId = i["InstanceId"]
         instanceArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:instance/{instanceId}"
         instanceType = i["InstanceType"]
@@ -3255,8 +3219,7 @@ def aws_elastic_ip_shodan_check(cache: dict, session, awsAccountId: str, awsRegi
         if shodanApiKey is None:
             continue
         # B64 encode all of the details for the Asset
-        assetJson = json.dumps(eip,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
+        assetB64 = encode_asset_details(cache, eip, eip["AllocationId"])
         allocationId = eip["AllocationId"]
         publicIp = eip["PublicIp"]
         eipArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:elastic-ip/{allocationId}"  
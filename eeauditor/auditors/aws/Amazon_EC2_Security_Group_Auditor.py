@@ -19,9 +19,10 @@
 #under the License.
 
 from check_register import CheckRegister
+from asset_details import encode_asset_details
+from finding_builder import FindingTemplate
 from os import path
 import json
-import base64
 import datetime
 
 registry = CheckRegister()
@@ -44,18 +45,74 @@ def describe_security_groups(cache, session):
     cache["describe_security_groups"] = ec2.describe_security_groups()["SecurityGroups"]
     return cache["describe_security_groups"]
 
+# Shared by every Security Group Check, the Security Group Checks are all mapped to the same network access controls
+SECURITY_GROUP_REQUIREMENTS = [
+    "NIST CSF V1.1 PR.AC-3",
+    "NIST SP 800-53 Rev. 4 AC-1",
+    "NIST SP 800-53 Rev. 4 AC-17",
+    "NIST SP 800-53 Rev. 4 AC-19",
+    "NIST SP 800-53 Rev. 4 AC-20",
+    "NIST SP 800-53 Rev. 4 SC-15",
+    "AICPA TSC CC6.6",
+    "ISO 27001:2013 A.6.2.1",
+    "ISO 27001:2013 A.6.2.2",
+    "ISO 27001:2013 A.11.2.6",
+    "ISO 27001:2013 A.13.1.1",
+    "ISO 27001:2013 A.13.2.1"
+]
+
+# Static parts of the findings of the open access Checks (SecurityGroup.1 and the config-driven master Check)
+openAccessTemplate = FindingTemplate(
+    title="[SecurityGroup.1] AWS EC2 security groups should not allow unrestricted access to all ports and protocols",
+    types=[
+        "Software and Configuration Checks/AWS Security Best Practices",
+        "Effects/Data Exposure"
+    ],
+    remediationText="For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
+    remediationUrl="https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
+    relatedRequirements=SECURITY_GROUP_REQUIREMENTS + [
+        "CIS Amazon Web Services Foundations Benchmark V1.5 5.2",
+        "CIS Amazon Web Services Foundations Benchmark V1.5 5.3",
+        "CIS Amazon Web Services Foundations Benchmark V2.0 5.2",
+        "CIS Amazon Web Services Foundations Benchmark V3.0 5.2",
+        "CIS Amazon Web Services Foundations Benchmark V2.0 5.3",
+        "CIS Amazon Web Services Foundations Benchmark V3.0 5.3"
+    ],
+    assetClass="Networking",
+    assetService="Amazon VPC",
+    assetComponent="Security Group",
+    resourceType="AwsEc2SecurityGroup"
+)
+
+# Static parts of the findings of SecurityGroup.3
+defaultSgTemplate = FindingTemplate(
+    title="[SecurityGroup.3] The Default Security Group should not have any ingress or egress rules defined",
+    types=["Software and Configuration Checks/AWS Security Best Practices"],
+    remediationText="For more information on the default security group refer to the Default and custom security groups section of the Amazon Elastic Compute Cloud User Guide for Linux Instances",
+    remediationUrl="https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/default-custom-security-groups.html",
+    relatedRequirements=SECURITY_GROUP_REQUIREMENTS + [
+        "CIS Amazon Web Services Foundations Benchmark V1.5 5.4",
+        "CIS Amazon Web Services Foundations Benchmark V2.0 5.4",
+        "CIS Amazon Web Services Foundations Benchmark V3.0 5.4"
+    ],
+    assetClass="Networking",
+    assetService="Amazon VPC",
+    assetComponent="Security Group",
+    resourceType="AwsEc2SecurityGroup"
+)
+
 @registry.register_check("ec2")
 def security_group_all_open_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecurityGroup.1] AWS EC2 security groups should not allow unrestricted access to all ports and protocols"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    productArn = f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default"
     for secgroup in describe_security_groups(cache, session):
-        # B64 encode all of the details for the Asset
-        assetJson = json.dumps(secgroup,default=str).encode("utf-8")
-        assetB64 = base64.b64encode(assetJson)
         sgName = secgroup["GroupName"]
         sgId = secgroup["GroupId"]
         sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
+        # B64 encode all of the details for the Asset
+        assetB64 = encode_asset_details(cache, secgroup, sgArn)
         for permissions in secgroup["IpPermissions"]:
             try:
                 ipProtocol = permissions["IpProtocol"]
@@ -74,157 +131,39 @@ def security_group_all_open_check(cache: dict, session, awsAccountId: str, awsRe
             (ipV6Ranges and any(ipV6Range.get("CidrIpv6") == "::/0" for ipV6Range in ipV6Ranges)):
                 wholeInternetCidr = True
             
+            # Skip rules which are not for all protocols
+            if ipProtocol != "-1":
+                continue
             # This is a failing finding
-            if ipProtocol == "-1" and wholeInternetCidr is True:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{sgArn}/{ipProtocol}/security-group-all-open-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": f"{sgArn}/{ipProtocol}/security-group-all-open-check",
-                    "AwsAccountId": awsAccountId,
-                    "Types": [
-                        "Software and Configuration Checks/AWS Security Best Practices",
-                        "Effects/Data Exposure",
-                    ],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "CRITICAL"},
-                    "Confidence": 99,
-                    "Title": "[SecurityGroup.1] AWS EC2 security groups should not allow unrestricted access to all ports and protocols",
-                    "Description": f"AWS EC2 Security group {sgName} contains a rule that allows unrestricted access to all ports and protocols. Security Groups are often the first line of defense for network boundaries in AWS, allowing unfettered access removes an important part of a cloud security defense-in-depth and makes it easier for adversaries to perform recon on your assets and potentially gain unauthorized access where no other network-based controls exist. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements. Additionally, ensure that Network Firewalls, Route 53 Resolver DNS Firewalls, WAFv2, or some other self-managed host- or network-based appliance exists to interdict and prevent adversarial network traffic from reaching your hosts.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                            "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Networking",
-                        "AssetService": "Amazon VPC",
-                        "AssetComponent": "Security Group"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsEc2SecurityGroup",
-                            "Id": sgArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}
-                            }
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.AC-3",
-                            "NIST SP 800-53 Rev. 4 AC-1",
-                            "NIST SP 800-53 Rev. 4 AC-17",
-                            "NIST SP 800-53 Rev. 4 AC-19",
-                            "NIST SP 800-53 Rev. 4 AC-20",
-                            "NIST SP 800-53 Rev. 4 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.2",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.3",
-                            "CIS Amazon Web Services Foundations Benchmark V2.0 5.2",
-                            "CIS Amazon Web Services Foundations Benchmark V3.0 5.2",
-                            "CIS Amazon Web Services Foundations Benchmark V2.0 5.3",
-                            "CIS Amazon Web Services Foundations Benchmark V3.0 5.3"
-                        ]
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE",
-                }
-                yield finding
-            elif ipProtocol == "-1" and wholeInternetCidr is False:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{sgArn}/{ipProtocol}/security-group-all-open-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": f"{sgArn}/{ipProtocol}/security-group-all-open-check",
-                    "AwsAccountId": awsAccountId,
-                    "Types": [
-                        "Software and Configuration Checks/AWS Security Best Practices",
-                        "Effects/Data Exposure",
-                    ],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "INFORMATIONAL"},
-                    "Confidence": 99,
-                    "Title": "[SecurityGroup.1] AWS EC2 security groups should not allow unrestricted access to all ports and protocols",
-                    "Description": f"AWS EC2 security group {sgName} does not allow unrestricted access to all ports and protocols. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                            "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules"
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Networking",
-                        "AssetService": "Amazon VPC",
-                        "AssetComponent": "Security Group"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsEc2SecurityGroup",
-                            "Id": sgArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}
-                            }
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "PASSED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.AC-3",
-                            "NIST SP 800-53 Rev. 4 AC-1",
-                            "NIST SP 800-53 Rev. 4 AC-17",
-                            "NIST SP 800-53 Rev. 4 AC-19",
-                            "NIST SP 800-53 Rev. 4 AC-20",
-                            "NIST SP 800-53 Rev. 4 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.2",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.3"
-                        ]
-                    },
-                    "Workflow": {"Status": "RESOLVED"},
-                    "RecordState": "ARCHIVED"
-                }
-                yield finding
+            if wholeInternetCidr is True:
+                severity = "CRITICAL"
+                description = f"AWS EC2 Security group {sgName} contains a rule that allows unrestricted access to all ports and protocols. Security Groups are often the first line of defense for network boundaries in AWS, allowing unfettered access removes an important part of a cloud security defense-in-depth and makes it easier for adversaries to perform recon on your assets and potentially gain unauthorized access where no other network-based controls exist. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements. Additionally, ensure that Network Firewalls, Route 53 Resolver DNS Firewalls, WAFv2, or some other self-managed host- or network-based appliance exists to interdict and prevent adversarial network traffic from reaching your hosts."
             else:
-                continue
+                severity = "INFORMATIONAL"
+                description = f"AWS EC2 security group {sgName} does not allow unrestricted access to all ports and protocols. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements."
+            yield openAccessTemplate.build(
+                findingId=f"{sgArn}/{ipProtocol}/security-group-all-open-check",
+                productArn=productArn,
+                awsAccountId=awsAccountId,
+                timestamp=iso8601Time,
+                severity=severity,
+                description=description,
+                providerAccountId=awsAccountId,
+                assetRegion=awsRegion,
+                assetDetails=assetB64,
+                resourceId=sgArn,
+                resourcePartition=awsPartition,
+                resourceRegion=awsRegion,
+                resourceDetails={"AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}},
+                passed=not wholeInternetCidr
+            )
 
 @registry.register_check("ec2")
 def security_group_master_auditor_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecurityGroup.{checkIdNumber}] AWS EC2 security groups should not allow unrestricted {protocol} access"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    productArn = f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default"
     # Open the Configuration file and parse the information within the dynamically populate this auditor
     with open(configFile, "r") as jsonfile:
         for x in json.load(jsonfile):
@@ -236,12 +175,11 @@ def security_group_master_auditor_check(cache: dict, session, awsAccountId: str,
             checkDescription = x["CheckDescriptor"]
 
             for secgroup in describe_security_groups(cache, session):
-                # B64 encode all of the details for the Asset
-                assetJson = json.dumps(secgroup,default=str).encode("utf-8")
-                assetB64 = base64.b64encode(assetJson)
                 sgName = secgroup["GroupName"]
                 sgId = secgroup["GroupId"]
                 sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
+                # B64 encode all of the details for the Asset once, not for every rule in the config file
+                assetB64 = encode_asset_details(cache, secgroup, sgArn)
                 for permissions in secgroup["IpPermissions"]:
                     # If there any exceptions this SG is likely associated with a SG Target or a Peering Connection
                     if not all(key in permissions for key in ["FromPort", "ToPort", "IpProtocol"]):
@@ -250,6 +188,9 @@ def security_group_master_auditor_check(cache: dict, session, awsAccountId: str,
                         toPort = permissions["ToPort"]
                         fromPort = permissions["FromPort"]
                         ipProtocol = permissions["IpProtocol"]
+                    # Skip other non-matching rules
+                    if not (toPort == toPortTarget and fromPort == fromPortTarget and ipProtocol == targetProtocol):
+                        continue
                     # Unfold both IPv4 and v6 - these will be present no matter what
                     ipV4Ranges = permissions.get("IpRanges", [])
                     ipV6Ranges = permissions.get("Ipv6Ranges", [])
@@ -262,328 +203,77 @@ def security_group_master_auditor_check(cache: dict, session, awsAccountId: str,
                         wholeInternetCidr = True
 
                     # This is a failing finding - it matches all ports, protocols and has an open CIDR
-                    if (
-                        toPort == toPortTarget
-                        and fromPort == fromPortTarget
-                        and ipProtocol == targetProtocol
-                        and wholeInternetCidr is True
-                    ):
-                        finding = {
-                            "SchemaVersion": "2018-10-08",
-                            "Id": f"{sgArn}/{ipProtocol}/{checkId}",
-                            "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                            "GeneratorId": f"{sgArn}/{ipProtocol}/{checkId}",
-                            "AwsAccountId": awsAccountId,
-                            "Types": [
-                                "Software and Configuration Checks/AWS Security Best Practices",
-                                "Effects/Data Exposure",
-                            ],
-                            "FirstObservedAt": iso8601Time,
-                            "CreatedAt": iso8601Time,
-                            "UpdatedAt": iso8601Time,
-                            "Severity": {"Label": "MEDIUM"},
-                            "Confidence": 99,
-                            "Title": checkTitle,
-                            "Description": f"{sgName} allows unrestricted {checkDescription} access. Security Groups are often the first line of defense for network boundaries in AWS, allowing unfettered access removes an important part of a cloud security defense-in-depth and makes it easier for adversaries to perform recon on your assets and potentially gain unauthorized access where no other network-based controls exist. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements. Additionally, ensure that Network Firewalls, Route 53 Resolver DNS Firewalls, WAFv2, or some other self-managed host- or network-based appliance exists to interdict and prevent adversarial network traffic from reaching your hosts. Refer to the remediation instructions to remediate this behavior.",
-                            "Remediation": {
-                                "Recommendation": {
-                                    "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                                    "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules"
-                                }
-                            },
-                            "ProductFields": {
-                                "ProductName": "ElectricEye",
-                                "Provider": "AWS",
-                                "ProviderType": "CSP",
-                                "ProviderAccountId": awsAccountId,
-                                "AssetRegion": awsRegion,
-                                "AssetDetails": assetB64,
-                                "AssetClass": "Networking",
-                                "AssetService": "Amazon VPC",
-                                "AssetComponent": "Security Group"
-                            },
-                            "Resources": [
-                                {
-                                    "Type": "AwsEc2SecurityGroup",
-                                    "Id": sgArn,
-                                    "Partition": awsPartition,
-                                    "Region": awsRegion,
-                                    "Details": {
-                                        "AwsEc2SecurityGroup": {
-                                            "GroupName": sgName,
-                                            "GroupId": sgId
-                                        }
-                                    }
-                                }
-                            ],
-                            "Compliance": {
-                                "Status": "FAILED",
-                                "RelatedRequirements": [
-                                    "NIST CSF V1.1 PR.AC-3",
-                                    "NIST SP 800-53 Rev. 4 AC-1",
-                                    "NIST SP 800-53 Rev. 4 AC-17",
-                                    "NIST SP 800-53 Rev. 4 AC-19",
-                                    "NIST SP 800-53 Rev. 4 AC-20",
-                                    "NIST SP 800-53 Rev. 4 SC-15",
-                                    "AICPA TSC CC6.6",
-                                    "ISO 27001:2013 A.6.2.1",
-                                    "ISO 27001:2013 A.6.2.2",
-                                    "ISO 27001:2013 A.11.2.6",
-                                    "ISO 27001:2013 A.13.1.1",
-                                    "ISO 27001:2013 A.13.2.1",
-                                    "CIS Amazon Web Services Foundations Benchmark V1.5 5.2",
-                                    "CIS Amazon Web Services Foundations Benchmark V1.5 5.3"
-                                ]
-                            },
-                            "Workflow": {"Status": "NEW"},
-                            "RecordState": "ACTIVE"
-                        }
-                        yield finding
+                    if wholeInternetCidr is True:
+                        severity = "MEDIUM"
+                        description = f"{sgName} allows unrestricted {checkDescription} access. Security Groups are often the first line of defense for network boundaries in AWS, allowing unfettered access removes an important part of a cloud security defense-in-depth and makes it easier for adversaries to perform recon on your assets and potentially gain unauthorized access where no other network-based controls exist. Your security group should still be audited to ensure any other rules are compliant with organizational or regulatory requirements. Additionally, ensure that Network Firewalls, Route 53 Resolver DNS Firewalls, WAFv2, or some other self-managed host- or network-based appliance exists to interdict and prevent adversarial network traffic from reaching your hosts. Refer to the remediation instructions to remediate this behavior."
                     # This is a passing finding - it matches all ports, protocols but doesnt have an open CIDR
-                    elif (
-                        toPort == toPortTarget
-                        and fromPort == fromPortTarget
-                        and ipProtocol == targetProtocol
-                        and wholeInternetCidr is False
-                    ):
-                        finding = {
-                            "SchemaVersion": "2018-10-08",
-                            "Id": f"{sgArn}/{ipProtocol}/{checkId}",
-                            "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                            "GeneratorId": f"{sgArn}/{ipProtocol}/{checkId}",
-                            "AwsAccountId": awsAccountId,
-                            "Types": [
-                                "Software and Configuration Checks/AWS Security Best Practices",
-                                "Effects/Data Exposure",
-                            ],
-                            "FirstObservedAt": iso8601Time,
-                            "CreatedAt": iso8601Time,
-                            "UpdatedAt": iso8601Time,
-                            "Severity": {"Label": "INFORMATIONAL"},
-                            "Confidence": 99,
-                            "Title": checkTitle,
-                            "Description": f"{sgName} does not allow unrestricted {checkDescription} access.",
-                            "Remediation": {
-                                "Recommendation": {
-                                    "Text": "For more information on modifying security group rules refer to the Adding, Removing, and Updating Rules section of the Amazon Virtual Private Cloud User Guide",
-                                    "Url": "https://docs.aws.amazon.com/vpc/latest/userguide/VPC_SecurityGroups.html#AddRemoveRules",
-                                }
-                            },
-                            "ProductFields": {
-                                "ProductName": "ElectricEye",
-                                "Provider": "AWS",
-                                "ProviderType": "CSP",
-                                "ProviderAccountId": awsAccountId,
-                                "AssetRegion": awsRegion,
-                                "AssetDetails": assetB64,
-                                "AssetClass": "Networking",
-                                "AssetService": "Amazon VPC",
-                                "AssetComponent": "Security Group"
-                            },
-                            "Resources": [
-                                {
-                                    "Type": "AwsEc2SecurityGroup",
-                                    "Id": sgArn,
-                                    "Partition": awsPartition,
-                                    "Region": awsRegion,
-                                    "Details": {
-                                        "AwsEc2SecurityGroup": {
-                                            "GroupName": sgName,
-                                            "GroupId": sgId
-                                        }
-                                    }
-                                }
-                            ],
-                            "Compliance": {
-                                "Status": "PASSED",
-                                "RelatedRequirements": [
-                                    "NIST CSF V1.1 PR.AC-3",
-                                    "NIST SP 800-53 Rev. 4 AC-1",
-                                    "NIST SP 800-53 Rev. 4 AC-17",
-                                    "NIST SP 800-53 Rev. 4 AC-19",
-                                    "NIST SP 800-53 Rev. 4 AC-20",
-                                    "NIST SP 800-53 Rev. 4 SC-15",
-                                    "AICPA TSC CC6.6",
-                                    "ISO 27001:2013 A.6.2.1",
-                                    "ISO 27001:2013 A.6.2.2",
-                                    "ISO 27001:2013 A.11.2.6",
-                                    "ISO 27001:2013 A.13.1.1",
-                                    "ISO 27001:2013 A.13.2.1",
-                                    "CIS Amazon Web Services Foundations Benchmark V1.5 5.2",
-                                    "CIS Amazon Web Services Foundations Benchmark V1.5 5.3",
-                                    "CIS Amazon Web Services Foundations Benchmark V2.0 5.2",
-                                    "CIS Amazon Web Services Foundations Benchmark V3.0 5.2",
-                                    "CIS Amazon Web Services Foundations Benchmark V2.0 5.3",
-                                    "CIS Amazon Web Services Foundations Benchmark V3.0 5.3"
-                                ]
-                            },
-                            "Workflow": {"Status": "RESOLVED"},
-                            "RecordState": "ARCHIVED"
-                        }
-                        yield finding
-                    # Skip other non-matching rules
                     else:
-                        continue
+                        severity = "INFORMATIONAL"
+                        description = f"{sgName} does not allow unrestricted {checkDescription} access."
+                    yield openAccessTemplate.build(
+                        findingId=f"{sgArn}/{ipProtocol}/{checkId}",
+                        productArn=productArn,
+                        awsAccountId=awsAccountId,
+                        timestamp=iso8601Time,
+                        severity=severity,
+                        description=description,
+                        providerAccountId=awsAccountId,
+                        assetRegion=awsRegion,
+                        assetDetails=assetB64,
+                        resourceId=sgArn,
+                        resourcePartition=awsPartition,
+                        resourceRegion=awsRegion,
+                        resourceDetails={"AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}},
+                        passed=not wholeInternetCidr,
+                        title=checkTitle
+                    )
 
 @registry.register_check("ec2")
 def security_group_default_sg_has_rules_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
     """[SecurityGroup.3] AWS EC2 default security groups should not have any ingress or egress rules defined"""
     # ISO Time
     iso8601Time = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc).isoformat()
+    productArn = f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default"
     for secgroup in describe_security_groups(cache, session):
-        if secgroup["GroupName"] == "default":
-            # B64 encode all of the details for the Asset
-            assetJson = json.dumps(secgroup,default=str).encode("utf-8")
-            assetB64 = base64.b64encode(assetJson)
-            sgName = secgroup["GroupName"]
-            sgId = secgroup["GroupId"]
-            sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
-            # Begin rule eval
-            defaultSgAllowsIngress = False
-            defaultSgAllowsEgress = False
-            # Override the above Bools on the precense of ANY RULES for ingress or egress
-            # by Default the Default SG allows unfettered Egress and talk-to-self Ingress
-            if secgroup["IpPermissions"]:
-                defaultSgAllowsIngress = True
-            if secgroup["IpPermissionsEgress"]:
-                defaultSgAllowsEgress = True
-            # fail on either ingress or egress having rules
-            if defaultSgAllowsIngress or defaultSgAllowsEgress:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{sgArn}/default-security-group-has-rules-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": f"{sgArn}/default-security-group-has-rules-check",
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "HIGH"},
-                    "Confidence": 99,
-                    "Title": "[SecurityGroup.3] The Default Security Group should not have any ingress or egress rules defined",
-                    "Description": f"AWS EC2 Security group {sgName} is the default security group and contains one or both of ingress and/or egress rules. Your AWS account automatically has a default security group for the default VPC in each Region. If you don't specify a security group when you launch an instance, the instance is automatically associated with the default security group for the VPC. If you don't want your instances to use the default security group, you can create your own custom security groups and specify them when you launch your instances. It is a best practice to remove ALL rules from the default security groups in case they are automatically attached.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on the default security group refer to the Default and custom security groups section of the Amazon Elastic Compute Cloud User Guide for Linux Instances",
-                            "Url": "https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/default-custom-security-groups.html"
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Networking",
-                        "AssetService": "Amazon VPC",
-                        "AssetComponent": "Security Group"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsEc2SecurityGroup",
-                            "Id": sgArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}
-                            },
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "FAILED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.AC-3",
-                            "NIST SP 800-53 Rev. 4 AC-1",
-                            "NIST SP 800-53 Rev. 4 AC-17",
-                            "NIST SP 800-53 Rev. 4 AC-19",
-                            "NIST SP 800-53 Rev. 4 AC-20",
-                            "NIST SP 800-53 Rev. 4 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.4",
-                            "CIS Amazon Web Services Foundations Benchmark V2.0 5.4",
-                        "CIS Amazon Web Services Foundations Benchmark V3.0 5.4",
-                        ]
-                    },
-                    "Workflow": {"Status": "NEW"},
-                    "RecordState": "ACTIVE"
-                }
-                yield finding
-            else:
-                finding = {
-                    "SchemaVersion": "2018-10-08",
-                    "Id": f"{sgArn}/default-security-group-has-rules-check",
-                    "ProductArn": f"arn:{awsPartition}:securityhub:{awsRegion}:{awsAccountId}:product/{awsAccountId}/default",
-                    "GeneratorId": f"{sgArn}/default-security-group-has-rules-check",
-                    "AwsAccountId": awsAccountId,
-                    "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
-                    "FirstObservedAt": iso8601Time,
-                    "CreatedAt": iso8601Time,
-                    "UpdatedAt": iso8601Time,
-                    "Severity": {"Label": "INFORMATIONAL"},
-                    "Confidence": 99,
-                    "Title": "[SecurityGroup.3] The Default Security Group should not have any ingress or egress rules defined",
-                    "Description": f"AWS EC2 Security group {sgName} is the default security group and does not define ingress or egress rules.",
-                    "Remediation": {
-                        "Recommendation": {
-                            "Text": "For more information on the default security group refer to the Default and custom security groups section of the Amazon Elastic Compute Cloud User Guide for Linux Instances",
-                            "Url": "https://docs.aws.amazon.com/AWSEC2/latest/UserGuide/default-custom-security-groups.html"
-                        }
-                    },
-                    "ProductFields": {
-                        "ProductName": "ElectricEye",
-                        "Provider": "AWS",
-                        "ProviderType": "CSP",
-                        "ProviderAccountId": awsAccountId,
-                        "AssetRegion": awsRegion,
-                        "AssetDetails": assetB64,
-                        "AssetClass": "Networking",
-                        "AssetService": "Amazon VPC",
-                        "AssetComponent": "Security Group"
-                    },
-                    "Resources": [
-                        {
-                            "Type": "AwsEc2SecurityGroup",
-                            "Id": sgArn,
-                            "Partition": awsPartition,
-                            "Region": awsRegion,
-                            "Details": {
-                                "AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}
-                            },
-                        }
-                    ],
-                    "Compliance": {
-                        "Status": "PASSED",
-                        "RelatedRequirements": [
-                            "NIST CSF V1.1 PR.AC-3",
-                            "NIST SP 800-53 Rev. 4 AC-1",
-                            "NIST SP 800-53 Rev. 4 AC-17",
-                            "NIST SP 800-53 Rev. 4 AC-19",
-                            "NIST SP 800-53 Rev. 4 AC-20",
-                            "NIST SP 800-53 Rev. 4 SC-15",
-                            "AICPA TSC CC6.6",
-                            "ISO 27001:2013 A.6.2.1",
-                            "ISO 27001:2013 A.6.2.2",
-                            "ISO 27001:2013 A.11.2.6",
-                            "ISO 27001:2013 A.13.1.1",
-                            "ISO 27001:2013 A.13.2.1",
-                            "CIS Amazon Web Services Foundations Benchmark V1.5 5.4",
-                            "CIS Amazon Web Services Foundations Benchmark V2.0 5.4",
-                        "CIS Amazon Web Services Foundations Benchmark V3.0 5.4",
-                        ]
-                    },
-                    "Workflow": {"Status": "RESOLVED"},
-                    "RecordState": "ARCHIVED"
-                }
-                yield finding
         # Skip other SGs
-        else:
+        if secgroup["GroupName"] != "default":
             continue
+        sgName = secgroup["GroupName"]
+        sgId = secgroup["GroupId"]
+        sgArn = f"arn:{awsPartition}:ec2:{awsRegion}:{awsAccountId}:security-group/{sgId}"
+        # B64 encode all of the details for the Asset
+        assetB64 = encode_asset_details(cache, secgroup, sgArn)
+        # Begin rule eval
+        defaultSgAllowsIngress = False
+        defaultSgAllowsEgress = False
+        # Override the above Bools on the precense of ANY RULES for ingress or egress
+        # by Default the Default SG allows unfettered Egress and talk-to-self Ingress
+        if secgroup["IpPermissions"]:
+            defaultSgAllowsIngress = True
+        if secgroup["IpPermissionsEgress"]:
+            defaultSgAllowsEgress = True
+        # fail on either ingress or egress having rules
+        if defaultSgAllowsIngress or defaultSgAllowsEgress:
+            severity = "HIGH"
+            description = f"AWS EC2 Security group {sgName} is the default security group and contains one or both of ingress and/or egress rules. Your AWS account automatically has a default security group for the default VPC in each Region. If you don't specify a security group when you launch an instance, the instance is automatically associated with the default security group for the VPC. If you don't want your instances to use the default security group, you can create your own custom security groups and specify them when you launch your instances. It is a best practice to remove ALL rules from the default security groups in case they are automatically attached."
+        else:
+            severity = "INFORMATIONAL"
+            description = f"AWS EC2 Security group {sgName} is the default security group and does not define ingress or egress rules."
+        yield defaultSgTemplate.build(
+            findingId=f"{sgArn}/default-security-group-has-rules-check",
+            productArn=productArn,
+            awsAccountId=awsAccountId,
+            timestamp=iso8601Time,
+            severity=severity,
+            description=description,
+            providerAccountId=awsAccountId,
+            assetRegion=awsRegion,
+            assetDetails=assetB64,
+            resourceId=sgArn,
+            resourcePartition=awsPartition,
+            resourceRegion=awsRegion,
+            resourceDetails={"AwsEc2SecurityGroup": {"GroupName": sgName, "GroupId": sgId}},
+            passed=not (defaultSgAllowsIngress or defaultSgAllowsEgress)
+        )
 
-## EOF ??
\ No newline at end of file
+## EOF ??
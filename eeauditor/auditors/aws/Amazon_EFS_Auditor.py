@@ -20,6 +20,7 @@
 
 import datetime
 from check_register import CheckRegister
+import aws_inventory
 import base64
 import json
 
@@ -27,13 +28,10 @@ registry = CheckRegister()
 
 def describe_file_systems(cache, session):
     response = cache.get("describe_file_systems")
-
     if response:
         return response
-    
-    efs = session.client("efs")
 
-    cache["describe_file_systems"] = efs.describe_file_systems()
+    cache["describe_file_systems"] = {"FileSystems": aws_inventory.describe_file_systems(session)}
     return cache["describe_file_systems"]
 
 @registry.register_check("elasticfilesystem")
@@ -29,6 +29,7 @@ import base64
 import json
 from botocore.exceptions import ClientError
 from check_register import CheckRegister
+import aws_inventory
 
 registry = CheckRegister()
 
@@ -123,14 +124,12 @@ def google_dns_resolver(target):
         return None
 
 def describe_clbs(cache, session):
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_clbs")
     if response:
         return response
-    
-    elb = session.client("elb")
 
-    cache["describe_load_balancers"] = elb.describe_load_balancers()["LoadBalancerDescriptions"]
-    return cache["describe_load_balancers"]
+    cache["describe_clbs"] = aws_inventory.describe_classic_load_balancers(session)
+    return cache["describe_clbs"]
 
 @registry.register_check("elasticloadbalancing")
 def internet_facing_clb_https_listener_check(cache: dict, session, awsAccountId: str, awsRegion: str, awsPartition: str) -> dict:
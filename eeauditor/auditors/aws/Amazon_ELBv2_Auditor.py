@@ -27,6 +27,7 @@ import ipaddress
 import datetime
 from botocore.exceptions import ClientError
 from check_register import CheckRegister
+import aws_inventory
 import base64
 import json
 
@@ -36,10 +37,8 @@ def describe_load_balancers(cache, session):
     response = cache.get("describe_load_balancers")
     if response:
         return response
-    
-    elbv2 = session.client("elbv2")
 
-    cache["describe_load_balancers"] = elbv2.describe_load_balancers()["LoadBalancers"]
+    cache["describe_load_balancers"] = aws_inventory.describe_load_balancers(session)
     return cache["describe_load_balancers"]
 
 SHODAN_HOSTS_URL = "https://api.shodan.io/shodan/host/"
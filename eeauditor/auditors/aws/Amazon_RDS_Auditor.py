@@ -19,6 +19,7 @@
 #under the License.
 
 from check_register import CheckRegister
+import aws_inventory
 import tomli
 import os
 import sys
@@ -121,38 +122,11 @@ def google_dns_resolver(target):
         return None
 
 def describe_db_instances(cache, session):
-    rds = session.client("rds")
-    dbInstances = []
     response = cache.get("describe_db_instances")
     if response:
         return response
-    paginator = rds.get_paginator('describe_db_instances')
-    if paginator:
-        for page in paginator.paginate(
-            Filters=[
-                {
-                    "Name": "engine",
-                    "Values": [
-                        "aurora-mysql",
-                        "aurora-postgresql",
-                        "mariadb",
-                        "mysql",
-                        "oracle-ee",
-                        "oracle-ee-cdb",
-                        "oracle-se2",
-                        "oracle-se2-cdb",
-                        "postgres",
-                        "sqlserver-ee",
-                        "sqlserver-se",
-                        "sqlserver-ex",
-                        "sqlserver-web"
-                    ]
-                }
-            ]
-        ):
-            for dbinstance in page["DBInstances"]:
-                dbInstances.append(dbinstance)
-    cache["describe_db_instances"] = dbInstances
+
+    cache["describe_db_instances"] = aws_inventory.describe_db_instances(session)
     return cache["describe_db_instances"]
 
 def describe_db_snapshots(cache, session):
@@ -19,6 +19,7 @@
 #under the License.
 
 from check_register import CheckRegister
+import aws_inventory
 import datetime
 from botocore.exceptions import ClientError
 import base64
@@ -60,34 +61,29 @@ def get_hosted_zones(cache, session):
     return cache["get_hosted_zones"]
 
 def describe_clbs(cache, session):
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_clbs")
     if response:
         return response
-    
-    elb = session.client("elb")
 
-    cache["describe_load_balancers"] = elb.describe_load_balancers()["LoadBalancerDescriptions"]
-    return cache["describe_load_balancers"]
+    cache["describe_clbs"] = aws_inventory.describe_classic_load_balancers(session)
+    return cache["describe_clbs"]
 
 def describe_app_load_balancers(cache, session):
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_app_load_balancers")
     if response:
         return response
-    
-    elbv2 = session.client("elbv2")
-    appLoadBalancers = [lb for lb in elbv2.describe_load_balancers()["LoadBalancers"] if lb["Type"] == "application"]
 
-    cache["describe_load_balancers"] = appLoadBalancers
-    return cache["describe_load_balancers"]
+    cache["describe_app_load_balancers"] = [
+        lb for lb in aws_inventory.describe_load_balancers(session) if lb["Type"] == "application"
+    ]
+    return cache["describe_app_load_balancers"]
 
 def describe_elastic_ips(cache, session):
     response = cache.get("describe_elastic_ips")
     if response:
         return response
-    
-    ec2 = session.client("ec2")
 
-    cache["describe_elastic_ips"] = ec2.describe_addresses()["Addresses"]
+    cache["describe_elastic_ips"] = aws_inventory.describe_addresses(session)
     return cache["describe_elastic_ips"]
 
 def paginate_distributions(cache, session):
@@ -21,18 +21,10 @@
 import nmap3
 import datetime
 from check_register import CheckRegister
+import aws_inventory
 from dateutil.parser import parse
 import base64
 import json
-from botocore.config import Config
-
-# Adding backoff and retries for SSM - this API gets throttled a lot
-config = Config(
-   retries = {
-      'max_attempts': 10,
-      'mode': 'adaptive'
-   }
-)
 
 registry = CheckRegister()
 
@@ -64,73 +56,45 @@ def describe_instances(cache, session):
         return response
     
     instanceList = []
-    
-    ec2 = session.client("ec2")
-    ssm = session.client("ssm", config=config)
-    # Enrich EC2 with SSM details - this is done for the EC2 Auditor - all others using EC2 don't matter too much
-    managedInstances = ssm.describe_instance_information()["InstanceInformationList"]
 
-    for page in ec2.get_paginator("describe_instances").paginate(
-            Filters=[
-                {
-                    "Name": "instance-state-name",
-                    "Values": [ 
-                        "running",
-                        "stopped" 
-                    ]
-                }
-            ]
-        ):
-        for r in page["Reservations"]:
-            for i in r["Instances"]:
-                # Skip Spot Instances, based on the fleet ID or status
-                try:
-                    if i["InstanceLifecycle"] == "spot":
-                        continue
-                except KeyError:
-                    pass
-                try:
-                    i["SpotInstanceRequestId"]
-                    continue
-                except KeyError:
-                    pass
-                # Use a list comprehension to attempt to get SSM info for the instance
-                managedInstanceInfo = [mnginst for mnginst in managedInstances if mnginst["InstanceId"] == i["InstanceId"]]
-                i["ManagedInstanceInformation"] = managedInstanceInfo
-                instanceList.append(i)
+    for i in aws_inventory.describe_instances(session):
+        # Skip Spot Instances, based on the fleet ID or status
+        if i.get("InstanceLifecycle") == "spot" or "SpotInstanceRequestId" in i:
+            continue
+        # Enrich EC2 with SSM details - copy the Instance as the inventory is shared with other Auditors
+        instanceList.append(
+            {
+                **i,
+                "ManagedInstanceInformation": aws_inventory.get_managed_instance_information(session, i["InstanceId"])
+            }
+        )
 
-        cache["describe_instances"] = instanceList
-        return cache["describe_instances"]
+    cache["describe_instances"] = instanceList
+    return cache["describe_instances"]
     
 def describe_elastic_ips(cache, session):
     response = cache.get("describe_elastic_ips")
     if response:
         return response
-    
-    ec2 = session.client("ec2")
 
-    cache["describe_elastic_ips"] = ec2.describe_addresses()["Addresses"]
+    cache["describe_elastic_ips"] = aws_inventory.describe_addresses(session)
     return cache["describe_elastic_ips"]
 
 def describe_load_balancers(cache, session):
     response = cache.get("describe_load_balancers")
     if response:
         return response
-    
-    elbv2 = session.client("elbv2")
 
-    cache["describe_load_balancers"] = elbv2.describe_load_balancers()["LoadBalancers"]
+    cache["describe_load_balancers"] = aws_inventory.describe_load_balancers(session)
     return cache["describe_load_balancers"]
 
 def describe_clbs(cache, session):
-    response = cache.get("describe_load_balancers")
+    response = cache.get("describe_clbs")
     if response:
         return response
-    
-    elb = session.client("elb")
 
-    cache["describe_load_balancers"] = elb.describe_load_balancers()["LoadBalancerDescriptions"]
-    return cache["describe_load_balancers"]
+    cache["describe_clbs"] = aws_inventory.describe_classic_load_balancers(session)
+    return cache["describe_clbs"]
 
 def cloudfront_paginate(cache, session):
     cloudfront = session.client("cloudfront")
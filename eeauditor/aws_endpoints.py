@@ -0,0 +1,149 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import json
+from os import environ, makedirs, path, replace
+from time import time
+import botocore
+from botocore.loaders import create_loader
+
+logger = logging.getLogger("AwsEndpoints")
+
+# The precomputed index is written here and reused until the TTL lapses or a different version of botocore is installed
+ENDPOINT_INDEX_CACHE_DIR = environ.get(
+    "ELECTRICEYE_CACHE_DIR", path.join(path.expanduser("~"), ".cache", "electriceye")
+)
+ENDPOINT_INDEX_CACHE_TTL = 7 * 24 * 60 * 60
+ENDPOINT_INDEX_CACHE_SCHEMA = 1
+
+# these are "endpoints" and not real regions, since ElectricEye provides local overrides to the "global"
+# AWS region within each Auditor already as long as these are present for a specific service then we're good
+GLOBAL_ENDPOINT_PSEUDO_REGIONS = frozenset([
+    "aws-global", "fips-aws-global", "aws-cn-global", "aws-us-gov-global", "aws-us-gov-global-fips", "iam-govcloud", "iam-govcloud-fips", "aws-iso-global", "aws-iso-b-global", "aws-iso-e-global"
+])
+
+# FIS isn't in the endpoints for some reason, which is stupid, so I need to have a list of FIS regions
+# https://docs.aws.amazon.com/general/latest/gr/fis.html
+FIS_REGIONS = frozenset([
+    "us-east-2", "us-east-1", "us-west-2", "us-west-1", "af-south-1", "ap-east-1", "ap-south-1", "ap-northeast-2", "ap-southeast-1", "ap-southeast-2", "ap-northeast-1", "ca-central-1", "eu-central-1", "eu-west-1", "eu-west-2", "eu-south-1", "eu-west-3", "eu-north-1", "me-south-1", "sa-east-1", "us-gov-east-1", "us-gov-west-1"
+])
+
+# overrides - some services fall under a service's "endpoint" and not so much a dedicated namespace from what I can tell??
+# we're overriding these just to trick ElectricEye into *not* aborting for certain services and also not re-naming plugins which use the same cache
+SERVICE_NAME_OVERRIDES = {
+    "globalaccelerator": "iam",
+    "imagebuilder": "ec2",
+    "elasticloadbalancingv2": "elasticloadbalancing"
+}
+
+class AwsEndpointIndex(object):
+    """
+    Precomputed (partition, service) -> frozenset(regions) lookup of botocore's endpoints.json, built from the locally
+    installed botocore so that service availability checks are a dictionary lookup and never touch the network
+    """
+
+    def __init__(self, index: dict):
+        self.index = index
+
+    @classmethod
+    def load(cls, cacheDir: str = ENDPOINT_INDEX_CACHE_DIR, ttl: int = ENDPOINT_INDEX_CACHE_TTL):
+        """
+        Returns the index from the on-disk cache for the installed botocore version, or builds it from botocore's own
+        endpoints.json (and refreshes the cache) if the cache is missing, stale or unreadable
+        """
+        cacheFile = path.join(cacheDir, f"aws-endpoint-index-{botocore.__version__}.json")
+
+        try:
+            if time() - path.getmtime(cacheFile) < ttl:
+                with open(cacheFile) as jsonfile:
+                    cached = json.load(jsonfile)
+                if cached.get("schema") == ENDPOINT_INDEX_CACHE_SCHEMA:
+                    logger.debug("Using cached AWS endpoint index %s", cacheFile)
+                    return cls.from_serializable(cached["partitions"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Could not read cached AWS endpoint index %s: %s", cacheFile, e)
+
+        endpointIndex = cls.from_endpoint_data(create_loader().load_data("endpoints"))
+
+        try:
+            makedirs(cacheDir, exist_ok=True)
+            # write to a temporary file first so concurrent runs never read a half-written cache
+            with open(f"{cacheFile}.tmp", "w") as jsonfile:
+                json.dump({"schema": ENDPOINT_INDEX_CACHE_SCHEMA, "partitions": endpointIndex.to_serializable()}, jsonfile)
+            replace(f"{cacheFile}.tmp", cacheFile)
+        except OSError as e:
+            logger.info("Could not write AWS endpoint index cache %s: %s", cacheFile, e)
+
+        return endpointIndex
+
+    @classmethod
+    def from_endpoint_data(cls, endpointData: dict):
+        """
+        Builds the index from the raw contents of an endpoints.json file
+        """
+        index = {}
+        for partition in endpointData["partitions"]:
+            for serviceName, serviceData in partition["services"].items():
+                # ecr, sagemaker, and a few other services have "api." on their names
+                # which is not consistent with the service at all
+                if "api." in serviceName:
+                    serviceName = serviceName.split("api.")[1]
+                # keep the first entry when two endpoint names normalize to the same service
+                index.setdefault(
+                    (partition["partition"], serviceName), frozenset(serviceData["endpoints"].keys())
+                )
+
+        return cls(index)
+
+    @classmethod
+    def from_serializable(cls, partitions: dict):
+        return cls(
+            {
+                (partitionName, serviceName): frozenset(regions)
+                for partitionName, services in partitions.items()
+                for serviceName, regions in services.items()
+            }
+        )
+
+    def to_serializable(self) -> dict:
+        partitions = {}
+        for (partitionName, serviceName), regions in self.index.items():
+            partitions.setdefault(partitionName, {})[serviceName] = sorted(regions)
+
+        return partitions
+
+    def is_service_available(self, awsPartition: str, service: str, awsRegion: str) -> bool:
+        """
+        Checks if a provided service (ElectricEye Plugin name) within a specific AWS Partition and Region is available
+        """
+        service = SERVICE_NAME_OVERRIDES.get(service, service)
+        if service == "fis":
+            return awsRegion in FIS_REGIONS
+
+        regions = self.index.get((awsPartition, service))
+        if regions is None:
+            return False
+        # Backcheck on the "global" services e.g., Support, Trustedadvisor, CloudFront, IAM
+        if not regions.isdisjoint(GLOBAL_ENDPOINT_PSEUDO_REGIONS):
+            return True
+
+        return awsRegion in regions
@@ -0,0 +1,236 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from functools import wraps
+from botocore.config import Config
+from check_executor import SingleFlightCache
+
+# Adding backoff and retries for SSM - this API gets throttled a lot
+ssmConfig = Config(
+   retries = {
+      'max_attempts': 10,
+      'mode': 'adaptive'
+   }
+)
+
+# Engines evaluated by the Amazon RDS and AWS Backup Auditors, DocumentDB and Neptune have their own Auditors
+RDS_ENGINES = [
+    "aurora-mysql",
+    "aurora-postgresql",
+    "mariadb",
+    "mysql",
+    "oracle-ee",
+    "oracle-ee-cdb",
+    "oracle-se2",
+    "oracle-se2-cdb",
+    "postgres",
+    "sqlserver-ee",
+    "sqlserver-se",
+    "sqlserver-ex",
+    "sqlserver-web"
+]
+
+def get_inventory(session):
+    """
+    Returns the inventory shared by every Auditor using the same Account and Region, this is stored on the AwsSession
+    created by EEAuditor. Any other Session (e.g., in unit tests) receives a throwaway inventory
+    """
+    inventory = getattr(session, "inventory", None)
+    if inventory is None:
+        inventory = SingleFlightCache()
+
+    return inventory
+
+def inventory_item(func):
+    """
+    Decorator which enumerates a resource type at most once per Account and Region. The returned objects are shared between
+    Auditors, copy them before adding any enrichments
+    """
+
+    @wraps(func)
+    def wrapper(session):
+        inventory = get_inventory(session)
+        response = inventory.get(func.__name__)
+        if response is not None:
+            return response
+        try:
+            inventory[func.__name__] = func(session)
+        finally:
+            # let any other Auditor waiting on this resource type retry if the enumeration failed
+            inventory.release(func.__name__)
+        return inventory[func.__name__]
+
+    return wrapper
+
+@inventory_item
+def describe_instances(session) -> list:
+    """
+    Running and stopped EC2 Instances, including Spot Instances
+    """
+    ec2 = session.client("ec2")
+    instanceList = []
+
+    for page in ec2.get_paginator("describe_instances").paginate(
+            Filters=[
+                {
+                    "Name": "instance-state-name",
+                    "Values": [ 
+                        "running",
+                        "stopped" 
+                    ]
+                }
+            ]
+        ):
+        for r in page["Reservations"]:
+            instanceList.extend(r["Instances"])
+
+    return instanceList
+
+@inventory_item
+def describe_instance_information(session) -> dict:
+    """
+    SSM Managed Instance information keyed by Instance ID
+    """
+    ssm = session.client("ssm", config=ssmConfig)
+    managedInstances = {}
+
+    for page in ssm.get_paginator("describe_instance_information").paginate():
+        for mnginst in page["InstanceInformationList"]:
+            managedInstances[mnginst["InstanceId"]] = mnginst
+
+    return managedInstances
+
+def get_managed_instance_information(session, instanceId: str) -> list:
+    """
+    Returns the SSM Managed Instance information for an EC2 Instance in the same format the EC2 based Auditors have always
+    attached as `ManagedInstanceInformation` - a list that is empty when the Instance is not managed by SSM
+    """
+    managedInstance = describe_instance_information(session).get(instanceId)
+    if managedInstance is None:
+        return []
+
+    return [managedInstance]
+
+@inventory_item
+def describe_volumes(session) -> list:
+    """
+    Available and in-use EBS Volumes
+    """
+    ec2 = session.client("ec2")
+    volumeList = []
+
+    for page in ec2.get_paginator("describe_volumes").paginate(
+            DryRun=False,
+            Filters=[{"Name": "status", "Values": ["available", "in-use"]}]
+        ):
+        volumeList.extend(page["Volumes"])
+
+    return volumeList
+
+@inventory_item
+def describe_addresses(session) -> list:
+    """
+    Elastic IP Addresses
+    """
+    ec2 = session.client("ec2")
+
+    return ec2.describe_addresses()["Addresses"]
+
+@inventory_item
+def describe_db_instances(session) -> list:
+    """
+    RDS and Aurora DB Instances for the engines in `RDS_ENGINES`
+    """
+    rds = session.client("rds")
+    dbInstances = []
+
+    for page in rds.get_paginator("describe_db_instances").paginate(
+            Filters=[
+                {
+                    "Name": "engine",
+                    "Values": RDS_ENGINES
+                }
+            ]
+        ):
+        dbInstances.extend(page["DBInstances"])
+
+    return dbInstances
+
+@inventory_item
+def describe_load_balancers(session) -> list:
+    """
+    Application, Network and Gateway Load Balancers (ELBv2)
+    """
+    elbv2 = session.client("elbv2")
+    loadBalancers = []
+
+    for page in elbv2.get_paginator("describe_load_balancers").paginate():
+        loadBalancers.extend(page["LoadBalancers"])
+
+    return loadBalancers
+
+@inventory_item
+def describe_classic_load_balancers(session) -> list:
+    """
+    Classic Load Balancers (ELB)
+    """
+    elb = session.client("elb")
+    loadBalancers = []
+
+    for page in elb.get_paginator("describe_load_balancers").paginate():
+        loadBalancers.extend(page["LoadBalancerDescriptions"])
+
+    return loadBalancers
+
+@inventory_item
+def describe_file_systems(session) -> list:
+    """
+    EFS File Systems
+    """
+    efs = session.client("efs")
+    fileSystems = []
+
+    for page in efs.get_paginator("describe_file_systems").paginate():
+        fileSystems.extend(page["FileSystems"])
+
+    return fileSystems
+
+@inventory_item
+def list_tables(session) -> list:
+    """
+    DynamoDB Table names
+    """
+    dynamodb = session.client("dynamodb")
+    tableNames = []
+
+    for page in dynamodb.get_paginator("list_tables").paginate():
+        tableNames.extend(page["TableNames"])
+
+    return tableNames
+
+@inventory_item
+def describe_tables(session) -> list:
+    """
+    DescribeTable responses for every DynamoDB Table
+    """
+    dynamodb = session.client("dynamodb")
+
+    return [dynamodb.describe_table(TableName=table) for table in list_tables(session)]
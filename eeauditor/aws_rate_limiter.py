@@ -0,0 +1,88 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import threading
+from botocore.retries import bucket, standard, throttling
+from botocore.retries.adaptive import ClientRateLimiter, RateClocker
+
+logger = logging.getLogger("AwsRateLimiter")
+
+class AwsRateLimiter(object):
+    """
+    Adaptive (CUBIC) token bucket rate limiters - the same ones botocore uses for the "adaptive" retry mode - kept per
+    service and shared by every client and thread of a Session, so per Account, Region and service API. A limiter does
+    nothing until its service returns a throttling error, from then on the send rate follows the throttling responses
+    """
+
+    def __init__(self):
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_limiter() -> ClientRateLimiter:
+        """
+        Builds a rate limiter the same way as botocore.retries.adaptive.register_retry_handler() does for a client
+        """
+        clock = bucket.Clock()
+
+        return ClientRateLimiter(
+            rate_adjustor=throttling.CubicCalculator(starting_max_rate=0, start_time=clock.current_time()),
+            rate_clocker=RateClocker(clock),
+            token_bucket=bucket.TokenBucket(max_rate=1, clock=clock),
+            throttling_detector=standard.ThrottlingErrorDetector(retry_event_adapter=standard.RetryEventAdapter()),
+            clock=clock
+        )
+
+    def get_limiter(self, eventName: str) -> ClientRateLimiter:
+        """
+        Returns the rate limiter of the service an event was emitted for, e.g., "before-send.ec2.DescribeInstances"
+        """
+        service = eventName.split(".")[1]
+        limiter = self._limiters.get(service)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(service, self.create_limiter())
+
+        return limiter
+
+    # botocore "before-send" handler, emitted for every attempt including retries
+    def on_sending_request(self, event_name, **kwargs):
+        self.get_limiter(event_name).on_sending_request(**kwargs)
+
+    # botocore "needs-retry" handler, emitted for every response (or failure to get one)
+    def on_receiving_response(self, event_name, **kwargs):
+        limiter = self.get_limiter(event_name)
+        wasEnabled = limiter._enabled
+        limiter.on_receiving_response(**kwargs)
+        if limiter._enabled and not wasEnabled:
+            logger.info(
+                "Throttling response received for %s, rate limiting all further requests to it",
+                event_name.split(".")[1]
+            )
+
+    def register_session(self, session):
+        """
+        Rate limits every client created from a boto3 Session, this must be called before any clients are created from
+        the Session as clients copy the event hooks of their Session
+        """
+        session.events.register("before-send", self.on_sending_request)
+        session.events.register("needs-retry", self.on_receiving_response)
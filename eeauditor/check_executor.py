@@ -0,0 +1,195 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("CheckExecutor")
+
+# How many pending units are allowed per worker before submission blocks on the oldest one
+WINDOW_PER_WORKER = 4
+# How long a Check waits on another Check filling the same cache key before filling it itself
+SINGLE_FLIGHT_TIMEOUT = 300
+
+def run_ordered(units, maxWorkers=1):
+    """
+    Runs an iterable of "units" - zero-argument callables that return an iterable of findings - and yields the findings
+    in the exact order the units were provided. With `maxWorkers` of 1 (or less) every unit runs inline and lazily on the
+    calling thread, which is the classic ElectricEye behavior. Otherwise units are fanned out to a bounded thread pool and
+    only a small window of finished units is ever held in memory while waiting on the oldest one
+    """
+    if maxWorkers is None or maxWorkers <= 1:
+        for unit in units:
+            yield from unit()
+        return
+
+    windowSize = maxWorkers * WINDOW_PER_WORKER
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="ElectricEye") as executor:
+        try:
+            # `units` is consumed lazily so that any planning work (sessions, sleeps) interleaves with execution
+            for unit in units:
+                pending.append(executor.submit(materialize_unit, unit))
+                while len(pending) >= windowSize:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # If the consumer stops early, do not start any units which have not been picked up yet
+            for future in pending:
+                future.cancel()
+
+def materialize_unit(unit):
+    """
+    Drains a unit on a worker thread so the results can be handed back in order
+    """
+    return list(unit())
+
+class SingleFlightCache(dict):
+    """
+    Thread safe Auditor cache for Checks of the same Auditor running concurrently. Auditors use the pattern of
+    `cache.get(key)` followed by `cache[key] = value` when the key is missing, so a miss on `get()` hands the calling
+    thread a per-key lock which is only released once it stores the key. Every other thread asking for the same key waits
+    and then receives the stored value, meaning only a single caller ever fills (and calls the APIs for) a given key. A
+    thread which would wait on a key whose filler is itself waiting on a key held by this thread fetches the key on its own
+    instead of deadlocking until the timeout
+    """
+
+    def __init__(self, *args, lockTimeout=SINGLE_FLIGHT_TIMEOUT, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lockTimeout = lockTimeout
+        self._locks = {}
+        self._locksLock = threading.Lock()
+        self._held = threading.local()
+        # key -> ident of the thread filling it, and thread ident -> key it is waiting on, guarded by _locksLock
+        self._owners = {}
+        self._waiting = {}
+
+    def get(self, key, default=None):
+        if key in self:
+            return super().get(key, default)
+
+        heldKeys = self.held_keys()
+        if key in heldKeys:
+            # this thread is already filling the key
+            return default
+
+        threadId = threading.get_ident()
+        with self._locksLock:
+            lock = self._locks.setdefault(key, threading.Lock())
+            if lock.acquire(blocking=False):
+                self._owners[key] = threadId
+                acquired = True
+            elif self.waits_on(key, threadId):
+                # the thread filling this key is (indirectly) waiting on a key this thread is filling, e.g., two Checks
+                # taking two keys in opposite orders, waiting would stall both of them until the timeout
+                acquired = None
+            else:
+                self._waiting[threadId] = key
+                acquired = False
+
+        if acquired is None:
+            logger.warning(
+                "Waiting on another Check to cache %s would deadlock, fetching it again.",
+                key
+            )
+            return super().get(key, default)
+
+        if not acquired:
+            acquired = lock.acquire(timeout=self.lockTimeout)
+            with self._locksLock:
+                del self._waiting[threadId]
+                if acquired:
+                    self._owners[key] = threadId
+            if not acquired:
+                logger.warning(
+                    "Timed out waiting on another Check to cache %s, fetching it again.",
+                    key
+                )
+                return super().get(key, default)
+
+        # the key may have been stored while this thread was waiting on the lock
+        if key in self:
+            self.release_lock(key)
+            return super().get(key, default)
+
+        heldKeys.add(key)
+        return default
+
+    def waits_on(self, key, threadId) -> bool:
+        """
+        Follows the owners of `key`, and the keys those owners are waiting on, and returns True when the chain leads back
+        to `threadId`. Must be called while holding `_locksLock`
+        """
+        seen = set()
+        owner = self._owners.get(key)
+        while owner is not None and owner not in seen:
+            if owner == threadId:
+                return True
+            seen.add(owner)
+            waitingOn = self._waiting.get(owner)
+            owner = self._owners.get(waitingOn) if waitingOn is not None else None
+        return False
+
+    def release_lock(self, key):
+        """
+        Releases the per-key lock held by the current thread
+        """
+        with self._locksLock:
+            self._owners.pop(key, None)
+            self._locks[key].release()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        heldKeys = self.held_keys()
+        if key in heldKeys:
+            heldKeys.discard(key)
+            self.release_lock(key)
+
+    def held_keys(self):
+        """
+        Returns the keys the current thread was handed to fill and has not stored yet
+        """
+        if not hasattr(self._held, "keys"):
+            self._held.keys = set()
+        return self._held.keys
+
+    def release(self, key):
+        """
+        Releases a single key the current thread was handed to fill without storing it
+        """
+        heldKeys = self.held_keys()
+        if key in heldKeys:
+            heldKeys.discard(key)
+            self.release_lock(key)
+
+    def release_held(self):
+        """
+        Releases every key the current thread never stored (e.g., the Check failed or returned early) so other threads
+        waiting on those keys can fill them on their own
+        """
+        heldKeys = self.held_keys()
+        while heldKeys:
+            self.release_lock(heldKeys.pop())
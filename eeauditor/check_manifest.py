@@ -0,0 +1,163 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import ast
+import hashlib
+import json
+import logging
+from os import environ, listdir, makedirs, path, replace
+
+logger = logging.getLogger("CheckManifest")
+
+# The manifest is written here and rebuilt (per Auditor) whenever the source of an Auditor changes
+CHECK_MANIFEST_CACHE_DIR = environ.get(
+    "ELECTRICEYE_CACHE_DIR", path.join(path.expanduser("~"), ".cache", "electriceye")
+)
+CHECK_MANIFEST_CACHE_SCHEMA = 2
+
+class CheckManifest(object):
+    """
+    Auditor -> service -> Check names, docstrings and the required provider for every Auditor in a search path (the
+    provider is the name of the search path, e.g., "aws" for ./auditors/aws), built by parsing the source of the Auditors
+    instead of importing them. This lets ElectricEye list Checks and Controls, and find the Auditor of a single Check,
+    without importing every Auditor and their (heavy) dependencies
+    """
+
+    def __init__(self, searchPath: str, auditors: dict):
+        self.searchPath = searchPath
+        # {auditorName: {"hash": str, "provider": str,
+        #   "checks": [{"service": str, "check": str, "description": str | None}]}}
+        self.auditors = auditors
+
+    @classmethod
+    def load(cls, searchPath: str, cacheDir: str = CHECK_MANIFEST_CACHE_DIR):
+        """
+        Returns the manifest for a search path of Auditors, reusing the on-disk manifest for every Auditor whose source
+        hash is unchanged and parsing the rest. The on-disk manifest is refreshed whenever anything changed
+        """
+        searchPath = path.abspath(searchPath)
+        provider = path.basename(searchPath)
+        cacheFile = path.join(cacheDir, f"check-manifest-{path.basename(searchPath)}.json")
+
+        cachedAuditors = {}
+        try:
+            with open(cacheFile) as jsonfile:
+                cached = json.load(jsonfile)
+            if cached.get("schema") == CHECK_MANIFEST_CACHE_SCHEMA and cached.get("searchPath") == searchPath:
+                cachedAuditors = cached["auditors"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug("Could not read cached Check manifest %s: %s", cacheFile, e)
+
+        auditors = {}
+        for auditorName in cls.list_auditors(searchPath):
+            with open(path.join(searchPath, f"{auditorName}.py"), "rb") as auditorFile:
+                source = auditorFile.read()
+            sourceHash = hashlib.sha256(source).hexdigest()
+
+            cachedAuditor = cachedAuditors.get(auditorName)
+            if cachedAuditor and cachedAuditor.get("hash") == sourceHash and cachedAuditor.get("provider") == provider:
+                auditors[auditorName] = cachedAuditor
+            else:
+                logger.debug("Parsing Checks of Auditor %s", auditorName)
+                auditors[auditorName] = {"hash": sourceHash, "provider": provider, "checks": cls.parse_checks(source)}
+
+        manifest = cls(searchPath, auditors)
+
+        if auditors != cachedAuditors:
+            try:
+                makedirs(cacheDir, exist_ok=True)
+                # write to a temporary file first so concurrent runs never read a half-written manifest
+                with open(f"{cacheFile}.tmp", "w") as jsonfile:
+                    json.dump(
+                        {"schema": CHECK_MANIFEST_CACHE_SCHEMA, "searchPath": searchPath, "auditors": auditors}, jsonfile
+                    )
+                replace(f"{cacheFile}.tmp", cacheFile)
+            except OSError as e:
+                logger.info("Could not write Check manifest cache %s: %s", cacheFile, e)
+
+        return manifest
+
+    @staticmethod
+    def list_auditors(searchPath: str) -> list[str]:
+        """
+        Returns the names of the Auditor modules in a search path in the same (sorted) order as PluginBase
+        """
+        return sorted(
+            fileName[:-3] for fileName in listdir(searchPath)
+            if fileName.endswith(".py") and fileName != "__init__.py"
+        )
+
+    @staticmethod
+    def parse_checks(source: bytes) -> list[dict]:
+        """
+        Returns every function in the source of an Auditor that is decorated with @registry.register_check("service"),
+        in the order they are defined (and registered in)
+        """
+        checks = []
+        for node in ast.parse(source).body:
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for decorator in node.decorator_list:
+                if (
+                    isinstance(decorator, ast.Call)
+                    and isinstance(decorator.func, ast.Attribute)
+                    and decorator.func.attr == "register_check"
+                    and decorator.args
+                    and isinstance(decorator.args[0], ast.Constant)
+                ):
+                    checks.append(
+                        {
+                            "service": decorator.args[0].value,
+                            "check": node.name,
+                            # not cleaned so descriptions match the __doc__ of the imported Check exactly
+                            "description": ast.get_docstring(node, clean=False)
+                        }
+                    )
+
+        return checks
+
+    def get_checks(self, auditorName: str | None = None) -> dict:
+        """
+        Returns {service: {checkName: check}} in the same order as CheckRegister would after loading the Auditors,
+        each check is a dict with the Auditor name, required provider, Check name and description
+        """
+        checks = {}
+        for name, auditor in self.auditors.items():
+            if auditorName and name != auditorName:
+                continue
+            for check in auditor["checks"]:
+                checks.setdefault(check["service"], {})[check["check"]] = {
+                    "auditor": name,
+                    "provider": auditor["provider"],
+                    "check": check["check"],
+                    "description": check["description"]
+                }
+
+        return checks
+
+    def find_auditors(self, checkName: str) -> list[str]:
+        """
+        Returns the names of the Auditors which define a Check
+        """
+        return [
+            name for name, auditor in self.auditors.items()
+            if any(check["check"] == checkName for check in auditor["checks"])
+        ]
@@ -19,13 +19,20 @@
 #under the License.
 
 import logging
+import threading
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import CredentialProvider, RefreshableCredentials
 from tomli import load as tomload
 import sys
 from os import environ, path, chmod
 from re import compile
 import json
+from functools import partial
 from botocore.exceptions import ClientError
+from aws_rate_limiter import AwsRateLimiter
+from check_executor import SingleFlightCache
 from google.oauth2 import service_account
 from azure.identity import ClientSecretCredential
 from azure.mgmt.resource.subscriptions import SubscriptionClient
@@ -37,6 +44,147 @@ logger = logging.getLogger("CloudUtils")
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 AWS_MULTI_ACCOUNT_TARGET_TYPE_CHOICES = ["Accounts", "OU", "Organization"]
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
+# Pooled clients are shared by every Check of every Auditor in an Account and Region, botocore defaults to 10 connections
+AWS_CLIENT_MAX_POOL_CONNECTIONS = 50
+# "standard" retries have a retry quota (budget) per client, pooled clients share it across every Check
+AWS_CLIENT_RETRIES = {"mode": "standard", "max_attempts": 10}
+
+class AwsSession(boto3.Session):
+    """
+    Boto3 Session that is shared by every Auditor running for the same AWS Account and Region. Sessions are not thread safe
+    while clients are being created, so client and resource creation is serialized - the clients themselves are thread safe.
+    Clients are pooled by service name, arguments and botocore Config so that each is only built once per Session, and
+    every client shares the adaptive rate limiter of its service (see `aws_rate_limiter`).
+    The `inventory` holds resources enumerated once and shared across Auditors, see `aws_inventory`
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._clientLock = threading.RLock()
+        self._clients = {}
+        self._defaultClientConfig = Config(
+            max_pool_connections=AWS_CLIENT_MAX_POOL_CONNECTIONS,
+            retries=AWS_CLIENT_RETRIES
+        )
+        self.inventory = SingleFlightCache()
+        self.rateLimiter = AwsRateLimiter()
+        self.rateLimiter.register_session(self)
+
+    @staticmethod
+    def client_key(args: tuple, kwargs: dict) -> tuple:
+        """
+        Returns the pool key for the arguments of a client() call, Configs are keyed by the options they set as
+        Auditors create their own (equivalent) Config objects
+        """
+        keyItems = []
+        for key, value in sorted(kwargs.items()):
+            if isinstance(value, Config):
+                value = tuple(sorted((k, repr(v)) for k, v in value._user_provided_options.items()))
+            keyItems.append((key, value))
+
+        return (args, tuple(keyItems))
+
+    def client(self, *args, **kwargs):
+        clientKey = self.client_key(args, kwargs)
+        with self._clientLock:
+            client = self._clients.get(clientKey)
+            if client is None:
+                config = kwargs.get("config")
+                kwargs["config"] = self._defaultClientConfig.merge(config) if config else self._defaultClientConfig
+                client = super().client(*args, **kwargs)
+                self._clients[clientKey] = client
+
+            return client
+
+    def resource(self, *args, **kwargs):
+        with self._clientLock:
+            return super().resource(*args, **kwargs)
+
+class BrokeredCredentialProvider(CredentialProvider):
+    """
+    botocore credential provider which hands out the shared refreshable credentials of the AwsCredentialBroker, it is
+    placed first in the credential chain of a botocore Session so the environment, config files and instance metadata are
+    never consulted
+    """
+    METHOD = "electriceye-credential-broker"
+    CANONICAL_NAME = "ElectricEyeCredentialBroker"
+
+    def __init__(self, credentials: RefreshableCredentials):
+        super().__init__()
+        self.credentials = credentials
+
+    def load(self) -> RefreshableCredentials:
+        return self.credentials
+
+class AwsCredentialBroker(object):
+    """
+    Assumes the ElectricEye IAM Role once per AWS Account and hands out Region-scoped Sessions which all share the same
+    refreshable credentials. botocore renews the credentials with another AssumeRole call shortly before they expire, so
+    long running assessments do not fail with expired tokens midway through an Account
+    """
+
+    def __init__(self):
+        self._credentials = {}
+        self._lock = threading.Lock()
+        self._sts = None
+
+    def assume_role(self, roleArn: str) -> dict:
+        """
+        Assumes an AWS IAM Role and returns the credentials in the format expected by botocore RefreshableCredentials
+        """
+        if self._sts is None:
+            self._sts = boto3.client("sts")
+
+        try:
+            memberAcct = self._sts.assume_role(
+                RoleArn=roleArn,
+                RoleSessionName="ElectricEye"
+            )
+            logger.info("Assumed role: %s successfully", roleArn)
+        except ClientError as e:
+            logger.error(
+                "Failed to assume role %s: %s",
+                roleArn, e
+            )
+            raise e
+
+        return {
+            "access_key": memberAcct["Credentials"]["AccessKeyId"],
+            "secret_key": memberAcct["Credentials"]["SecretAccessKey"],
+            "token": memberAcct["Credentials"]["SessionToken"],
+            "expiry_time": memberAcct["Credentials"]["Expiration"].isoformat()
+        }
+
+    def get_credentials(self, roleArn: str) -> RefreshableCredentials:
+        """
+        Returns the refreshable credentials for an AWS IAM Role, only the first call per Role calls AssumeRole
+        """
+        with self._lock:
+            credentials = self._credentials.get(roleArn)
+            if credentials is None:
+                credentials = RefreshableCredentials.create_from_metadata(
+                    metadata=self.assume_role(roleArn),
+                    refresh_using=partial(self.assume_role, roleArn),
+                    method="sts-assume-role"
+                )
+                self._credentials[roleArn] = credentials
+
+        return credentials
+
+    def create_session(self, roleArn: str, region: str) -> AwsSession:
+        """
+        Creates a Region-scoped Session using the shared credentials of an AWS IAM Role. Every Session gets its own
+        botocore Session as the Region is set there, the credentials object is thread safe and shared
+        """
+        botocoreSession = botocore.session.get_session()
+        botocoreSession.get_component("credential_provider").insert_before(
+            "env", BrokeredCredentialProvider(self.get_credentials(roleArn))
+        )
+
+        return AwsSession(botocore_session=botocoreSession, region_name=region)
+
+# Shared by every Session created with CloudConfig.create_aws_session() so each Role is only assumed once per run
+awsCredentialBroker = AwsCredentialBroker()
 
 class CloudConfig(object):
     """
@@ -662,35 +810,14 @@ class CloudConfig(object):
         return accounts
 
     # This function is called outside of this Class
-    def create_aws_session(account: str, partition: str, region: str, roleName: str) -> boto3.Session:
+    def create_aws_session(account: str, partition: str, region: str, roleName: str) -> AwsSession:
         """
-        Creates a Boto3 Session by assuming a given AWS IAM Role
+        Creates a Boto3 Session for a Region by assuming a given AWS IAM Role, the Role is only assumed once per Account
+        and the credentials are refreshed automatically before they expire
         """
         crossAccountRoleArn = f"arn:{partition}:iam::{account}:role/{roleName}"
 
-        sts = boto3.client("sts")
-
-        try:
-            memberAcct = sts.assume_role(
-                RoleArn=crossAccountRoleArn,
-                RoleSessionName="ElectricEye"
-            )
-            logger.info("Assumed role: %s successfully", crossAccountRoleArn)
-        except ClientError as e:
-            logger.error(
-                "Failed to assume role %s: %s",
-                crossAccountRoleArn, e
-            )
-            raise e
-
-        session = boto3.Session(
-            aws_access_key_id=memberAcct["Credentials"]["AccessKeyId"],
-            aws_secret_access_key=memberAcct["Credentials"]["SecretAccessKey"],
-            aws_session_token=memberAcct["Credentials"]["SessionToken"],
-            region_name=region
-        )
-
-        return session
+        return awsCredentialBroker.create_session(crossAccountRoleArn, region)
     
     # This function is called outside of this Class and from create_aws_session()
     def check_aws_partition(region: str) -> str:
@@ -18,61 +18,67 @@
 #specific language governing permissions and limitations
 #under the License.
 
+import cProfile
 import sys
 import click
 from eeauditor import EEAuditor
+from run_profiler import RunProfiler
 from processor.main import get_providers, process_findings
+from processor.json_stream_writer import COMPRESSION_CHOICES
 from os import environ
 
 def print_controls(assessmentTarget, args, useToml, auditorName=None, tomlPath=None):
     app = EEAuditor(assessmentTarget, args, useToml, tomlPath)
 
-    app.load_plugins(auditorName)
-        
-    app.print_controls_json()
+    # Controls are read from the Check manifest, Auditors are not imported
+    app.print_controls_json(auditorName)
 
 def print_checks(assessmentTarget, args, useToml, auditorName=None, tomlPath=None):
     app = EEAuditor(assessmentTarget, args, useToml, tomlPath)
 
-    app.load_plugins(auditorName)
-        
-    app.print_checks_md()
+    # Checks are read from the Check manifest, Auditors are not imported
+    app.print_checks_md(auditorName)
 
-def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=None, delay=0, outputs=None, outputFile="", tomlPath=None):
+def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=None, delay=0, outputs=None, outputFile="", tomlPath=None, maxWorkers=1, checkWorkers=1, outputBatchSize=1000, ndjson=False, outputCompression="none", runReport=None, profileOutput=None):
     if not outputs:
         outputs = ["stdout"]
+
+    profiler = RunProfiler() if runReport else None
+    if profileOutput:
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
     
-    app = EEAuditor(assessmentTarget, args, useToml, tomlPath)
+    app = EEAuditor(assessmentTarget, args, useToml, tomlPath, profiler=profiler)
 
-    app.load_plugins(auditorName)
-    # Per-target calls - ensure you use the right run_*_checks*() function
+    # Only the Auditor(s) of a single Check are loaded when one is requested
+    app.load_plugins(auditorName, pluginName)
+    # Per-target calls - ensure you use the right run_*_checks*() function, these are generators which are
+    # only consumed once the Outputs start processing findings so they are never fully held in memory
     
     # Amazon Web Services
     if assessmentTarget == "AWS":
-        findings = list(app.run_aws_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_aws_checks(pluginName=pluginName, delay=delay, maxWorkers=maxWorkers, checkWorkers=checkWorkers)
     # Google Cloud Platform
     if assessmentTarget == "GCP":
-        findings = list(app.run_gcp_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_gcp_checks(pluginName=pluginName, delay=delay)
     # Oracle Cloud Infrastructure
     if assessmentTarget == "OCI":
-        findings = list(app.run_oci_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_oci_checks(pluginName=pluginName, delay=delay)
     # Microsoft Azure
     if assessmentTarget == "Azure":
-        findings = list(app.run_azure_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_azure_checks(pluginName=pluginName, delay=delay)
     # Microsoft 365
     if assessmentTarget == "M365":
-        findings = list(app.run_m365_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_m365_checks(pluginName=pluginName, delay=delay)
     # Salesforce
     if assessmentTarget == "Salesforce":
-        findings = list(app.run_salesforce_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_salesforce_checks(pluginName=pluginName, delay=delay)
     # Snowflake
     if assessmentTarget == "Snowflake":
-        findings = list(app.run_snowflake_checks(pluginName=pluginName, delay=delay))
+        findings = app.run_snowflake_checks(pluginName=pluginName, delay=delay)
     # ServiceNow
     if assessmentTarget == "ServiceNow":
-        findings = list(app.run_non_aws_checks(pluginName=pluginName, delay=delay))
-
-    print(f"Done running Checks for {assessmentTarget}")
+        findings = app.run_non_aws_checks(pluginName=pluginName, delay=delay)
 
     if tomlPath is None:
         environ["TOML_FILE_PATH"] = "None"
@@ -83,9 +89,22 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
     process_findings(
         findings=findings,
         outputs=outputs,
-        output_file=outputFile
+        batchSize=outputBatchSize,
+        output_file=outputFile,
+        ndjson=ndjson,
+        compression=outputCompression
     )
 
+    if profileOutput:
+        cprofiler.disable()
+        cprofiler.dump_stats(profileOutput)
+        print(f"Wrote cProfile stats to {profileOutput}")
+
+    if profiler is not None:
+        profiler.write_report(runReport)
+
+    print(f"Done running Checks for {assessmentTarget}")
+
 @click.command()
 # Assessment Target
 @click.option(
@@ -127,6 +146,22 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
     default=0, 
     help="Time in seconds to sleep between Auditors being ran, defaults to 0. Use this argument to avoid rate limiting"
 )
+# Max Workers
+@click.option(
+    "-mw",
+    "--max-workers",
+    default=1,
+    show_default=True,
+    help="Maximum number of Auditors to run concurrently across every Account and Region. Only AWS is supported, defaults to 1 which runs every Auditor one after another"
+)
+# Check Workers
+@click.option(
+    "-cw",
+    "--check-workers",
+    default=1,
+    show_default=True,
+    help="Maximum number of Checks within a single Auditor to run concurrently, Checks share cached API results so each call is still only made once. Only AWS is supported, defaults to 1"
+)
 # Outputs
 @click.option(
     "-o",
@@ -136,6 +171,14 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
     show_default=True,
     help="A list of Outputs (files, APIs, databases, ChatOps) to send ElectricEye Findings, specify multiple with additional arguments: -o csv -o postgresql -o slack",
 )
+# Output Batch Size
+@click.option(
+    "-obs",
+    "--output-batch-size",
+    default=1000,
+    show_default=True,
+    help="Number of findings handed to streaming Outputs at a time, this bounds how many findings are held in memory when every selected Output supports streaming"
+)
 # Output File Name
 @click.option(
     "-of",
@@ -144,6 +187,37 @@ def run_auditor(assessmentTarget, args, useToml, auditorName=None, pluginName=No
     show_default=True, 
     help="For file outputs such as JSON and CSV, the name of the file, DO NOT SPECIFY .file_type"
 )
+# NDJSON
+@click.option(
+    "-nd",
+    "--ndjson",
+    is_flag=True,
+    default=False,
+    help="Write the json, json_normalized, cam_json, ocsf_v1_1_0, ocsf_v1_4_0 and ocsf_stdout Outputs as newline-delimited JSON (one compact finding per line) instead of an indented JSON array, these are ready to be split and queried by Athena or Spark"
+)
+# Output Compression
+@click.option(
+    "-oc",
+    "--output-compression",
+    type=click.Choice(COMPRESSION_CHOICES),
+    default="none",
+    show_default=True,
+    help="Compress the JSON file Outputs (json, json_normalized, cam_json, ocsf_v1_1_0, ocsf_v1_4_0), zstd requires the optional zstandard package"
+)
+# Run Report
+@click.option(
+    "-rr",
+    "--run-report",
+    default=None,
+    help="Write a report of the wall time, findings, failures and AWS API calls of every Check (rolled up per Auditor, Account and Region) to this path. Paths ending in .csv receive a CSV of every Check, any other path receives JSON"
+)
+# cProfile Output
+@click.option(
+    "-po",
+    "--profile-output",
+    default=None,
+    help="Profile the run with cProfile and dump the stats to this path for use with pstats or snakeviz. Only the main thread is profiled, leave --max-workers and --check-workers at 1 for a complete profile"
+)
 # List Output Options
 @click.option(
     "-lo",
@@ -198,8 +272,15 @@ def main(
     auditor_name,
     check_name,
     delay,
+    max_workers,
+    check_workers,
     outputs,
+    output_batch_size,
     output_file,
+    ndjson,
+    output_compression,
+    run_report,
+    profile_output,
     list_options,
     list_checks,
     list_controls,
@@ -211,6 +292,7 @@ def main(
         print_controls(
             assessmentTarget=target_provider,
             args=args,
+            auditorName=auditor_name,
             tomlPath=toml_path,
             useToml=use_toml,
         )
@@ -228,6 +310,7 @@ def main(
         print_checks(
             assessmentTarget=target_provider,
             args=args,
+            auditorName=auditor_name,
             tomlPath=toml_path,
             useToml=use_toml,
         )
@@ -242,7 +325,14 @@ def main(
         outputs=outputs,
         outputFile=output_file,
         tomlPath=toml_path,
-        useToml=use_toml
+        useToml=use_toml,
+        maxWorkers=max_workers,
+        checkWorkers=check_workers,
+        outputBatchSize=output_batch_size,
+        ndjson=ndjson,
+        outputCompression=output_compression,
+        runReport=run_report,
+        profileOutput=profile_output
     )
 
 if __name__ == "__main__":
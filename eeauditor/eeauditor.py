@@ -21,12 +21,13 @@
 import logging
 from os import path
 from functools import partial
-from inspect import getfile
 from time import sleep
 import json
-from requests import get
+from aws_endpoints import AwsEndpointIndex
+from check_manifest import CheckManifest
 from check_register import CheckRegister
-from cloud_utils import CloudConfig
+from check_executor import SingleFlightCache, run_ordered
+from cloud_utils import AwsSession, CloudConfig
 from pluginbase import PluginBase
 
 logging.basicConfig(level=logging.INFO)
@@ -41,10 +42,12 @@ class EEAuditor(object):
     credentials and cross-boundary configurations, and runs Checks and yields results back to controller.py CLI
     """
 
-    def __init__(self, assessmentTarget, args, useToml, tomlPath=None, searchPath=None):
+    def __init__(self, assessmentTarget, args, useToml, tomlPath=None, searchPath=None, profiler=None):
         # each check must be decorated with the @registry.register_check("cache_name") to be discovered during plugin loading.
         self.registry = CheckRegister()
         self.name = assessmentTarget
+        # optional RunProfiler which records timing, findings and API calls of every Check
+        self.profiler = profiler
         self.plugin_base = PluginBase(package="electriceye")
         ##################################
         # PUBLIC CLOUD SERVICE PROVIDERS #
@@ -129,16 +132,30 @@ class EEAuditor(object):
             utils = CloudConfig(assessmentTarget, tomlPath, useToml, args)
 
         # Search path for Auditors
+        self.searchPath = getPath(searchPath)
         self.source = self.plugin_base.make_plugin_source(
-            searchpath=[getPath(searchPath)], identifier=self.name
+            searchpath=[self.searchPath], identifier=self.name
         )
     
-    # Called from eeauditor/controller.py print_checks() and run_auditor()
-    def load_plugins(self, auditorName=None):
+    # Called from eeauditor/controller.py run_auditor()
+    def load_plugins(self, auditorName=None, checkName=None):
         """
-        Loads from pluginbase, works on a search path override as long as the checks have the registry class and decorator
+        Loads from pluginbase, works on a search path override as long as the checks have the registry class and decorator.
+        When only a single Check is requested, only the Auditor(s) which define it (per the Check manifest) are loaded
         """
         if auditorName:
+            auditorNames = [auditorName]
+        elif checkName:
+            auditorNames = CheckManifest.load(self.searchPath).find_auditors(checkName)
+            if not auditorNames:
+                logger.warning(
+                    "Check %s was not found in any Auditor for %s",
+                    checkName, self.name
+                )
+        else:
+            auditorNames = self.source.list_plugins()
+
+        for auditorName in auditorNames:
             try:
                 self.source.load_plugin(auditorName)
             except Exception as e:
@@ -147,97 +164,52 @@ class EEAuditor(object):
                     auditorName, e
                 )
                 raise e
-        else:
-            for auditorName in self.source.list_plugins():
-                try:
-                    self.source.load_plugin(auditorName)
-                except Exception as e:
-                    logger.error(
-                        "Failed to load plugin %s with exception: %s",
-                        auditorName, e
-                    )
-                    raise e
 
-    # Called within this class    
-    def check_service_endpoint_availability(self, endpointData, awsPartition, service, awsRegion):
+    # Called within this class
+    def check_service_endpoint_availability(self, endpointIndex, awsPartition, service, awsRegion):
         """
-        This function downloads the latest version of botocore's endpoints.json file from GitHub and checks if a provided
+        This function uses the precomputed index of the installed botocore's endpoints.json file to check if a provided
         service within a specific AWS Partition and Region is available
         """
+        return endpointIndex.is_service_available(awsPartition, service, awsRegion)
+    
+    # Called within this class
+    def profile_check(self, check, checkName, account, region):
+        """
+        Returns the Check as-is, or wrapped so the RunProfiler records it when profiling is enabled
+        """
+        if self.profiler is None:
+            return check
 
-        # these are "endpoints" and not real regions, since ElectricEye provides local overrides to the "global"
-        # AWS region within each Auditor already as long as these are present for a specific service then we're good
-        globalEndpointPseudoRegions = [
-            "aws-global", "fips-aws-global", "aws-cn-global", "aws-us-gov-global", "aws-us-gov-global-fips", "iam-govcloud", "iam-govcloud-fips", "aws-iso-global", "aws-iso-b-global", "aws-iso-e-global"
-        ]
-
-        # FIS isn't in the endpoints for some reason, which is stupid, so I need to have a list of FIS regions
-        # https://docs.aws.amazon.com/general/latest/gr/fis.html
-        fisRegions = [
-            "us-east-2", "us-east-1", "us-west-2", "us-west-1", "af-south-1", "ap-east-1", "ap-south-1", "ap-northeast-2", "ap-southeast-1", "ap-southeast-2", "ap-northeast-1", "ca-central-1", "eu-central-1", "eu-west-1", "eu-west-2", "eu-south-1", "eu-west-3", "eu-north-1", "me-south-1", "sa-east-1", "us-gov-east-1", "us-gov-west-1"
-        ]
-
-        # overrides - some services fall under a service's "endpoint" and not so much a dedicated namespace from what I can tell??
-        # we're overriding these just to trick ElectricEye into *not* aborting for certain services and also not re-naming plugins which use the same cache
-        if service == "globalaccelerator":
-            service = "iam"
-        elif service == "imagebuilder":
-            service = "ec2"
-        elif service == "elasticloadbalancingv2":
-            service = "elasticloadbalancing"
-        elif service == "fis":
-            if awsRegion in fisRegions:
-                return True
-            else:
-                return False
-
-        for partition in endpointData["partitions"]:
-            if awsPartition == partition["partition"]:
-                services = partition["services"]
-                for serviceName, serviceData in services.items():
-                    try:
-                        # ecr, sagemaker, and a few other services have "api." on their names
-                        # which is not consistent with the service at all
-                        serviceName = str(serviceName).split("api.")[1]
-                    except IndexError:
-                        serviceName = serviceName
-                    
-                    # Compare the provided service name (from ElectricEye Plugin name) to service derived from the endpoint data
-                    if service == serviceName:
-                        regions = list(serviceData["endpoints"].keys())
-                        # Backcheck on the "global" services e.g., Support, Trustedadvisor, CloudFront, IAM
-                        if any(item in globalEndpointPseudoRegions for item in regions):
-                            serviceAvailable = True
-                            break
-                        # Each service endpoint has a dict of Regions where the endpoint is available, at this point we have a valid service availability for the region + partition
-                        if awsRegion in regions:
-                            serviceAvailable = True
-                            break
-                        else:
-                            serviceAvailable = False
-                        # break if there is nothing else
-                        break
-                    else:
-                        serviceAvailable = False
+        def profiled_check(**kwargs):
+            return self.profiler.instrument(check(**kwargs), self.name, check, checkName, account, region)
+
+        return profiled_check
 
-        return serviceAvailable
-    
     # Called from eeauditor/controller.py run_auditor()
-    def run_aws_checks(self, pluginName=None, delay=0):
+    def run_aws_checks(self, pluginName=None, delay=0, maxWorkers=1, checkWorkers=1):
         """
-        Runs AWS Auditors across all TOML-specified Accounts and Regions in a specific Partition
+        Runs AWS Auditors across all TOML-specified Accounts and Regions in a specific Partition. Every Auditor for every
+        Account and Region is a unit of work which is fanned out to up to `maxWorkers` threads, and the Checks within an
+        Auditor can run on up to `checkWorkers` threads. Findings are still yielded in the same order as a serial run
         """
-        import boto3
+        # Load the (cached) service availability index from botocore's endpoints.json once per run
+        endpointIndex = AwsEndpointIndex.load()
+
+        yield from run_ordered(
+            self.plan_aws_auditors(endpointIndex, pluginName, delay, checkWorkers),
+            maxWorkers=maxWorkers
+        )
 
+    # Called within this class
+    def plan_aws_auditors(self, endpointIndex, pluginName=None, delay=0, checkWorkers=1):
+        """
+        Lazily yields a unit of work for every Auditor that should run in every Account and Region. Service availability
+        and the once-per-Account "global" Auditor deduplication are decided here - in order - so that the same Auditors run
+        no matter how many workers execute the units
+        """
         # "Global" Auditors that should only need to be ran once per Account
         globalAuditors = ["cloudfront", "globalaccelerator", "iam", "health", "support", "account", "s3"]
-        
-        # Retrieve the endpoints.json data to prevent multiple outbound calls
-        endpointData = json.loads(
-            get(
-                "https://raw.githubusercontent.com/boto/botocore/develop/botocore/data/endpoints.json"
-            ).text
-        )
 
         for account in self.awsAccountTargets:
             # This list will contain the "global" services so they're not run multiple times
@@ -248,7 +220,7 @@ class EEAuditor(object):
                 partition = CloudConfig.check_aws_partition(region)
                 # attempt to use current session creds
                 if self.electricEyeRoleName is None or self.electricEyeRoleName == "":
-                    session = boto3.Session(region_name=region)
+                    session = AwsSession(region_name=region)
                     logger.info(
                         "Using current session credentials for Account %s in region %s",
                         account, region
@@ -265,13 +237,13 @@ class EEAuditor(object):
                         "Using STS AssumeRole credentials for Account %s in region %s",
                         account, region
                     )
+                # count the API calls of every client created from this Session
+                if self.profiler is not None:
+                    self.profiler.register_session(session)
 
                 for serviceName, checkList in self.registry.checks.items():
-                    # Pass the Cache at the "serviceName" level aka Plugin
-                    auditorCache = {}
-
                     # Check service availability, not always accurate
-                    if self.check_service_endpoint_availability(endpointData, partition, serviceName, region) is False:
+                    if self.check_service_endpoint_availability(endpointIndex, partition, serviceName, region) is False:
                         logger.info(
                             "%s is not available in %s",
                             serviceName, region
@@ -310,37 +282,90 @@ class EEAuditor(object):
                             )
                             continue
 
-                    for checkName, check in checkList.items():
-                        # if a specific check is requested, only run that one check
-                        if (
-                            not pluginName
-                            or pluginName
-                            and pluginName == checkName
-                        ):
-                            try:
-                                logger.info(
-                                    "Executing AWS Check %s for Account %s in region %s",
-                                    checkName, account, region
-                                )
-
-                                for finding in check(
-                                    cache=auditorCache,
-                                    session=session,
-                                    awsAccountId=account,
-                                    awsRegion=region,
-                                    awsPartition=partition
-                                ):
-                                    if finding is not None:
-                                        yield finding
-                            except Exception as e:
-                                logger.warning(
-                                    "Failed to execute check %s with exception: %s",
-                                    checkName, e
-                                )
+                    # if a specific check is requested, do not bother scheduling Auditors that do not contain it
+                    if pluginName and pluginName not in checkList:
+                        continue
+
+                    yield partial(
+                        self.run_aws_auditor,
+                        checkList=checkList,
+                        session=session,
+                        account=account,
+                        region=region,
+                        partition=partition,
+                        pluginName=pluginName,
+                        checkWorkers=checkWorkers
+                    )
                         
             # optional sleep if specified - defaults to 0 seconds
             sleep(delay)
 
+    # Called within this class
+    def run_aws_auditor(self, checkList, session, account, region, partition, pluginName=None, checkWorkers=1):
+        """
+        Runs every Check (or only the requested Check) of a single AWS Auditor for one Account and Region. With more than
+        one `checkWorkers` the Checks run concurrently against a single-flight cache, so every API call that fills the
+        cache is still made once and all other Checks wait for (and share) its result
+        """
+        # Pass the Cache at the "serviceName" level aka Plugin
+        if checkWorkers > 1:
+            auditorCache = SingleFlightCache()
+        else:
+            auditorCache = {}
+
+        checkUnits = []
+        for checkName, check in checkList.items():
+            # if a specific check is requested, only run that one check
+            if (
+                not pluginName
+                or pluginName
+                and pluginName == checkName
+            ):
+                checkUnits.append(
+                    partial(
+                        self.run_aws_check,
+                        check=check,
+                        checkName=checkName,
+                        cache=auditorCache,
+                        session=session,
+                        account=account,
+                        region=region,
+                        partition=partition
+                    )
+                )
+
+        yield from run_ordered(checkUnits, maxWorkers=checkWorkers)
+
+    # Called within this class
+    def run_aws_check(self, check, checkName, cache, session, account, region, partition):
+        """
+        Runs a single AWS Check and yields its findings, failures are logged and do not stop the Auditor
+        """
+        try:
+            logger.info(
+                "Executing AWS Check %s for Account %s in region %s",
+                checkName, account, region
+            )
+
+            for finding in self.profile_check(check, checkName, account, region)(
+                cache=cache,
+                session=session,
+                awsAccountId=account,
+                awsRegion=region,
+                awsPartition=partition
+            ):
+                if finding is not None:
+                    yield finding
+        except Exception as e:
+            logger.warning(
+                "Failed to execute check %s with exception: %s",
+                checkName, e
+            )
+        finally:
+            # hand any cache keys this Check never filled over to the other Checks
+            if isinstance(cache, SingleFlightCache):
+                cache.release_held()
+
     # Called from eeauditor/controller.py run_auditor()
     def run_gcp_checks(self, pluginName=None, delay=0):
         """
@@ -367,7 +392,7 @@ class EEAuditor(object):
                                 "Executing Check %s for GCP Project %s",
                                 checkName, project
                             )
-                            for finding in check(
+                            for finding in self.profile_check(check, checkName, project, region)(
                                 cache=auditorCache,
                                 awsAccountId=account,
                                 awsRegion=region,
@@ -412,7 +437,7 @@ class EEAuditor(object):
                             "Executing Check %s for OCI",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.profile_check(check, checkName, account, region)(
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -461,7 +486,7 @@ class EEAuditor(object):
                                 "Executing Check %s for Azure Sub %s",
                                 checkName, azSubId
                             )
-                            for finding in check(
+                            for finding in self.profile_check(check, checkName, azSubId, region)(
                                 cache=auditorCache,
                                 awsAccountId=account,
                                 awsRegion=region,
@@ -506,7 +531,7 @@ class EEAuditor(object):
                             "Executing Check %s for M365",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.profile_check(check, checkName, account, region)(
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -554,7 +579,7 @@ class EEAuditor(object):
                             "Executing Check %s for Salesforce",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.profile_check(check, checkName, account, region)(
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -603,7 +628,7 @@ class EEAuditor(object):
                             "Executing Check %s for Snowflake",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.profile_check(check, checkName, account, region)(
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -657,7 +682,7 @@ class EEAuditor(object):
                             "Executing Check %s",
                             checkName
                         )
-                        for finding in check(
+                        for finding in self.profile_check(check, checkName, account, region)(
                             cache=auditorCache,
                             awsAccountId=account,
                             awsRegion=region,
@@ -674,37 +699,39 @@ class EEAuditor(object):
             sleep(delay)
 
     # Called from eeauditor/controller.py print_checks()
-    def print_checks_md(self):
+    def print_checks_md(self, auditorName=None):
+        """
+        Prints a markdown table of every Check from the Check manifest, Auditors are not imported
+        """
         table = []
         table.append("| Auditor Name | Check Name | Check Description |")
         table.append("|---|---|---|")
-        # Just use some built-in functions to get the function name (__name__) and the Description/docstring (__doc__)
-        for serviceName, checkList in self.registry.checks.items():
+        for serviceName, checkList in CheckManifest.load(self.searchPath).get_checks(auditorName).items():
             for checkName, check in checkList.items():
-                doc = check.__doc__
+                doc = check["description"]
                 if doc:
-                    description = str(check.__doc__).replace("\n", "").replace("    ", "")
+                    description = str(doc).replace("\n", "").replace("    ", "")
                 else:
                     description = "Docstring is missing, please open an Issue!"
-
-                auditorFile = getfile(check).rpartition("/")[2]
-                auditorName = auditorFile.split(".py")[0]
                 
                 table.append(
-                    f"| {auditorName} | {check.__name__} | {description} |"
+                    f"| {check['auditor']} | {checkName} | {description} |"
                 )
 
         print("\n".join(table))
     
-    # Called from eeauditor/controller.py print_checks()
-    def print_controls_json(self):
+    # Called from eeauditor/controller.py print_controls()
+    def print_controls_json(self, auditorName=None):
+        """
+        Prints every Check title (docstring) from the Check manifest, Auditors are not imported
+        """
         controlPrinter = []
 
-        for serviceName, checkList in self.registry.checks.items():
+        for serviceName, checkList in CheckManifest.load(self.searchPath).get_checks(auditorName).items():
             for checkName, check in checkList.items():
-                doc = check.__doc__
+                doc = check["description"]
                 if doc:
-                    description = str(check.__doc__).replace("\n", "").replace("    ", "")
+                    description = str(doc).replace("\n", "").replace("    ", "")
                 else:
                     description = "Docstring is missing, please open an Issue!"
                 
@@ -0,0 +1,151 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import sys
+
+ASFF_SCHEMA_VERSION = "2018-10-08"
+
+# Shared (never mutated) nested values of every finding, one object per Severity label and per Compliance state
+SEVERITIES = {
+    label: {"Label": label} for label in ("INFORMATIONAL", "LOW", "MEDIUM", "HIGH", "CRITICAL")
+}
+WORKFLOWS = {
+    status: {"Status": status} for status in ("NEW", "NOTIFIED", "RESOLVED", "SUPPRESSED")
+}
+
+# Interned RelatedRequirements keyed by their tuple, Checks mapped to the same controls share one list and the same strings
+RELATED_REQUIREMENTS_POOL = {}
+
+def intern_requirements(relatedRequirements) -> list:
+    """
+    Returns the pooled list of `Compliance.RelatedRequirements` for a sequence of controls, every string is interned so
+    Checks (and Auditors) mapped to the same controls share the same objects. The list is shared and must never be
+    mutated, it stays a list so Outputs which write it as-is (e.g., `str()` in json_normalized) see no difference
+    """
+    requirements = tuple(sys.intern(requirement) for requirement in relatedRequirements)
+
+    return RELATED_REQUIREMENTS_POOL.setdefault(requirements, list(requirements))
+
+class FindingTemplate(object):
+    """
+    The static parts of a Check's findings - Types, Title, Remediation, the Asset classification of `ProductFields`, and
+    `Compliance` - built once per Check and shared by every finding it yields, only the per-resource fields are created
+    for each finding. `build()` returns a plain ASFF dict, with the keys in the same order as a hand-written finding, so
+    Outputs, Security Hub and every other consumer see no difference. The nested values are shared between findings
+    and must never be mutated, Outputs copy any nested value they change
+    """
+
+    def __init__(
+        self,
+        title: str,
+        types: list,
+        remediationText: str,
+        remediationUrl: str,
+        relatedRequirements: list,
+        assetClass: str,
+        assetService: str,
+        assetComponent: str,
+        resourceType: str,
+        provider: str = "AWS",
+        providerType: str = "CSP"
+    ):
+        self.title = sys.intern(title)
+        # Types are kept a list, the PostgreSQL Output writes them as-is into a TEXT[] column
+        self.types = [sys.intern(findingType) for findingType in types]
+        self.remediation = {
+            "Recommendation": {
+                "Text": remediationText,
+                "Url": remediationUrl
+            }
+        }
+        self.provider = provider
+        self.providerType = providerType
+        self.assetClass = assetClass
+        self.assetService = assetService
+        self.assetComponent = assetComponent
+        self.resourceType = resourceType
+        self.relatedRequirements = intern_requirements(relatedRequirements)
+        self.compliance = {
+            status: {"Status": status, "RelatedRequirements": self.relatedRequirements} for status in ("PASSED", "FAILED")
+        }
+
+    def build(
+        self,
+        findingId: str,
+        productArn: str,
+        awsAccountId: str,
+        timestamp: str,
+        severity: str,
+        description: str,
+        providerAccountId: str,
+        assetRegion: str,
+        assetDetails,
+        resourceId: str,
+        resourcePartition: str,
+        resourceRegion: str,
+        resourceDetails: dict = None,
+        passed: bool = False,
+        title: str = None,
+        confidence: int = 99
+    ) -> dict:
+        """
+        Returns a full ASFF finding, a failing finding is NEW and ACTIVE while a passing finding is RESOLVED and ARCHIVED.
+        The `title` overrides the Template's Title for Checks which generate their Title, e.g., from a config file
+        """
+        resource = {
+            "Type": self.resourceType,
+            "Id": resourceId,
+            "Partition": resourcePartition,
+            "Region": resourceRegion
+        }
+        if resourceDetails is not None:
+            resource["Details"] = resourceDetails
+
+        return {
+            "SchemaVersion": ASFF_SCHEMA_VERSION,
+            "Id": findingId,
+            "ProductArn": productArn,
+            "GeneratorId": findingId,
+            "AwsAccountId": awsAccountId,
+            "Types": self.types,
+            "FirstObservedAt": timestamp,
+            "CreatedAt": timestamp,
+            "UpdatedAt": timestamp,
+            "Severity": SEVERITIES[severity],
+            "Confidence": confidence,
+            "Title": title if title is not None else self.title,
+            "Description": description,
+            "Remediation": self.remediation,
+            "ProductFields": {
+                "ProductName": "ElectricEye",
+                "Provider": self.provider,
+                "ProviderType": self.providerType,
+                "ProviderAccountId": providerAccountId,
+                "AssetRegion": assetRegion,
+                "AssetDetails": assetDetails,
+                "AssetClass": self.assetClass,
+                "AssetService": self.assetService,
+                "AssetComponent": self.assetComponent
+            },
+            "Resources": [resource],
+            "Compliance": self.compliance["PASSED" if passed else "FAILED"],
+            "Workflow": WORKFLOWS["RESOLVED" if passed else "NEW"],
+            "RecordState": "ARCHIVED" if passed else "ACTIVE"
+        }
@@ -0,0 +1,186 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Error codes for which an entire batch call (or an individual entry) is worth sending again
+RETRYABLE_ERROR_CODES = [
+    "InternalError",
+    "InternalFailure",
+    "InternalServiceError",
+    "InternalServerError",
+    "ServiceUnavailable",
+    "ServiceUnavailableException",
+    "Throttling",
+    "ThrottlingException",
+    "ThrottledException",
+    "RequestThrottled",
+    "RequestThrottledException",
+    "TooManyRequestsException",
+    "LimitExceededException",
+    "RequestLimitExceeded",
+    "ProvisionedThroughputExceededException",
+    "SlowDown"
+]
+DEFAULT_BATCH_MAX_WORKERS = 4
+DEFAULT_BATCH_MAX_ATTEMPTS = 5
+DEFAULT_BATCH_BASE_DELAY = 0.25
+DEFAULT_BATCH_MAX_DELAY = 10.0
+# How many packed batches are allowed per worker before packing blocks on the oldest one
+WINDOW_PER_WORKER = 4
+
+def pack_batches(entries, maxEntries: int, maxBytes: int):
+    """
+    Greedily packs `(entry, sizeInBytes)` pairs into lists of entries that stay within both the per-call entry count and
+    the per-call payload size of a batch API. Entries are kept in order, every entry must already fit within `maxBytes`
+    """
+    batch = []
+    batchBytes = 0
+    for entry, size in entries:
+        if batch and (len(batch) >= maxEntries or batchBytes + size > maxBytes):
+            yield batch
+            batch = []
+            batchBytes = 0
+        batch.append(entry)
+        batchBytes += size
+
+    if batch:
+        yield batch
+
+class AwsBatchSender(object):
+    """
+    Sends entries to an AWS batch API (SQS SendMessageBatch, Firehose PutRecordBatch, Security Hub BatchImportFindings)
+    from a small thread pool. `sendBatch` receives a list of entries and returns a tuple of the entries to retry and the
+    entries which permanently failed, only the retryable ones are sent again with jittered exponential backoff. Entries can
+    be added with any number of `send()` calls and `close()` waits on every batch, a bounded window of in-flight batches
+    keeps memory flat no matter how many entries are sent
+    """
+
+    def __init__(
+        self,
+        sendBatch,
+        maxEntries: int,
+        maxBytes: int,
+        maxEntryBytes: int = None,
+        maxWorkers: int = DEFAULT_BATCH_MAX_WORKERS,
+        maxAttempts: int = DEFAULT_BATCH_MAX_ATTEMPTS,
+        baseDelay: float = DEFAULT_BATCH_BASE_DELAY,
+        maxDelay: float = DEFAULT_BATCH_MAX_DELAY,
+        serviceName: str = "AWS"
+    ):
+        self.sendBatch = sendBatch
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.maxEntryBytes = maxEntryBytes if maxEntryBytes is not None else maxBytes
+        self.maxWorkers = max(1, maxWorkers)
+        self.maxAttempts = max(1, maxAttempts)
+        self.baseDelay = baseDelay
+        self.maxDelay = maxDelay
+        self.serviceName = serviceName
+        self.delivered = 0
+        self.failed = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pending = deque()
+
+    def send(self, entries):
+        """
+        Packs `(entry, sizeInBytes)` pairs into batches and hands them to the thread pool. Entries larger than
+        `maxEntryBytes` can never be accepted by the API and are counted as failed without being sent
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.maxWorkers, thread_name_prefix=self.serviceName)
+
+        for batch in pack_batches(self.drop_oversized(entries), self.maxEntries, self.maxBytes):
+            self.pending.append(self.executor.submit(self.send_with_retries, batch))
+            while len(self.pending) >= self.maxWorkers * WINDOW_PER_WORKER:
+                self.pending.popleft().result()
+
+    def drop_oversized(self, entries):
+        for entry, size in entries:
+            if size > self.maxEntryBytes:
+                print(f"Skipping an entry of {size} bytes as it exceeds the {self.maxEntryBytes} byte {self.serviceName} limit.")
+                self.record(failed=1)
+                continue
+            yield entry, size
+
+    def close(self):
+        """
+        Waits on every in-flight batch and shuts down the thread pool, returns a tuple of delivered and failed entries
+        """
+        while self.pending:
+            self.pending.popleft().result()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+        return self.delivered, self.failed
+
+    def send_with_retries(self, batch: list):
+        """
+        Sends a batch, sending only the entries which failed with a retryable error again until `maxAttempts` is reached
+        """
+        for attempt in range(self.maxAttempts):
+            try:
+                retryEntries, failedEntries = self.sendBatch(batch)
+            except ClientError as ce:
+                errorCode = ce.response["Error"]["Code"]
+                if errorCode in RETRYABLE_ERROR_CODES:
+                    retryEntries, failedEntries = batch, []
+                else:
+                    print(f"Failed to send a batch of {len(batch)} entries to {self.serviceName} due to: {ce}")
+                    retryEntries, failedEntries = [], batch
+            except BotoCoreError as be:
+                # botocore has already retried connection errors by now, and parameter validation errors never succeed
+                print(f"Failed to send a batch of {len(batch)} entries to {self.serviceName} due to: {be}")
+                retryEntries, failedEntries = [], batch
+
+            self.record(
+                delivered=len(batch) - len(retryEntries) - len(failedEntries),
+                failed=len(failedEntries),
+                calls=1
+            )
+
+            if not retryEntries:
+                return
+            batch = retryEntries
+            if attempt < self.maxAttempts - 1:
+                sleep(self.backoff(attempt))
+
+        print(f"Giving up on {len(batch)} entries to {self.serviceName} after {self.maxAttempts} attempts.")
+        self.record(failed=len(batch))
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full jitter exponential backoff
+        """
+        return random.uniform(0, min(self.maxDelay, self.baseDelay * (2 ** attempt)))
+
+    def record(self, delivered: int = 0, failed: int = 0, calls: int = 0):
+        with self.lock:
+            self.delivered += delivered
+            self.failed += failed
+            self.calls += calls
@@ -0,0 +1,91 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+import base64
+
+# ASFF Severity Labels and the CAM field their findings are counted in
+CAM_SEVERITY_COUNTERS = {
+    "INFORMATIONAL": "InformationalSeverityFindings",
+    "LOW": "LowSeverityFindings",
+    "MEDIUM": "MediumSeverityFindings",
+    "HIGH": "HighSeverityFindings",
+    "CRITICAL": "CriticalSeverityFindings"
+}
+
+class CamAccumulator(object):
+    """
+    Single pass group-by of ElectricEye findings into Cloud Asset Management (CAM) entries, one per `Resources.[0].Id`.
+    Findings can be added in any number of batches (e.g., as they stream in) and only one entry per Asset is held. The
+    Asset metadata, including the base64 decoded `AssetDetails`, comes from the first finding seen for the Asset so
+    `AssetDetails` is only decoded once per Asset
+    """
+
+    def __init__(self):
+        self.assets = {}
+        self.findingsProcessed = 0
+
+    def add_findings(self, findings):
+        for finding in findings:
+            self.add_finding(finding)
+
+    def add_finding(self, finding: dict):
+        assetId = finding["Resources"][0]["Id"]
+        firstObserved = finding["FirstObservedAt"]
+        self.findingsProcessed += 1
+
+        entry = self.assets.get(assetId)
+        if entry is None:
+            productFields = finding["ProductFields"]
+            assetDetails = productFields.get("AssetDetails", "")
+            if assetDetails:
+                assetDetails = json.loads(base64.b64decode(assetDetails).decode("utf-8"))
+
+            entry = {
+                "AssetId": assetId,
+                "FirstObservedAt": firstObserved,
+                "Provider": productFields.get("Provider", ""),
+                "ProviderType": productFields.get("ProviderType", ""),
+                "ProviderAccountId": productFields.get("ProviderAccountId", ""),
+                "AssetRegion": productFields.get("AssetRegion", ""),
+                "AssetDetails": assetDetails,
+                "AssetClass": productFields.get("AssetClass", ""),
+                "AssetService": productFields.get("AssetService", ""),
+                "AssetComponent": productFields.get("AssetComponent", ""),
+                "InformationalSeverityFindings": 0,
+                "LowSeverityFindings": 0,
+                "MediumSeverityFindings": 0,
+                "HighSeverityFindings": 0,
+                "CriticalSeverityFindings": 0
+            }
+            self.assets[assetId] = entry
+        elif str(firstObserved) < str(entry["FirstObservedAt"]):
+            entry["FirstObservedAt"] = firstObserved
+
+        counter = CAM_SEVERITY_COUNTERS.get(finding["Severity"]["Label"])
+        if counter:
+            entry[counter] += 1
+
+    def get_cam_entries(self) -> list[dict]:
+        """
+        Returns the CAM entries in the order their Assets were first seen
+        """
+        return list(self.assets.values())
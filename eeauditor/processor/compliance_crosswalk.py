@@ -0,0 +1,160 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import json
+from os import path
+from threading import Lock
+
+here = path.abspath(path.dirname(__file__))
+CONTROLS_CROSSWALK_FILE = f"{here}/outputs/mapped_compliance_controls.json"
+
+NIST_CSF_V1_1_PREFIX = "NIST CSF V1.1"
+
+# NOTE TO SELF: Updated this and FAQ.md as new standards are added
+SUPPORTED_FRAMEWORKS = [
+    "NIST CSF V1.1",
+    "NIST SP 800-53 Rev. 4",
+    "AICPA TSC",
+    "ISO 27001:2013",
+    "CIS Critical Security Controls V8",
+    "NIST SP 800-53 Rev. 5",
+    "NIST SP 800-171 Rev. 2",
+    "CSA Cloud Controls Matrix V4.0",
+    "CMMC 2.0",
+    "UK NCSC Cyber Essentials V2.2",
+    "HIPAA Security Rule 45 CFR Part 164 Subpart C",
+    "FFIEC Cybersecurity Assessment Tool",
+    "NERC Critical Infrastructure Protection",
+    "NYDFS 23 NYCRR Part 500",
+    "UK NCSC Cyber Assessment Framework V3.1",
+    "PCI-DSS V4.0",
+    "NZISM V3.5",
+    "ISO 27001:2022",
+    "Critical Risk Profile V1.2",
+    "ECB CROE",
+    "Equifax SCF V1.0",
+    "FBI CJIS Security Policy V5.9",
+    "CIS Amazon Web Services Foundations Benchmark V1.5",
+    "CIS Amazon Web Services Foundations Benchmark V2.0",
+    "CIS Amazon Web Services Foundations Benchmark V3.0",
+    "MITRE ATT&CK",
+    "CIS AWS Database Services Benchmark V1.0",
+    "CIS Microsoft Azure Foundations Benchmark V2.0.0",
+    "CIS Snowflake Foundations Benchmark V1.0.0"
+]
+
+class ComplianceCrosswalk(object):
+    """
+    Precompiled index of the NIST CSF V1.1 Subcategory crosswalk (`mapped_compliance_controls.json`) shared by every
+    Output. The file is loaded once, each Subcategory's crosswalked controls are deduplicated into a tuple up front, and
+    both the expanded `Compliance.RelatedRequirements` and the control framework lookups are memoized as the same
+    requirement lists repeat across every finding a Check emits
+    """
+
+    def __init__(self, crosswalkFile=CONTROLS_CROSSWALK_FILE, frameworks=SUPPORTED_FRAMEWORKS):
+        with open(crosswalkFile) as jsonfile:
+            controlsCrosswalk = json.load(jsonfile)
+
+        # Not every single NIST CSF Control maps across to other frameworks, those are simply missing from the index
+        self.crosswalk = {
+            subcategory: tuple(dict.fromkeys(controls)) for subcategory, controls in controlsCrosswalk.items()
+        }
+        # Framework names keyed by their length so a control only needs one dict lookup per distinct prefix length
+        self.frameworks = tuple(frameworks)
+        self.frameworkOrder = {framework: index for index, framework in enumerate(self.frameworks)}
+        self.frameworkLengths = sorted({len(framework) for framework in self.frameworks})
+        self.controlFrameworks = {}
+        self.expandedRequirements = {}
+        self.requirementStandards = {}
+        self.lock = Lock()
+
+    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory: str) -> tuple:
+        """
+        Returns a tuple of the additional control framework control IDs that mapped into a provided NIST CSF V1.1
+        Subcategory (control), or an empty tuple if it does not map to anything
+        """
+        return self.crosswalk.get(nistCsfSubcategory, ())
+
+    def expand_requirements(self, relatedRequirements) -> list:
+        """
+        Returns a new list of `Compliance.RelatedRequirements` followed by the deduplicated crosswalked controls of every
+        NIST CSF V1.1 Subcategory within it. A new list is returned every time so callers can never mutate the finding
+        or the memoized expansion
+        """
+        key = tuple(relatedRequirements)
+        expanded = self.expandedRequirements.get(key)
+        if expanded is None:
+            newControls = {}
+            for control in key:
+                if str(control).startswith(NIST_CSF_V1_1_PREFIX):
+                    newControls.update(dict.fromkeys(self.nist_csf_v_1_1_controls_crosswalk(control)))
+            expanded = key + tuple(newControls)
+            with self.lock:
+                self.expandedRequirements[key] = expanded
+
+        return list(expanded)
+
+    def expand_finding(self, finding: dict) -> dict:
+        """
+        Returns a shallow copy of a finding with its `Compliance.RelatedRequirements` expanded, the finding itself (which
+        other Outputs may read next) is never changed
+        """
+        return {
+            **finding,
+            "Compliance": {
+                **finding["Compliance"],
+                "RelatedRequirements": self.expand_requirements(finding["Compliance"]["RelatedRequirements"])
+            }
+        }
+
+    def get_control_frameworks(self, control: str) -> tuple:
+        """
+        Returns a tuple of every supported framework a control ID starts with, in `SUPPORTED_FRAMEWORKS` order
+        """
+        control = str(control)
+        frameworks = self.controlFrameworks.get(control)
+        if frameworks is None:
+            matches = [
+                control[:length] for length in self.frameworkLengths if control[:length] in self.frameworkOrder
+            ]
+            frameworks = tuple(sorted(matches, key=self.frameworkOrder.get))
+            with self.lock:
+                self.controlFrameworks[control] = frameworks
+
+        return frameworks
+
+    def get_standards(self, relatedRequirements) -> list:
+        """
+        Returns the unique supported frameworks (OCSF `compliance.standards`) referenced by a list of controls, in
+        the order they are first referenced
+        """
+        key = tuple(relatedRequirements)
+        standards = self.requirementStandards.get(key)
+        if standards is None:
+            frameworks = {}
+            for control in key:
+                frameworks.update(dict.fromkeys(self.get_control_frameworks(control)))
+            standards = tuple(frameworks)
+            with self.lock:
+                self.requirementStandards[key] = standards
+
+        return list(standards)
+
+complianceCrosswalk = ComplianceCrosswalk()
@@ -0,0 +1,96 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import json
+from base64 import b64decode
+from collections.abc import Sequence
+
+def decode_asset_details(assetDetails):
+    """
+    Base64 decodes and loads the JSON of a `ProductFields.AssetDetails` value, None is kept for the placeholder findings
+    of Checks where the Asset doesn't exist
+    """
+    if assetDetails is None:
+        return None
+
+    return json.loads(b64decode(assetDetails).decode("utf-8"))
+
+class DecodedFindings(Sequence):
+    """
+    Read-only view over a list of findings where `ProductFields.AssetDetails` is decoded lazily, the first time each
+    finding is read, and then reused by every Output reading the same view. Findings without `ProductFields.AssetDetails`
+    are handed out as-is. Decoded findings are shallow copies which share everything but `ProductFields` with the original
+    finding, and findings sharing the same encoded `AssetDetails` (see `asset_details.encode_asset_details()`) share the
+    decoded value, so Outputs must copy (never mutate) any nested value they change
+    """
+
+    def __init__(self, findings: list):
+        self.findings = findings
+        self.decoded = [None] * len(findings)
+        # id() of an encoded AssetDetails -> (encoded, decoded), the encoded value is held so its id() cannot be reused
+        self.assetDetails = {}
+
+    def __len__(self):
+        return len(self.findings)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.findings)))]
+
+        decodedFinding = self.decoded[index]
+        if decodedFinding is None:
+            finding = self.findings[index]
+            if "AssetDetails" in finding["ProductFields"]:
+                decodedFinding = {**finding, "ProductFields": {**finding["ProductFields"],
+                    "AssetDetails": self.decode_shared(finding["ProductFields"]["AssetDetails"])
+                }}
+            else:
+                decodedFinding = finding
+            self.decoded[index] = decodedFinding
+
+        return decodedFinding
+
+    def decode_shared(self, assetDetails):
+        """
+        Decodes an encoded AssetDetails once for every finding of the view which shares the same encoded buffer
+        """
+        entry = self.assetDetails.get(id(assetDetails))
+        if entry is not None and entry[0] is assetDetails:
+            return entry[1]
+
+        decodedAssetDetails = decode_asset_details(assetDetails)
+        if assetDetails is not None:
+            self.assetDetails[id(assetDetails)] = (assetDetails, decodedAssetDetails)
+
+        return decodedAssetDetails
+
+    def __iter__(self):
+        for index in range(len(self.findings)):
+            yield self[index]
+
+def get_decoded_findings(findings: list, decodedFindings: DecodedFindings = None) -> DecodedFindings:
+    """
+    Returns the shared view handed to the Output by `process_findings()` when it is a view of the same findings,
+    otherwise (e.g., an Output used on its own) a new view of the findings
+    """
+    if decodedFindings is not None and decodedFindings.findings is findings:
+        return decodedFindings
+
+    return DecodedFindings(findings)
@@ -0,0 +1,99 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import gzip
+import io
+import json
+import sys
+from textwrap import indent
+
+# Choices for the --output-compression CLI argument
+COMPRESSION_CHOICES = ["none", "gzip", "zstd"]
+COMPRESSION_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+def open_output_file(fileName: str, compression: str = None):
+    """
+    Opens a text file for writing, optionally gzip or Zstandard compressed. Zstandard needs the optional `zstandard`
+    package, returns the file object and the final name of the file (with the compression extension)
+    """
+    if compression in (None, "none"):
+        return open(fileName, "w", encoding="utf-8"), fileName
+
+    fileName = f"{fileName}{COMPRESSION_EXTENSIONS[compression]}"
+
+    if compression == "gzip":
+        return gzip.open(fileName, "wt", encoding="utf-8"), fileName
+
+    try:
+        import zstandard
+    except ImportError:
+        print("The 'zstandard' package is required for Zstandard compressed outputs, install it with 'pip install zstandard' or use gzip.")
+        sys.exit(2)
+
+    rawFile = open(fileName, "wb")
+    return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(rawFile, closefd=True), encoding="utf-8"), fileName
+
+class JsonStreamWriter(object):
+    """
+    Writes records to a file (or stdout) one at a time as they are produced so memory stays flat. The default mode writes
+    the same indented JSON array as `json.dump(records, f, indent=4)`, NDJSON mode writes one compact record per line
+    which can be split and read directly by Athena, Spark and friends. Files can optionally be gzip or Zstandard compressed
+    """
+
+    def __init__(self, fileName: str = None, ndjson: bool = False, compression: str = None, default=None):
+        self.ndjson = ndjson
+        self.default = default
+        self.recordsWritten = 0
+        if fileName is None:
+            self.file = sys.stdout
+            self.fileName = None
+        else:
+            if ndjson and fileName.endswith(".json"):
+                fileName = f"{fileName[:-len('.json')]}.ndjson"
+            self.file, self.fileName = open_output_file(fileName, compression)
+
+    def write(self, record):
+        if self.ndjson:
+            self.file.write(json.dumps(record, default=self.default))
+            self.file.write("\n")
+        else:
+            self.file.write("[\n" if self.recordsWritten == 0 else ",\n")
+            self.file.write(indent(json.dumps(record, indent=4, default=self.default), "    "))
+        self.recordsWritten += 1
+
+    def write_records(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self) -> int:
+        """
+        Finishes the JSON array (if any) and closes the file, returns the amount of records written
+        """
+        if not self.ndjson:
+            self.file.write("[]" if self.recordsWritten == 0 else "\n]")
+            if self.fileName is None:
+                self.file.write("\n")
+
+        if self.fileName is None:
+            self.file.flush()
+        else:
+            self.file.close()
+
+        return self.recordsWritten
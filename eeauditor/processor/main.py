@@ -17,16 +17,47 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
+from itertools import islice
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.decoded_findings import DecodedFindings
 
-def process_findings(findings: list, outputs: list, **kwargs):
-    """Process all findings from json file and send to outputs sepecified"""
-    for output in outputs:
-        try:
-            ElectricEyeOutput.get_provider(output)().write_findings(findings=findings, **kwargs)
-        except Exception as e:
-            print(f"Error writing output: {e}")
-            raise e
+# Default amount of findings held in memory at once when every output supports streaming
+DEFAULT_BATCH_SIZE = 1000
+
+def process_findings(findings, outputs: list, batchSize: int = DEFAULT_BATCH_SIZE, **kwargs):
+    """
+    Process all findings and send to outputs sepecified. `findings` can be a list or a generator, it is consumed in chunks
+    of `batchSize` which are fanned out to every output that supports streaming. Outputs that only implement `write_findings()`
+    are handed every finding once the generator is exhausted - this is the only time the full list is kept in memory.
+    Every output is also handed the same `decodedFindings` view of the findings so `ProductFields.AssetDetails` is only
+    decoded once per finding no matter how many outputs read it
+    """
+    try:
+        providers = [ElectricEyeOutput.get_provider(output)() for output in outputs]
+        streamingProviders = [p for p in providers if ElectricEyeOutput.supports_streaming(p)]
+        bufferedProviders = [p for p in providers if not ElectricEyeOutput.supports_streaming(p)]
+        bufferedFindings = []
+
+        findings = iter(findings)
+        while True:
+            batch = list(islice(findings, batchSize))
+            if not batch:
+                break
+            decodedBatch = DecodedFindings(batch)
+            for provider in streamingProviders:
+                provider.write_batch(findings=batch, decodedFindings=decodedBatch, **kwargs)
+            if bufferedProviders:
+                bufferedFindings.extend(batch)
+
+        for provider in streamingProviders:
+            provider.close(**kwargs)
+
+        decodedFindings = DecodedFindings(bufferedFindings)
+        for provider in bufferedProviders:
+            provider.write_findings(findings=bufferedFindings, decodedFindings=decodedFindings, **kwargs)
+    except Exception as e:
+        print(f"Error writing output: {e}")
+        raise e
 
 def get_providers():
     return ElectricEyeOutput.get_all_providers()
\ No newline at end of file
@@ -0,0 +1,77 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from pymongo import ASCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Documents are upserted this many at a time unless the TOML overrides it
+DEFAULT_MONGODB_BATCH_SIZE = 1000
+
+class MongodbBulkUpserter(object):
+    """
+    Upserts documents with unordered bulk_write() calls of `batchSize` UpdateOne operations each, using a field of every
+    document as the MongoDB "_id". A failed document does not stop the rest of its batch (or the batches after it), the
+    failures are counted and reported per batch instead
+    """
+
+    def __init__(self, collection, idField: str, batchSize: int = DEFAULT_MONGODB_BATCH_SIZE):
+        self.collection = collection
+        self.idField = idField
+        self.batchSize = batchSize
+        self.upserted = 0
+        self.modified = 0
+        self.matched = 0
+        self.failed = 0
+
+    def create_indexes(self, fields: list[str]):
+        """
+        Creates (if missing) an ascending index on each of the fields, this is a no-op for existing indexes
+        """
+        for field in fields:
+            self.collection.create_index([(field, ASCENDING)])
+
+    def upsert(self, documents: list[dict]):
+        """
+        Upserts the documents in batches, every document is updated in place with its "_id"
+        """
+        for i in range(0, len(documents), self.batchSize):
+            operations = []
+            for doc in documents[i:i + self.batchSize]:
+                doc["_id"] = doc[self.idField]
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": doc}, upsert=True))
+
+            try:
+                result = self.collection.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as bwe:
+                details = bwe.details
+                writeErrors = details.get("writeErrors", [])
+                self.failed += len(writeErrors)
+                print(f"Failed to upsert {len(writeErrors)} of {len(operations)} documents in a batch to MongoDB.")
+                for writeError in writeErrors[:5]:
+                    print(f"Encountered an error during bulk_write() operation: {writeError.get('errmsg')}")
+
+            self.upserted += details.get("nUpserted", 0)
+            self.modified += details.get("nModified", 0)
+            self.matched += details.get("nMatched", 0)
+
+    def summary(self) -> str:
+        return f"{self.upserted} inserted, {self.matched} matched ({self.modified} modified) and {self.failed} failed"
@@ -23,10 +23,13 @@ import boto3
 import sys
 import os
 import json
-from base64 import b64decode
-#from hashlib import new as hasher
-from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.decoded_findings import get_decoded_findings
+from processor.aws_batch_sender import DEFAULT_BATCH_MAX_WORKERS, AwsBatchSender
+
+# SendMessageBatch accepts up to 10 messages and a total payload of 256 KiB per call
+SQS_MAX_BATCH_ENTRIES = 10
+SQS_MAX_BATCH_BYTES = 262144
 
 @ElectricEyeOutput
 class AmazonSqsProvider(object):
@@ -56,6 +59,7 @@ class AmazonSqsProvider(object):
         awsRegion = sqsDetails["amazon_sqs_queue_region"]
         if awsRegion is None or awsRegion == "":
             awsRegion = boto3.Session().region_name
+        maxWorkers = sqsDetails.get("amazon_sqs_max_workers", DEFAULT_BATCH_MAX_WORKERS)
 
         # Ensure that values are provided for all variable - use all() and a list comprehension to check the vars
         # empty strings will trigger `if not`
@@ -63,69 +67,86 @@ class AmazonSqsProvider(object):
             print("An empty value was detected in '[outputs.amazon_sqs]'. Review the TOML file and try again!")
             sys.exit(2)
 
+        if not isinstance(maxWorkers, int) or maxWorkers < 1:
+            print("The value for '[outputs.amazon_sqs.amazon_sqs_max_workers]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+
         self.queueUrl = queueUrl
-        self.queueBatchSize = queueBatchSize
+        # SendMessageBatch cannot take more than 10 messages, larger values from older TOML files are capped
+        self.queueBatchSize = min(int(queueBatchSize), SQS_MAX_BATCH_ENTRIES)
         self.sqs = boto3.client("sqs", region_name=awsRegion)
+        self.sender = AwsBatchSender(
+            self.send_message_batch_to_sqs,
+            maxEntries=self.queueBatchSize,
+            maxBytes=SQS_MAX_BATCH_BYTES,
+            maxWorkers=maxWorkers,
+            serviceName="Amazon SQS"
+        )
+        self.findingsProcessed = 0
 
     def write_findings(self, findings: list, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write to Amazon SQS!")
             exit(0)
 
-        print(f"Sending {len(findings)} findings to Amazon SQS in {self.queueBatchSize}-message batches.")
-
-        # Unfold the AssetDetails
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        del findings
-
-        for i in range(0, len(decodedFindings), self.queueBatchSize):
-            batch = (decodedFindings[i : i + self.queueBatchSize])
-            # Send to SQS
-            self.send_message_to_sqs(batch)
-
-        print(f"Done sending all findings to Amazon SQS!")
-    
-    '''
-    # This was meant for using the BatchSendMessage API which requires a message ID for each of the messages in a batch
-    # may make use of it...eventually? Uncomment the import statement above in case
-
-    def create_hashed_message_id(self, findingId):
+        self.write_batch(findings, **kwargs)
+        return self.close(**kwargs)
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Serializes a batch of findings, with their AssetDetails unfolded, into SQS messages and queues them up to be sent
+        """
+        if self.findingsProcessed == 0:
+            print(f"Sending findings to Amazon SQS in SendMessageBatch calls of up to {self.queueBatchSize} messages.")
+
+        self.findingsProcessed += len(findings)
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
+        self.sender.send(self.create_message_body(finding) for finding in decodedFindings)
+
+        return True
+
+    def close(self, **kwargs):
+        delivered, failed = self.sender.close()
+
+        print(
+            f"Done sending findings to Amazon SQS! {delivered} of {self.findingsProcessed} findings sent in {self.sender.calls} SendMessageBatch calls, {failed} failed."
+        )
+
+        return failed == 0
+
+    def create_message_body(self, finding: dict):
         """
-        Returns a SHA-1 hexdigest of no more than 80 characters from the "Id" of ASFF to use as a SQS MessageId
+        Returns a tuple of the JSON message body of a (decoded) finding and its size
         """
-        # Create the SHA1 hash object from the bytes of 'findingId' parsed from a finding
-        # and retrieve the digest
-        hashFinding = hasher("sha1").update(findingId.encode("utf-8")).hexdigest()
-                
-        # Truncate the hash if it exceeds 80 characters
-        if len(hashFinding) > 80:
-            hashFinding = hashFinding[:80]
-        
-        return hashFinding
-    '''
-
-    def send_message_to_sqs(self, batch):
+        messageBody = json.dumps(finding)
+
+        return messageBody, len(messageBody.encode("utf-8"))
+
+    def send_message_batch_to_sqs(self, batch: list):
         """
-        Writes batches of ASFF findings into SQS
+        Writes a batch of message bodies into SQS with a single SendMessageBatch call and returns a tuple of the message
+        bodies to retry and the ones which failed due to the sender (which will never succeed if sent again)
         """
-        sqs = self.sqs
-
-        for entry in batch:
-            try:
-                sqs.send_message(
-                    QueueUrl=self.queueUrl,
-                    MessageBody=json.dumps(entry),
-                    DelaySeconds=1
-                )
-            except ClientError as ce:
-                print(f"Batch failed due to: {ce}, continuing to the next.")
-                continue
\ No newline at end of file
+        # Entry IDs only need to be unique within a single call, so the position in the batch is used
+        response = self.sqs.send_message_batch(
+            QueueUrl=self.queueUrl,
+            Entries=[
+                {
+                    "Id": str(index),
+                    "MessageBody": messageBody,
+                    "DelaySeconds": 1
+                } for index, messageBody in enumerate(batch)
+            ]
+        )
+
+        retryEntries = []
+        failedEntries = []
+        for failure in response.get("Failed", []):
+            messageBody = batch[int(failure["Id"])]
+            if failure.get("SenderFault"):
+                print(f"Amazon SQS rejected a message due to: {failure.get('Code')} - {failure.get('Message')}")
+                failedEntries.append(messageBody)
+            else:
+                retryEntries.append(messageBody)
+
+        return retryEntries, failedEntries
\ No newline at end of file
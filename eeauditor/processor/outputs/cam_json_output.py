@@ -19,8 +19,8 @@
 #under the License.
 
 from processor.outputs.output_base import ElectricEyeOutput
-import json
-import base64
+from processor.cam_aggregator import CamAccumulator
+from processor.json_stream_writer import JsonStreamWriter
 from os import path
 
 here = path.abspath(path.dirname(__file__))
@@ -29,100 +29,42 @@ here = path.abspath(path.dirname(__file__))
 class CamJsonProvider(object):
     __provider__ = "cam_json"
 
+    def __init__(self):
+        # Findings are grouped by Asset as they stream in, only one CAM entry per Asset is held
+        self.accumulator = CamAccumulator()
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write to file!")
             exit(0)
 
-        camOutput = CamJsonProvider.process_findings(findings)
-
+        self.write_batch(findings, **kwargs)
         del findings
-    
-        # create output file based on inputs
-        jsonfile = f"{here}/ElectricEyeCAM_{output_file}.json"
-        print(f"Output file named: {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(
-                camOutput,
-                jsonfile,
-                indent=4,
-                default=str
-            )
-            
+
+        return self.close(output_file, **kwargs)
+
+    def write_batch(self, findings: list, **kwargs):
+        self.accumulator.add_findings(findings)
+
         return True
-    
-    def process_findings(findings):
-        """
-        This function uses the list comprehension to base64 decode all `AssetDetails` and then takes a selective
-        cross-section of unique per-asset details to be written to file within the main function
-        """
-        # This list contains the CAM output
-        cloudAssetManagementFindings = []
-        # Create a new list from raw findings that base64 decodes `AssetDetails` where it is not None, if it is, just
-        # use None and bring forward `ProductFields` where it is missing `AssetDetails`...which shouldn't happen
-        print(f"Base64 decoding AssetDetails for {len(findings)} ElectricEye findings.")
-
-        data = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        print(f"Completed base64 decoding for {len(data)} ElectricEye findings.")
-
-        # This list will contain unique identifiers from `Resources.[*].Id`
-        uniqueIds = set(item["Resources"][0]["Id"] for item in data)
-
-        print(f"Processing Asset and Finding Summary data for {len(uniqueIds)} unique Assets.")
-
-        for uid in uniqueIds:
-            subData = [item for item in data if item["Resources"][0]["Id"] == uid]
-            productFields = subData[0]["ProductFields"]
-            infoSevFindings = lowSevFindings = medSevFindings = highSevFindings = critSevFindings = 0
-            
-            for item in subData:
-                firstObserved = str(item["FirstObservedAt"])
-                sevLabel = item["Severity"]["Label"]
-                if sevLabel == "INFORMATIONAL":
-                    infoSevFindings += 1
-                elif sevLabel == "LOW":
-                    lowSevFindings += 1
-                elif sevLabel == "MEDIUM":
-                    medSevFindings += 1
-                elif sevLabel == "HIGH":
-                    highSevFindings += 1
-                elif sevLabel == "CRITICAL":
-                    critSevFindings += 1
-                
-            
-            cloudAssetManagementFindings.append(
-                {
-                    "AssetId": uid,
-                    "FirstObservedAt": firstObserved,
-                    "Provider": productFields.get("Provider", ""),
-                    "ProviderType": productFields.get("ProviderType", ""),
-                    "ProviderAccountId": productFields.get("ProviderAccountId", ""),
-                    "AssetRegion": productFields.get("AssetRegion", ""),
-                    "AssetDetails": productFields.get("AssetDetails", ""),
-                    "AssetClass": productFields.get("AssetClass", ""),
-                    "AssetService": productFields.get("AssetService", ""),
-                    "AssetComponent": productFields.get("AssetComponent", ""),
-                    "InformationalSeverityFindings": infoSevFindings,
-                    "LowSeverityFindings": lowSevFindings,
-                    "MediumSeverityFindings": medSevFindings,
-                    "HighSeverityFindings": highSevFindings,
-                    "CriticalSeverityFindings": critSevFindings
-                }
-            )
 
-        del findings
-        del data
-        del uniqueIds
-        del subData
+    def close(self, output_file: str, ndjson: bool = False, compression: str = None, **kwargs):
+        if self.accumulator.findingsProcessed == 0:
+            print("There are not any findings to write to file!")
+            return True
+
+        print(f"Processed Asset and Finding Summary data for {len(self.accumulator.assets)} unique Assets from {self.accumulator.findingsProcessed} ElectricEye findings.")
+
+        # create output file based on inputs
+        writer = JsonStreamWriter(
+            f"{here}/ElectricEyeCAM_{output_file}.json",
+            ndjson=ndjson,
+            compression=compression,
+            default=str
+        )
+        print(f"Output file named: {writer.fileName}")
+
+        writer.write_records(self.accumulator.get_cam_entries())
+        writer.close()
 
-        return cloudAssetManagementFindings
\ No newline at end of file
+        return True
@@ -24,10 +24,10 @@ import os
 import sys
 import requests
 import pymongo
-import json
-import base64
 from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.cam_aggregator import CamAccumulator
+from processor.mongodb_bulk import DEFAULT_MONGODB_BATCH_SIZE, MongodbBulkUpserter
 
 # Boto3 Clients
 ssm = boto3.client("ssm")
@@ -36,6 +36,15 @@ asm = boto3.client("secretsmanager")
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 
+# Fields that dashboards and queries filter on most, these are indexed when connecting
+CAM_MONGODB_INDEXED_FIELDS = [
+    "Provider",
+    "ProviderAccountId",
+    "AssetRegion",
+    "AssetClass",
+    "AssetService"
+]
+
 @ElectricEyeOutput
 class CamMongodbProvider(object):
     __provider__ = "cam_mongodb"
@@ -72,6 +81,8 @@ class CamMongodbProvider(object):
         mongodbPort = mongodbDetails["mongodb_port"]
         mongodbDatabaseName = mongodbDetails["mongodb_database_name"]
         mongodbCollectionName = mongodbDetails["mongodb_collection_name"]
+        # Optional, older TOML files will not have this value
+        mongodbBatchSize = mongodbDetails.get("mongodb_batch_size", DEFAULT_MONGODB_BATCH_SIZE)
 
         # Determine if a password if provided, and if so, retrieve it based on `credentials_location`
         if mongodbDetails["mongodb_password_in_use"] == True:
@@ -128,15 +139,42 @@ class CamMongodbProvider(object):
         self.password = password
         self.tlsPath = mongoTlsCertPath
 
+        if not isinstance(mongodbBatchSize, int) or mongodbBatchSize < 1:
+            print("The value for '[outputs.mongodb.mongodb_batch_size]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+        self.batchSize = mongodbBatchSize
+        # Findings are grouped by Asset as they stream in, only one CAM entry per Asset is held
+        self.accumulator = CamAccumulator()
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write!")
             exit(0)
-        
-        processedFindings = self.process_findings(findings)
 
+        self.write_batch(findings)
         del findings
-        
+
+        return self.close()
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Groups the findings into the per-Asset CAM entries, nothing is written until close()
+        """
+        self.accumulator.add_findings(findings)
+
+        return True
+
+    def close(self, **kwargs):
+        """
+        Upserts the per-Asset CAM entries and returns False when any entry failed to be upserted
+        """
+        if self.accumulator.findingsProcessed == 0:
+            print("There are not any findings to write!")
+            return True
+
+        processedFindings = self.accumulator.get_cam_entries()
+        print(f"Processed Asset and Finding Summary data for {len(processedFindings)} unique Assets from {self.accumulator.findingsProcessed} ElectricEye findings.")
+
         # There are different possible connection objects based on if Passwords are used and if TLS is enabled for AWS DocDB
 
         # Self-hosted, no password
@@ -160,26 +198,22 @@ class CamMongodbProvider(object):
             client = pymongo.MongoClient(connectionString)
             db = client[self.dbName]
             collection = db[f"{self.collName}_cam"]
-        except pymongo.errors.ConnectionError as e:
+            # use the CAM Output "AssetId" as the MongoDB "_id"
+            upserter = MongodbBulkUpserter(collection, "AssetId", self.batchSize)
+            upserter.create_indexes(CAM_MONGODB_INDEXED_FIELDS)
+        except pymongo.errors.ConnectionFailure as e:
             print(f"Connection or credential issue with MongoDB/AWS DocumentDB!")
             raise e
 
         print(f"Attempting to upsert {len(processedFindings)} findings to MongoDB.")
 
-        for doc in processedFindings:
-            try:
-                # use the CAM Output "AssetId" as the MongoDB "_id"
-                doc["_id"] = doc["AssetId"]
-                filter = {'_id': doc['_id']}
-                update = {'$set': doc}
-                collection.update_one(filter, update, upsert=True)
-            except pymongo.errors as e:
-                print(f"Encountered an error during update_one() operation: {e}")
-            except KeyError as ke:
-                raise ke
+        upserter.upsert(processedFindings)
+        client.close()
+
+        print(f"Completed upserting CAM entries to MongoDB: {upserter.summary()}.")
+
+        return upserter.failed == 0
 
-        return True
-    
     def get_credential_from_aws_ssm(self, value, configurationName):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
@@ -221,81 +255,6 @@ class CamMongodbProvider(object):
         
         return credential
 
-    def process_findings(self, findings):
-        """
-        This function uses the list comprehension to base64 decode all `AssetDetails` and then takes a selective
-        cross-section of unique per-asset details to be written to file within the main function
-        """
-        # This list contains the CAM output
-        cloudAssetManagementFindings = []
-        # Create a new list from raw findings that base64 decodes `AssetDetails` where it is not None, if it is, just
-        # use None and bring forward `ProductFields` where it is missing `AssetDetails`...which shouldn't happen
-        print(f"Base64 decoding AssetDetails for {len(findings)} ElectricEye findings.")
-
-        data = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        print(f"Completed base64 decoding for {len(data)} ElectricEye findings.")
-
-        # This list will contain unique identifiers from `Resources.[*].Id`
-        uniqueIds = set(item["Resources"][0]["Id"] for item in data)
-
-        print(f"Processing Asset and Finding Summary data for {len(uniqueIds)} unique Assets.")
-
-        for uid in uniqueIds:
-            subData = [item for item in data if item["Resources"][0]["Id"] == uid]
-            productFields = subData[0]["ProductFields"]
-            infoSevFindings = lowSevFindings = medSevFindings = highSevFindings = critSevFindings = 0
-            
-            for item in subData:
-                firstObserved = str(item["FirstObservedAt"])
-                sevLabel = item["Severity"]["Label"]
-                if sevLabel == "INFORMATIONAL":
-                    infoSevFindings += 1
-                elif sevLabel == "LOW":
-                    lowSevFindings += 1
-                elif sevLabel == "MEDIUM":
-                    medSevFindings += 1
-                elif sevLabel == "HIGH":
-                    highSevFindings += 1
-                elif sevLabel == "CRITICAL":
-                    critSevFindings += 1
-                
-            
-            cloudAssetManagementFindings.append(
-                {
-                    "AssetId": uid,
-                    "FirstObservedAt": firstObserved,
-                    "Provider": productFields.get("Provider", ""),
-                    "ProviderType": productFields.get("ProviderType", ""),
-                    "ProviderAccountId": productFields.get("ProviderAccountId", ""),
-                    "AssetRegion": productFields.get("AssetRegion", ""),
-                    "AssetDetails": productFields.get("AssetDetails", ""),
-                    "AssetClass": productFields.get("AssetClass", ""),
-                    "AssetService": productFields.get("AssetService", ""),
-                    "AssetComponent": productFields.get("AssetComponent", ""),
-                    "InformationalSeverityFindings": infoSevFindings,
-                    "LowSeverityFindings": lowSevFindings,
-                    "MediumSeverityFindings": medSevFindings,
-                    "HighSeverityFindings": highSevFindings,
-                    "CriticalSeverityFindings": critSevFindings
-                }
-            )
-
-        del findings
-        del data
-        del uniqueIds
-        del subData
-
-        return cloudAssetManagementFindings
-
 # EOF
 
 """
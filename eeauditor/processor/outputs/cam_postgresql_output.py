@@ -23,10 +23,11 @@ import boto3
 import sys
 import os
 import json
-import base64
 import psycopg2 as psql
 from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.cam_aggregator import CamAccumulator
+from processor.postgresql_upsert import DEFAULT_POSTGRESQL_BATCH_SIZE, PostgresqlBulkUpserter
 
 # Boto3 Clients
 ssm = boto3.client("ssm")
@@ -35,6 +36,13 @@ asm = boto3.client("secretsmanager")
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 
+# Columns of the CAM Table, in the order rows are upserted
+CAM_POSTGRESQL_COLUMNS = [
+    "asset_id", "first_observed_at", "provider", "provider_type", "provider_account_id", "asset_region", "asset_details",
+    "asset_class", "asset_service", "asset_component", "informational_severity_findings", "low_severity_findings",
+    "medium_severity_findings", "high_severity_findings", "critical_severity_findings"
+]
+
 @ElectricEyeOutput
 class CamPostgresProvider(object):
     __provider__ = "cam_postgresql"
@@ -70,6 +78,8 @@ class CamPostgresProvider(object):
         databaseName = postgresqlDetails["postgresql_database_name"]
         endpoint = postgresqlDetails["postgresql_endpoint"]
         port = postgresqlDetails["postgresql_port"]
+        # Optional, older TOML files will not have this value
+        batchSize = postgresqlDetails.get("postgresql_batch_size", DEFAULT_POSTGRESQL_BATCH_SIZE)
 
         # Parse Password
         if self.credentials_location == "CONFIG_FILE":
@@ -98,11 +108,39 @@ class CamPostgresProvider(object):
         self.port = port
         self.password = password
 
+        if not isinstance(batchSize, int) or batchSize < 1:
+            print("The value for '[outputs.postgresql.postgresql_batch_size]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+        self.batchSize = batchSize
+        # Findings are grouped by Asset as they stream in, only one CAM entry per Asset is held
+        self.accumulator = CamAccumulator()
+
     def write_findings(self, findings: list, **kwargs):
-        processedFindings = self.create_cam_format(findings)
+        if len(findings) == 0:
+            print("There are not any findings to write!")
+            exit(0)
 
+        self.write_batch(findings)
         del findings
 
+        return self.close()
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Groups the findings into the per-Asset CAM entries, nothing is written until close()
+        """
+        self.accumulator.add_findings(findings)
+
+        return True
+
+    def close(self, **kwargs):
+        if self.accumulator.findingsProcessed == 0:
+            print("There are not any findings to write!")
+            return True
+
+        processedFindings = self.accumulator.get_cam_entries()
+        print(f"Processed Asset and Finding Summary data for {len(processedFindings)} unique Assets from {self.accumulator.findingsProcessed} ElectricEye findings.")
+
         try:
             engine = psql.connect(
                 user=self.userName,
@@ -136,33 +174,22 @@ class CamPostgresProvider(object):
                     critical_severity_findings INTEGER
                 )
             """)
+            engine.commit()
 
             print(f"Attempting to write {len(processedFindings)} CAM entries to PostgreSQL.")
-            for f in processedFindings:
-                # The Finding ID is our primary key, on conflicts we will overwrite every single value for the specific ID except
-                # for ASFF FirstObservedAt (first_observed_at) and ASFF CreatedAt (created_at) every other value will be preserved
-                cursor.execute(f"""
-                    INSERT INTO {self.tableName}_cam (asset_id, first_observed_at, provider, provider_type, provider_account_id, asset_region, asset_details, asset_class, asset_service, asset_component, informational_severity_findings, low_severity_findings, medium_severity_findings, high_severity_findings, critical_severity_findings)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (asset_id) DO UPDATE
-                        SET provider = excluded.provider,
-                            provider_type = excluded.provider_type,
-                            provider_account_id = excluded.provider_account_id,
-                            asset_region = excluded.asset_region,
-                            asset_details = excluded.asset_details,
-                            asset_class = excluded.asset_class,
-                            asset_service = excluded.asset_service,
-                            asset_component = excluded.asset_component,
-                            informational_severity_findings = excluded.informational_severity_findings,
-                            low_severity_findings = excluded.low_severity_findings,
-                            medium_severity_findings = excluded.medium_severity_findings,
-                            high_severity_findings = excluded.high_severity_findings,
-                            critical_severity_findings = excluded.critical_severity_findings,
-                            first_observed_at = CASE
-                                                    WHEN {self.tableName}_cam.first_observed_at < excluded.first_observed_at THEN {self.tableName}_cam.first_observed_at
-                                                    ELSE excluded.first_observed_at
-                                                END;
-                    """,
+            # The Asset ID is our primary key, on conflicts we will overwrite every single value for the specific ID except
+            # for ASFF FirstObservedAt (first_observed_at) which keeps the earliest value
+            upserter = PostgresqlBulkUpserter(
+                engine,
+                cursor,
+                f"{self.tableName}_cam",
+                CAM_POSTGRESQL_COLUMNS,
+                conflictColumn="asset_id",
+                earliestColumns=["first_observed_at"],
+                batchSize=self.batchSize
+            )
+            upserter.upsert(
+                [
                     (
                         f["AssetId"],
                         f["FirstObservedAt"],
@@ -179,11 +206,10 @@ class CamPostgresProvider(object):
                         f["MediumSeverityFindings"],
                         f["HighSeverityFindings"],
                         f["CriticalSeverityFindings"]
-                    )
-                )
+                    ) for f in processedFindings
+                ]
+            )
 
-            # commit the changes
-            engine.commit()
             # close communication with the postgres server (rds)
             cursor.close()
             
@@ -194,7 +220,7 @@ class CamPostgresProvider(object):
             raise oe
         except Exception as e:
             raise e
-        
+
         return True
 
     def get_credential_from_aws_ssm(self, value, configurationName):
@@ -237,89 +263,6 @@ class CamPostgresProvider(object):
             raise e
         
         return credential
-    
-    def create_cam_format(self, findings):
-        """
-        This function uses the list comprehension to base64 decode all `AssetDetails` and then takes a selective
-        cross-section of unique per-asset details to be written to PostgreSQL
-        """
-
-        if len(findings) == 0:
-            print("There are not any findings to write!")
-            exit(0)
-
-        # This list contains the CAM output
-        cloudAssetManagementFindings = []
-        # Create a new list from raw findings that base64 decodes `AssetDetails` where it is not None, if it is, just
-        # use None and bring forward `ProductFields` where it is missing `AssetDetails`...which shouldn't happen
-        print(f"Base64 decoding AssetDetails for {len(findings)} ElectricEye findings.")
-
-        data = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        print(f"Completed base64 decoding for {len(data)} ElectricEye findings.")
-
-        # This list will contain unique identifiers from `Resources.[*].Id`
-        uniqueIds = set(item["Resources"][0]["Id"] for item in data)
-
-        print(f"Processing Asset and Finding Summary data for {len(uniqueIds)} unique Assets.")
-
-        for uid in uniqueIds:
-            subData = [item for item in data if item["Resources"][0]["Id"] == uid]
-            productFields = subData[0]["ProductFields"]
-            infoSevFindings = lowSevFindings = medSevFindings = highSevFindings = critSevFindings = 0
-            
-            for item in subData:
-                firstObserved = item["FirstObservedAt"]
-                sevLabel = item["Severity"]["Label"]
-                if sevLabel == "INFORMATIONAL":
-                    infoSevFindings += 1
-                elif sevLabel == "LOW":
-                    lowSevFindings += 1
-                elif sevLabel == "MEDIUM":
-                    medSevFindings += 1
-                elif sevLabel == "HIGH":
-                    highSevFindings += 1
-                elif sevLabel == "CRITICAL":
-                    critSevFindings += 1
-                
-            
-            cloudAssetManagementFindings.append(
-                {
-                    "AssetId": uid,
-                    "FirstObservedAt": firstObserved,
-                    "AssetClass": productFields.get("AssetClass", ""),
-                    "AssetService": productFields.get("AssetService", ""),
-                    "AssetComponent": productFields.get("AssetComponent", ""),
-                    "Provider": productFields.get("Provider", ""),
-                    "ProviderType": productFields.get("ProviderType", ""),
-                    "ProviderAccountId": productFields.get("ProviderAccountId", ""),
-                    "AssetRegion": productFields.get("AssetRegion", ""),
-                    "AssetDetails": productFields.get("AssetDetails", ""),
-                    "AssetClass": productFields.get("AssetClass", ""),
-                    "AssetService": productFields.get("AssetService", ""),
-                    "AssetComponent": productFields.get("AssetComponent", ""),
-                    "InformationalSeverityFindings": infoSevFindings,
-                    "LowSeverityFindings": lowSevFindings,
-                    "MediumSeverityFindings": medSevFindings,
-                    "HighSeverityFindings": highSevFindings,
-                    "CriticalSeverityFindings": critSevFindings
-                }
-            )
-
-        del findings
-        del data
-        del uniqueIds
-        del subData
-
-        return cloudAssetManagementFindings
 
 ## EOF
 
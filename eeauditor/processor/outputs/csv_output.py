@@ -25,43 +25,65 @@ from os import path
 
 here = path.abspath(path.dirname(__file__))
 
+CSV_COLUMNS = [
+    {"name": "Id", "path": "Id"},
+    {"name": "Title", "path": "Title"},
+    {"name": "ProductArn", "path": "ProductArn"},
+    {"name": "AwsAccountId", "path": "AwsAccountId"},
+    {"name": "Severity", "path": "Severity.Label"},
+    {"name": "Confidence", "path": "Confidence"},
+    {"name": "Description", "path": "Description"},
+    {"name": "RecordState", "path": "RecordState"},
+    {"name": "Compliance Status", "path": "Compliance.Status"},
+    {"name": "Remediation Recommendation", "path": "Remediation.Recommendation.Text",},
+    {"name": "Remediation Recommendation Link", "path": "Remediation.Recommendation.Url",},
+]
+
 @ElectricEyeOutput
 class CsvProvider(object):
     __provider__ = "csv"
 
+    def __init__(self):
+        self.csvfile = None
+        self.writer = None
+        self.findingsWritten = 0
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
-        csv_columns = [
-            {"name": "Id", "path": "Id"},
-            {"name": "Title", "path": "Title"},
-            {"name": "ProductArn", "path": "ProductArn"},
-            {"name": "AwsAccountId", "path": "AwsAccountId"},
-            {"name": "Severity", "path": "Severity.Label"},
-            {"name": "Confidence", "path": "Confidence"},
-            {"name": "Description", "path": "Description"},
-            {"name": "RecordState", "path": "RecordState"},
-            {"name": "Compliance Status", "path": "Compliance.Status"},
-            {"name": "Remediation Recommendation", "path": "Remediation.Recommendation.Text",},
-            {"name": "Remediation Recommendation Link", "path": "Remediation.Recommendation.Url",},
-        ]
+        if not self.write_batch(findings, output_file, **kwargs):
+            return False
+        return self.close(output_file, **kwargs)
 
+    def write_batch(self, findings: list, output_file: str, **kwargs):
+        """
+        Appends a batch of findings to the CSV file, the file and header row are written with the first batch
+        """
         csvOutputName = f"{here}/{output_file}.csv"
 
         try:
-            with open(csvOutputName, "w") as csvfile:
-                print(f"Writing {len(findings)} findings to {csvOutputName}")
-                writer = csv.writer(csvfile, dialect="excel")
-                writer.writerow(item["name"] for item in csv_columns)
-                for finding in findings:
-                    row_data = []
-                    for column_dict in csv_columns:
-                        row_data.append(self.deep_get(finding, column_dict["path"]))
-                    writer.writerow(row_data)
-            csvfile.close()
+            if self.writer is None:
+                print(f"Writing findings to {csvOutputName}")
+                self.csvfile = open(csvOutputName, "w")
+                self.writer = csv.writer(self.csvfile, dialect="excel")
+                self.writer.writerow(item["name"] for item in CSV_COLUMNS)
+            for finding in findings:
+                row_data = []
+                for column_dict in CSV_COLUMNS:
+                    row_data.append(self.deep_get(finding, column_dict["path"]))
+                self.writer.writerow(row_data)
+            self.findingsWritten += len(findings)
         except IOError as e:
             print(f"Error writing to file {output_file} with exception {e}")
             return False
         return True
 
+    def close(self, output_file: str, **kwargs):
+        # write the header row even if there were not any findings
+        if self.writer is None and not self.write_batch([], output_file, **kwargs):
+            return False
+        self.csvfile.close()
+        print(f"Wrote {self.findingsWritten} findings to {here}/{output_file}.csv")
+        return True
+
     # Return nested dictionary values by passing in dictionary and keys separated by "."
     def deep_get(self, dictionary, keys):
         return reduce(
@@ -19,9 +19,12 @@
 #under the License.
 
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.compliance_crosswalk import complianceCrosswalk
 import json
-import pandas as pd
+import os
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from os import path
 from datetime import datetime
 
@@ -59,8 +62,75 @@ SUPPORTED_FRAMEWORKS = [
     "CIS Microsoft Azure Foundations Benchmark V2.0.0"
 ]
 
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+CONTROL_OBJECTIVES_FILE = f"{here}/control_objectives.json"
+
+# Charts are rendered in separate processes as matplotlib holds the GIL, one per CPU
+HTML_COMPLIANCE_MAX_WORKERS = os.cpu_count() or 1
+
+@lru_cache(maxsize=None)
+def get_control_objectives() -> dict:
+    """
+    Loads `control_objectives.json` once and returns the control objectives keyed by framework and then by control title,
+    in the order of the file. Each control title has a list of objectives as a few (e.g., MITRE ATT&CK techniques and their
+    mitigations) are listed more than once
+    """
+    with open(CONTROL_OBJECTIVES_FILE) as jsonfile:
+        data = json.load(jsonfile)
+
+    controlObjectives = {framework: {} for framework in SUPPORTED_FRAMEWORKS}
+    for controlInfo in data:
+        controlTitle = controlInfo["ControlTitle"]
+        for framework in SUPPORTED_FRAMEWORKS:
+            if controlTitle.startswith(framework):
+                controlObjectives[framework].setdefault(controlTitle, []).append(controlInfo["ControlDescription"])
+
+    return controlObjectives
+
+def render_framework_chart(frameworkSavefile: str, controlsData: dict) -> str:
+    """
+    Renders the horizontal bar chart of passed and failed checks per control and the overall pass/fail donut chart of a
+    framework, saves them as a SVG and returns the SVG contents. This runs in a worker process so it only takes plain data
+    """
+    # Set the facecolor of the figure and the plots to a very light gray
+    plt.rcParams["savefig.facecolor"]="f9f9f9"
+    plt.rcParams["axes.facecolor"]="f9f9f9"
+
+    # create a figure with two subplots: one for the bar chart and one for the donut chart
+    fig, axs = plt.subplots(nrows=2, figsize=(38, 22), tight_layout=True)
+
+    controls = list(controlsData)
+    passed = [value["Passed"] for value in controlsData.values()]
+    failed = [value["Failed"] for value in controlsData.values()]
+
+    # Create the stacked horizontal bar chart with one call per series, add a label to the X-Axis, and finally add values for the bars
+    axs[0].barh(controls, passed, color="#6aaf35")
+    axs[0].barh(controls, failed, left=passed, color="#fe6e73")
+    axs[0].set_xlabel("Total Checks In Scope", fontsize=16)
+    for i, (passedCount, failedCount) in enumerate(zip(passed, failed)):
+        axs[0].text(passedCount, i, str(passedCount), color="black", va="center")  # label for "Passed"
+        axs[0].text(passedCount + failedCount, i, str(failedCount), color="red", va="center")  # label for "Failed"
+
+    # create a legend for the bar chart
+    passed_patch = plt.Rectangle((0,0),1,1,fc="#6aaf35", edgecolor = "none")
+    failed_patch = plt.Rectangle((0,0),1,1,fc="#fe6e73",  edgecolor = "none")
+    axs[0].legend([passed_patch, failed_patch], ["Passed", "Failed"], loc="upper right")
+
+    # create a donut chart with the overall passing and failing percentages
+    sizes = [sum(passed), sum(failed)]
+    colors = ["#6aaf35", "#fe6e73"]
+
+    axs[1].pie(sizes, labels=["Passed", "Failed"], colors=colors, autopct="%1.1f%%", startangle=90)
+    # this creates the hole in the middle, effectively making the pie chart a donut chart
+    axs[1].add_artist(plt.Circle((0,0),0.70,fc="white"))
+
+    # Save the charts as a SVG and then read out the contents to pass to HTML
+    fig.savefig(f"{here}/{frameworkSavefile}.svg", format="svg")
+    plt.close(fig)
+    with open(f"{here}/{frameworkSavefile}.svg", "r") as f:
+        svgImageContents = f.read()
+
+    return svgImageContents
+
 
 @ElectricEyeOutput
 class JsonProvider(object):
@@ -77,28 +147,20 @@ class JsonProvider(object):
         del findings
 
         uniqueControls = self.get_unique_controls(processedFindings)
-        # Gather and sort the control data enriched with aggregated asset information
-        assetInfoAggregation = self.get_asset_information_per_control(processedFindings)
-        assetDataPerControl = []
-        for control, details in assetInfoAggregation.items():
-            controlAssetPayload = {"ControlId": control}
-            controlAssetPayload.update(details)
-            assetDataPerControl.append(controlAssetPayload)
+        # Gather the control data enriched with aggregated asset information, keyed by control
+        assetDataPerControl = self.get_asset_information_per_control(processedFindings)
 
         # Do one more pass on the aggregated information and add a passing % per control
-        assetDataPerControlWithPercentage = []
-        for controlData in assetDataPerControl:
+        for controlData in assetDataPerControl.values():
             passingPercentage = (controlData["PassingControls"] / controlData["ResourcesImpacted"]) * 100
             roundedPercentage = f"{round(passingPercentage, 2)}%"
             controlData["RawPassingScore"] = passingPercentage
             controlData["PassingPercentage"] = roundedPercentage
-            assetDataPerControlWithPercentage.append(controlData)
 
-        del assetDataPerControl
         # Get the aggregated pass/fail info per control
         controlsAggregation = self.generate_controls_aggregation(uniqueControls, processedFindings)
 
-        self.html_creation(processedFindings, controlsAggregation, assetDataPerControlWithPercentage, output_file)
+        self.html_creation(processedFindings, controlsAggregation, assetDataPerControl, output_file)
 
         print("Created HTML Compliance report!")
 
@@ -110,20 +172,7 @@ class JsonProvider(object):
         processedFindings = []
 
         for finding in findings:
-            complianceRelatedRequirements = finding["Compliance"]["RelatedRequirements"]
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
+            complianceRelatedRequirements = complianceCrosswalk.expand_requirements(finding["Compliance"]["RelatedRequirements"])
             
             processedFindings.append(
                 {
@@ -142,33 +191,19 @@ class JsonProvider(object):
         print(f"Processed {len(processedFindings)} findings")
 
         return processedFindings
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
-
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
 
     def get_unique_controls(self, processedFindings):
         """
         This function returns a list of unique controls across all processed findings
         """
 
-        uniqueControls = []
+        # dict keys keep the order controls are first seen in, with constant time membership checks
+        uniqueControls = {}
 
         for findings in processedFindings:
-            for controls in findings["ComplianceRelatedRequirements"]:
+            uniqueControls.update(dict.fromkeys(findings["ComplianceRelatedRequirements"]))
 
-                if controls not in uniqueControls:
-                    uniqueControls.append(controls)
-                else:
-                    continue
+        uniqueControls = list(uniqueControls)
 
         print(f"{len(uniqueControls)} unique controls processed")
 
@@ -176,7 +211,7 @@ class JsonProvider(object):
 
     def get_asset_information_per_control(self, processedFindings):
         """
-        This function returns a DataFrame of controls with the sum of each Account, Asset, and Region in scope for a control
+        This function returns a dict of controls with the sum of each Account, Asset, and Region in scope for a control
         """
 
         controlDict = {}
@@ -222,8 +257,8 @@ class JsonProvider(object):
         controlsStatusAggregation = {framework: {} for framework in SUPPORTED_FRAMEWORKS}
         # Populate the data structure of pass/fail by individual controls
         for controlTitle in uniqueControls:
-            for framework in SUPPORTED_FRAMEWORKS:
-                if controlTitle.startswith(framework):
+            for framework in complianceCrosswalk.get_control_frameworks(controlTitle):
+                if framework in controlsStatusAggregation:
                     controlsStatusAggregation[framework][controlTitle] = {"Passed": 0, "Failed": 0}
 
         del uniqueControls
@@ -232,8 +267,8 @@ class JsonProvider(object):
         for finding in processedFindings:
             status = finding["ComplianceStatus"]
             for controls in finding["ComplianceRelatedRequirements"]:
-                for framework in SUPPORTED_FRAMEWORKS:
-                    if controls.startswith(framework):
+                for framework in complianceCrosswalk.get_control_frameworks(controls):
+                    if framework in controlsStatusAggregation:
                         if status == "PASSED":
                             controlsStatusAggregation[framework][controls]["Passed"] += 1
                         else:
@@ -243,53 +278,35 @@ class JsonProvider(object):
 
         return controlsStatusAggregation
 
-    def generate_control_table(self, framework, controls, aggregatedAssetControlsData):
+    def generate_control_table(self, framework, controls, assetDataPerControl):
         """
-        This function returns a JSON object that contains the Control ID and information about the control from the framework/standard author
+        This function returns a list of rows that contain the Control ID and information about the control from the framework/standard author
         joined with the information from "get_asset_information_per_control" which is used for the HTML table in the report
         """
 
         tableContent = []
 
         print(f"Generating a table of controls objectives and aggregated asset information for {len(controls)} controls in {framework}")
-        
-        with open(f"{here}/control_objectives.json") as jsonfile:
-            data = json.load(jsonfile)
 
-        for controlInfo in data:
-            controlTitle = controlInfo["ControlTitle"]
-            # Only grab controls that match the framework that are in the covered controls
-            if controlTitle.startswith(framework) and controlTitle in controls:
+        # Only grab controls that match the framework that are in the covered controls, in the order of the control objectives
+        for controlTitle, controlDescriptions in get_control_objectives().get(framework, {}).items():
+            if controlTitle not in controls:
+                continue
+            assetData = assetDataPerControl.get(controlTitle)
+            if assetData is None:
+                continue
+            for controlDescription in controlDescriptions:
                 contentRow = {
                     "ControlTitle": controlTitle,
-                    "ControlDescription": controlInfo["ControlDescription"]
+                    "ControlDescription": controlDescription
                 }
+                contentRow.update(assetData)
                 tableContent.append(contentRow)
-            else:
-                continue
 
         if tableContent:
-            tableDf = pd.DataFrame(tableContent)
-            aggAssetControlsDf = pd.DataFrame(aggregatedAssetControlsData)
-
-            tableContentDf = tableDf.merge(
-                aggAssetControlsDf,
-                how="left",
-                left_on="ControlTitle",
-                right_on="ControlId"
-            )
-
-            del tableContentDf["ControlId"]
-
-            tableContent = json.loads(tableContentDf.to_json(index=False,orient="table"))
-
-            del tableContentDf
-
             print(f"Finished generating the table for {framework}")
 
-            return tableContent["data"]
-        else:
-            return []
+        return tableContent
 
     def generate_executive_summary(self, processedFindings):
         """
@@ -307,32 +324,21 @@ class JsonProvider(object):
         passingPercentage = (len(totalPassed) / countFindings) * 100
         roundedPercentage = f"{round(passingPercentage, 2)}%"
 
-        regionsAssessed = []
-        accountsAssessed = []
-        assetClassesAssesed = []
-        assetServicesAssessed = []
-        assetComponentsAssessed = []
-        uniqueResourcesIds = []
+        # Uniques in the order they are first seen, dict keys are used instead of lists for constant time membership checks
+        regionsAssessed = {}
+        accountsAssessed = {}
+        assetClassesAssesed = {}
+        assetServicesAssessed = {}
+        assetComponentsAssessed = {}
+        uniqueResourcesIds = {}
 
-        # Append uniques into lists
         for finding in processedFindings:
-            if finding["AssetRegion"] not in regionsAssessed:
-                regionsAssessed.append(finding["AssetRegion"])
-
-            if finding["ProviderAccountId"] not in accountsAssessed:
-                accountsAssessed.append(finding["ProviderAccountId"])
-
-            if finding["AssetClass"] not in assetClassesAssesed:
-                assetClassesAssesed.append(finding["AssetClass"])
-
-            if finding["AssetService"] not in assetServicesAssessed:
-                assetServicesAssessed.append(finding["AssetService"])
-
-            if finding["AssetComponent"] not in assetComponentsAssessed:
-                assetComponentsAssessed.append(finding["AssetComponent"])
-
-            if finding["AssetId"] not in uniqueResourcesIds:
-                uniqueResourcesIds.append(finding["AssetId"])
+            regionsAssessed[finding["AssetRegion"]] = None
+            accountsAssessed[finding["ProviderAccountId"]] = None
+            assetClassesAssesed[finding["AssetClass"]] = None
+            assetServicesAssessed[finding["AssetService"]] = None
+            assetComponentsAssessed[finding["AssetComponent"]] = None
+            uniqueResourcesIds[finding["AssetId"]] = None
 
         # Use len to get counts
         countRegionsAssessed = len(regionsAssessed)
@@ -375,84 +381,55 @@ class JsonProvider(object):
         return summary
 
     def create_visuals(self, controlsAggregation, assetDataPerControl):
+        """
+        Yields the table contents, the SVG of the charts, and the name of every framework with results. The charts of every
+        framework are submitted to a process pool up front and collected in framework order
+        """
+        frameworkCharts = []
         # Loop through every high level framework aggregation to generate findings
-        for framework, controls in controlsAggregation.items():
-            if not controls:  # this checks if `controls` is not empty
+        for framework, controlsData in controlsAggregation.items():
+            if not controlsData:  # this checks if `controls` is not empty
                 print(f"There are not any results for {framework}, skipping it!")
                 continue
             # Continue with populated Frameworks, this is more or less to be "fuck up proof" in case I forgot to add a Framework to SUPPORTED_FRAMEWORKS
             print(f"Creating a visualization for the {framework} framework!")
             # remove shit we don't need so the filename doesn't get dicked up
             frameworkSavefile = str(framework).replace(".","").replace(" ", "").replace(":","").lower()
-            # access the dict with the specific aggregations
-            controlsData = controlsAggregation[framework]
-
-            # Loop the newly assembled list, only taking the controls for a specific framework that comes from the CONSTANT of all available frameworks 
-            # at a time and use the info to assemble into a dataframe to combine with another dataframe based on controls information
-            if framework in SUPPORTED_FRAMEWORKS:
-                aggregatedAssetControlsData = [info for info in assetDataPerControl if info["ControlId"].startswith(framework)]
-            else:
-                aggregatedAssetControlsData = []
-
-            # Parse out the specific unique controls (again) to get the right information on the controls for the HTML table
-            controls = [control for control in controlsData]
-            tableContent = self.generate_control_table(framework, controls, aggregatedAssetControlsData)
-            # Sort the table to match the descending values of the matplot lib charts
-            tableContent = sorted(tableContent, key=lambda x: x["ResourcesImpacted"], reverse=False)
-
             # Reverse order sorting of the controls, that will put the controls with the most failures closer to the X-Axis
             controlsData = dict(sorted(controlsData.items(), key=lambda item: item[1]["Passed"] + item[1]["Failed"], reverse=True))
+            frameworkCharts.append((framework, frameworkSavefile, controlsData))
 
-            # create a figure with two subplots: one for the bar chart and one for the donut chart
-            fig, axs = plt.subplots(nrows=2, figsize=(38, 22), tight_layout=True)
-            """# Set the text size within the elements
-            plt.rcParams['font.size'] = 16  # Change the default font size
-            plt.rcParams['axes.labelsize'] = 14  # Increase the size of axis labels
-            plt.rcParams['axes.titlesize'] = 16  # Increase the size of the figure title
-            plt.rcParams['xtick.labelsize'] = 16  # Increase the size of x-tick labels
-            plt.rcParams['ytick.labelsize'] = 16  # Increase the size of y-tick labels"""
-
-            # sum of all passed and failed to calculate percentages later
-            controlsPassedSum = controlsFailedSum = 0
-
-            # iterate over the dictionary to plot each bar chart
-            for i, (key, value) in enumerate(controlsData.items()):
-                passed = value["Passed"]
-                failed = value["Failed"]
-
-                controlsPassedSum += passed
-                controlsFailedSum += failed
-                # Create horizontal bar chart, add a label to the X-Axis, and finally add values for the bars
-                #Set a title, axs[0].set_title(f"ElectricEye {frameworkTitle} Audit Readiness Report - {timeNow}", fontsize=14, fontweight="bold")
-                axs[0].barh(key, passed, color="#6aaf35")
-                axs[0].barh(key, failed, left=passed, color="#fe6e73")
-                axs[0].set_xlabel("Total Checks In Scope", fontsize=16)
-                axs[0].text(passed, i, str(passed), color="black", va="center")  # label for "Passed"
-                axs[0].text(passed + failed, i, str(failed), color="red", va="center")  # label for "Failed"
-
-            # create a legend for the bar chart
-            passed_patch = plt.Rectangle((0,0),1,1,fc="#6aaf35", edgecolor = "none")
-            failed_patch = plt.Rectangle((0,0),1,1,fc="#fe6e73",  edgecolor = "none")
-            axs[0].legend([passed_patch, failed_patch], ["Passed", "Failed"], loc="upper right")
-
-            # create a donut chart with the overall passing and failing percentages
-            sizes = [controlsPassedSum, controlsFailedSum]
-            colors = ["#6aaf35", "#fe6e73"]
-
-            axs[1].pie(sizes, labels=["Passed", "Failed"], colors=colors, autopct="%1.1f%%", startangle=90)
-            # this creates the hole in the middle, effectively making the pie chart a donut chart
-            axs[1].add_artist(plt.Circle((0,0),0.70,fc="white"))  
-
-            # Set the facecolor of the figure and the plots to a very light gray
-            plt.rcParams["savefig.facecolor"]="f9f9f9"
-            plt.rcParams["axes.facecolor"]="f9f9f9"
-
-            # Save the charts as a SVG and then read out the contents to pass to HTML
-            fig.savefig(f"{here}/{frameworkSavefile}.svg", format="svg")
-            with open(f"{here}/{frameworkSavefile}.svg", "r") as f:
-                svgImageContents = f.read()
-
-            yield tableContent, svgImageContents, framework
+        if not frameworkCharts:
+            return
+
+        try:
+            executor = ProcessPoolExecutor(max_workers=min(HTML_COMPLIANCE_MAX_WORKERS, len(frameworkCharts)))
+        except (OSError, NotImplementedError):
+            # Some sandboxes (e.g., AWS Lambda) lack the shared memory process pools need, render the charts in this process instead
+            executor = None
+
+        try:
+            if executor is not None:
+                svgFutures = [
+                    executor.submit(render_framework_chart, frameworkSavefile, controlsData)
+                    for _, frameworkSavefile, controlsData in frameworkCharts
+                ]
+
+            for index, (framework, frameworkSavefile, controlsData) in enumerate(frameworkCharts):
+                # Build the table while the charts render, with the controls (again) to get the right information on the controls for the HTML table
+                tableContent = self.generate_control_table(framework, set(controlsData), assetDataPerControl)
+                # Sort the table to match the descending values of the matplot lib charts
+                tableContent = sorted(tableContent, key=lambda x: x["ResourcesImpacted"], reverse=False)
+
+                if executor is not None:
+                    svgImageContents = svgFutures[index].result()
+                else:
+                    svgImageContents = render_framework_chart(frameworkSavefile, controlsData)
+
+                yield tableContent, svgImageContents, framework
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
 
     def generate_stylesheet(self):
         """
@@ -936,7 +913,7 @@ class JsonProvider(object):
         dateNow = str(datetime.utcnow()).split(".")[0].split(" ")[0]
 
         # Beginning of the HTML doc with sytlesheet
-        htmlPrefix = f'''
+        htmlParts = [f'''
         <html>
         <head>
             <meta charset="UTF-8">
@@ -955,7 +932,7 @@ class JsonProvider(object):
             </figure>
             <h4>{self.generate_executive_summary(processedFindings)}</h4>
         </section>
-        '''
+        ''']
         # Retrieve the info table contents and the SVG from matplotlib of the bar chart/pie chart for the compliance framework
         for visual in self.create_visuals(controlsAggregation, assetDataPerControl):
             tableContents = visual[0]
@@ -963,7 +940,7 @@ class JsonProvider(object):
             # Generate the section header for a specified framework
             frameworkHeader = self.framework_section_information_generator(visual[2])
 
-            html = f'''
+            htmlParts.append(f'''
             {frameworkHeader}
             <div class="chart__image">{svgImage}</div>
             <section class="table__body">
@@ -983,7 +960,7 @@ class JsonProvider(object):
                         </tr>
                     </thead>
                 <tbody>
-            '''
+            ''')
             # Loop the contents of the table to add the rows
             for content in tableContents:
                 # Create a <p> with label depending on the "raw score" - 100.0 is the best and 0.0 is the worst.
@@ -1000,7 +977,7 @@ class JsonProvider(object):
                 else:
                     passingPercentage = f'<td><p class="score reallybad">{percentage}</p></td>'
                 # Setup the table rows
-                newTd = f'''
+                htmlParts.append(f'''
                     <tr>
                         <td>{content["ControlTitle"]}</td>
                         <td>{content["ControlDescription"]}</td>
@@ -1012,26 +989,22 @@ class JsonProvider(object):
                         <td>{content["PassingControls"]}</td>
                         <td>{content["FailingControls"]}</td>
                     </tr>
-                '''
-                html += newTd
+                ''')
             # Close the Table & Section
-            html += """
+            htmlParts.append("""
                     </tbody>
                 </table> 
             </section>
-            """
-            htmlPrefix += html
+            """)
         # Close the Body and HTML tags
-        htmlEnd = '''
+        htmlParts.append('''
         <footer>Created by ElectricEye: https://github.com/jonrau1/ElectricEye</footer>
         </body>
         </html>
-        '''
-
-        htmlPrefix += htmlEnd
+        ''')
 
         with open(f"{here}/{outputFile}_audit_readiness_report.html", "w") as f:
-            f.write(htmlPrefix)
+            f.write("".join(htmlParts))
 
         print("Finished creating HTML report for audit readiness")
 
@@ -19,10 +19,12 @@
 #under the License.
 
 import os
+import gzip
+import json
+from base64 import b64encode
 from datetime import datetime
 import yaml
 from processor.outputs.output_base import ElectricEyeOutput
-import json
 from os import path
 
 here = path.abspath(path.dirname(__file__))
@@ -33,167 +35,183 @@ ICONOGRAPHY_FILE = f"{currentDir}/iconography.yaml"
 with open(ICONOGRAPHY_FILE) as f:
     ICONOGRAPHY = yaml.safe_load(f)
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+# AssetService -> <img> tag, the first record for a service wins and placeholders are skipped
+ICONOGRAPHY_TAGS = {}
+for asset in ICONOGRAPHY:
+    ICONOGRAPHY_TAGS.setdefault(asset["AssetService"], asset["ImageTag"])
+
+# Columns of the report rows and their headers, rows are lists in this order to keep the embedded JSON small
+HTML_REPORT_COLUMNS = [
+    ("Id", "Finding ID"),
+    ("CreatedAt", "Created At"),
+    ("Severity", "Severity"),
+    ("Title", "Title"),
+    ("Description", "Description"),
+    ("Provider", "Provider"),
+    ("ProviderAccountId", "Provider Account ID"),
+    ("AssetRegion", "Asset Region"),
+    ("AssetClass", "Asset Class"),
+    ("AssetService", "Asset Service"),
+    ("AssetComponent", "Asset Component"),
+    ("ResourceId", "Resource ID"),
+    ("RecordState", "Finding State"),
+    ("ComplianceStatus", "Compliance Status")
+]
+COLUMN_INDEX = {column: index for index, (column, _) in enumerate(HTML_REPORT_COLUMNS)}
+
+# 0 is highest, 4 lowest, anything else is sorted last
+SEVERITY_ORDER = {
+    "CRITICAL": 0,
+    "HIGH": 1,
+    "MEDIUM": 2,
+    "LOW": 3,
+    "INFORMATIONAL": 4
+}
+
+# Rows per gzip compressed JSON chunk embedded in the report, the browser inflates and renders the chunks one at a time
+HTML_REPORT_CHUNK_ROWS = 5000
 
 @ElectricEyeOutput
 class HtmlProvider(object):
     __provider__ = "html"
 
+    def __init__(self):
+        # Rows are bucketed by their Severity sort order as they stream in, so they never need to be sorted
+        self.rowsBySeverity = {order: [] for order in range(len(SEVERITY_ORDER) + 1)}
+        # "15 MARCH 2022" formatted dates, keyed by the date portion of CreatedAt
+        self.createdAtDates = {}
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write to file!")
             exit(0)
 
-        activeTable = self.process_data(findings)
-
-        tableStructures = self.generate_table_structure(activeTable)
-
-        mainTable = tableStructures[0]
-        for row in activeTable:
-            # Pull out row details
-            findingId = row["Id"]
-            createdAt = row["CreatedAt"]
-            # Assign dynamic Paragraph CSS class depending on finding sev
-            severity = row["Severity"]
-            if severity == "CRITICAL":
-                severity = f'<p class="severity critical">{severity}</p>'
-            elif severity == "HIGH":
-                severity = f'<p class="severity high">{severity}</p>'
-            elif severity == "MEDIUM":
-                severity = f'<p class="severity medium">{severity}</p>'
-            elif severity == "LOW":
-                severity = f'<p class="severity low">{severity}</p>'
-            elif severity == "INFORMATIONAL":
-                severity = f'<p class="severity informational">{severity}</p>'
-            title = row["Title"]
-            description = row["Description"]
-            provider = row["Provider"]
-            providerAcctId = row["ProviderAccountId"]
-            assetRegion = row["AssetRegion"]
-            assetClass = row["AssetClass"]
-            # Attempt to get the IMG tag of a service
-            assetService = row["AssetService"]
-            serviceImg = self.get_image_tag(assetService)
-            if serviceImg == None:
-                assetServiceTd = f"<td>{assetService}</td>"
-            else:
-                assetServiceTd = f'<td>{serviceImg} \n {assetService}</td>'
-            assetComponent = row["AssetComponent"]
-            resourceId = row["ResourceId"]
-            recordState = row["RecordState"]
-            complianceStatus = row["ComplianceStatus"]
-            if complianceStatus == "PASSED":
-                complianceStatus = f'<p class="compliance passed">{complianceStatus}</p>'
-            elif complianceStatus == "FAILED":
-                complianceStatus = f'<p class="compliance failed">{complianceStatus}</p>'
-
-            newTd = f'''
-                <tr>
-                    <td>{findingId}</td>
-                    <td>{createdAt}</td>
-                    <td>{severity}</td>
-                    <td>{title}</td>
-                    <td>{description}</td>
-                    <td>{provider}</td>
-                    <td>{providerAcctId}</td>
-                    <td>{assetRegion}</td>
-                    <td>{assetClass}</td>
-                    {assetServiceTd}
-                    <td>{assetComponent}</td>
-                    <td>{resourceId}</td>
-                    <td>{recordState}</td>
-                    <td>{complianceStatus}</td>
-                </tr>
-                '''
-            mainTable += newTd
-        
-        # Close out the table
-        mainTable += tableStructures[1]
-
-        html = f"""
-            <html lang="en" title="ElectricEye Executive Report">
-                <head>
-                    <meta charset="UTF-8">
-                    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                    <meta http-equiv="X-UA-Compatible" content="ie=edge">
-                    <title>ElectricEye Executive Report</title>
-                </head>
-                <style>{self.generate_stylesheet()}</style>
-                <body>
-                    <div>
-                        {mainTable}
-                        <footer>Created by ElectricEye: https://github.com/jonrau1/ElectricEye</footer>
-                    </div>
-                </body>
-            </html>
-            """
+        self.write_batch(findings, **kwargs)
+
+        return self.close(output_file, **kwargs)
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Normalizes a batch of findings into compact report rows
+        """
+        for row in self.process_data(findings):
+            self.rowsBySeverity[SEVERITY_ORDER.get(row[COLUMN_INDEX["Severity"]], len(SEVERITY_ORDER))].append(row)
+
+        return True
+
+    def close(self, output_file: str, **kwargs):
+        # Severity ordered rows, the buckets are emptied as they are chained so only the new list holds the rows
+        reportRows = []
+        for order in sorted(self.rowsBySeverity):
+            reportRows.extend(self.rowsBySeverity[order])
+            self.rowsBySeverity[order] = []
+
+        print(f"Processed {len(reportRows)} findings for executive report")
+
         with open(f"{here}/{output_file}_executive_report.html", "w") as f:
-            f.write(html)
+            self.write_report(f, reportRows)
 
         print("HTML executive report created!")
 
         return True
-    
+
     def process_data(self, findings):
         """
-        This function processes and normalizes all findings into 13 k:v pairs needed for the HTML executive report.
-        The function then sorts the new list into descending order by severity, and finally, returns the new
-        list of findings for use in the report.
+        This function processes and normalizes findings into lists of the 14 values needed for the HTML executive report,
+        in the order of `HTML_REPORT_COLUMNS`, findings missing any of them are skipped
         """
 
         executiveReportFindings = []
 
         for finding in findings:
             try:
-                dt = datetime.fromisoformat(finding["CreatedAt"])
+                createdAt = finding["CreatedAt"]
+                # Converts to "15 MARCH 2022" format, which only depends on the date portion of the timestamp
+                createdAtDate = self.createdAtDates.get(createdAt[:10])
+                if createdAtDate is None:
+                    createdAtDate = datetime.fromisoformat(createdAt).strftime("%d %B %Y")
+                    self.createdAtDates[createdAt[:10]] = createdAtDate
+                productFields = finding["ProductFields"]
                 executiveReportFindings.append(
-                    {
-                        "Id": finding["Id"],
-                        # Converts to "15 MARCH 2022" format
-                        "CreatedAt": dt.strftime("%d %B %Y"),
-                        "Severity": finding["Severity"]["Label"],
-                        "Title": finding["Title"],
-                        "Description": finding["Description"],
-                        "Provider": finding["ProductFields"]["Provider"],
-                        "ProviderAccountId": finding["ProductFields"]["ProviderAccountId"],
-                        "AssetRegion": finding["ProductFields"]["AssetRegion"],
-                        "AssetClass": finding["ProductFields"]["AssetClass"],
-                        "AssetService": finding["ProductFields"]["AssetService"],
-                        "AssetComponent": finding["ProductFields"]["AssetComponent"],
-                        "ResourceId": finding["Resources"][0]["Id"],
-                        "RecordState": finding["RecordState"],
-                        "ComplianceStatus": finding["Compliance"]["Status"]
-                    }
+                    [
+                        finding["Id"],
+                        createdAtDate,
+                        finding["Severity"]["Label"],
+                        finding["Title"],
+                        finding["Description"],
+                        productFields["Provider"],
+                        productFields["ProviderAccountId"],
+                        productFields["AssetRegion"],
+                        productFields["AssetClass"],
+                        productFields["AssetService"],
+                        productFields["AssetComponent"],
+                        finding["Resources"][0]["Id"],
+                        finding["RecordState"],
+                        finding["Compliance"]["Status"]
+                    ]
                 )
             except KeyError:
                 continue
 
-        print(f"Processed {len(executiveReportFindings)} findings for executive report")
-        # 0 is highest, 4 lowest
-        severityOrder = {
-            "CRITICAL": 0,
-            "HIGH": 1,
-            "MEDIUM": 2,
-            "LOW": 3,
-            "INFORMATIONAL": 4
-        }
-        # Apply the sort order based on Seveirty
-        def reorder(item):
-            return severityOrder.get(item["Severity"], 5)
-        
-        del findings
-
-        sortedList = sorted(
-            executiveReportFindings,
-            key=reorder
+        return executiveReportFindings
+
+    def write_report(self, f, reportRows: list):
+        """
+        Writes the report piece by piece: the page and executive summary, the rows as gzip compressed and base64 encoded
+        JSON chunks, and the script which inflates the chunks into a virtualized, searchable table. The report is one
+        self-contained file which also works when it is opened from disk
+        """
+        dateNow = str(datetime.utcnow()).split(".")[0]
+        execSummary = self.generate_stats(reportRows)
+
+        # Only the <img> src of each AssetService in the report is embedded, instead of the tag on every row
+        serviceIndex = COLUMN_INDEX["AssetService"]
+        icons = {}
+        for service in {row[serviceIndex] for row in reportRows}:
+            imageTag = self.get_image_tag(service)
+            if imageTag is not None and 'src="' in imageTag:
+                icons[service] = imageTag.split('src="', 1)[1].split('"', 1)[0]
+
+        f.write(
+            f"""
+            <html lang="en" title="ElectricEye Executive Report">
+                <head>
+                    <meta charset="UTF-8">
+                    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                    <meta http-equiv="X-UA-Compatible" content="ie=edge">
+                    <title>ElectricEye Executive Report</title>
+                </head>
+                <style>{self.generate_stylesheet()}</style>
+                <body>
+                    <div>
+                        {self.generate_table_structure(dateNow, execSummary)}
+                        <footer>Created by ElectricEye: https://github.com/jonrau1/ElectricEye</footer>
+                    </div>
+                    <script type="application/json" id="report-columns">{self.to_script_json(HTML_REPORT_COLUMNS)}</script>
+                    <script type="application/json" id="report-icons">{self.to_script_json(icons)}</script>
+            """
+        )
+
+        for start in range(0, len(reportRows), HTML_REPORT_CHUNK_ROWS):
+            chunk = json.dumps(reportRows[start:start + HTML_REPORT_CHUNK_ROWS], separators=(",", ":"), default=str)
+            f.write('<script type="application/octet-stream" class="report-chunk">')
+            f.write(b64encode(gzip.compress(chunk.encode("utf-8"), mtime=0)).decode("ascii"))
+            f.write("</script>\n")
+
+        f.write(
+            f"""
+                    <script>{self.generate_script()}</script>
+                </body>
+            </html>
+            """
         )
 
-        del executiveReportFindings
+    def to_script_json(self, value):
+        """
+        Serializes a value for a <script type="application/json"> block, escaping "</" so values cannot close the tag
+        """
+        return json.dumps(value).replace("</", "<\\/")
 
-        return sortedList
-    
     def generate_stylesheet(self):
         """
         This function creates an f-string Stylesheet and returns it to be added into a HTML Doc F-string
@@ -227,21 +245,67 @@ class HtmlProvider(object):
             box-shadow: 0 .4rem .8rem #0005;
             border-radius: .8rem;
             overflow: hidden;
+            display: flex;
+            flex-direction: column;
         }
 
         .table__header {
             width: 100%;
-            height: 20%;
             background-color: #d5d1defe;
             padding: .8rem 1rem;
             display: flex;
             justify-content: space-between;
             align-items: center;
+            gap: 1rem;
+        }
+
+        .table__controls {
+            width: 95%;
+            margin: .8rem auto 0;
+            display: flex;
+            flex-wrap: wrap;
+            align-items: center;
+            gap: .6rem;
+        }
+
+        .table__controls input, .table__controls select {
+            padding: .4rem .6rem;
+            border: none;
+            border-radius: .4rem;
+            background-color: #fffb;
+        }
+
+        .table__controls input {
+            flex: 1;
+            min-width: 16rem;
+        }
+
+        .table__controls span {
+            color: white;
+        }
+
+        .table__details {
+            width: 95%;
+            margin: .8rem auto 0;
+            padding: .8rem 1rem;
+            border-radius: .6rem;
+            background-color: #fffb;
+            max-height: 25%;
+            overflow: auto;
+        }
+
+        .table__details dt {
+            font-weight: bold;
+        }
+
+        .table__details dd {
+            margin-bottom: .4rem;
+            word-break: break-word;
         }
 
         .table__body {
             width: 95%;
-            max-height: calc(79% - 1.6rem);
+            flex: 1;
             background-color: #fffb;
 
             margin: .8rem auto;
@@ -262,50 +326,68 @@ class HtmlProvider(object):
             visibility: hidden;
         }
 
-        .table__body:hover::-webkit-scrollbar-thumb{ 
+        .table__body:hover::-webkit-scrollbar-thumb{
             visibility: visible;
         }
 
-        table {
-            width: 100%;
+        .report__head, .report__row {
+            display: grid;
+            grid-template-columns: 22rem 9rem 9rem 24rem 32rem 7rem 11rem 9rem 10rem 16rem 12rem 22rem 8rem 9rem;
+            width: max-content;
         }
 
-        td img {
-            width: 64px;
-            height: 64px;
-            margin-right: .5rem;
-            vertical-align: middle;
+        .report__head {
+            position: sticky;
+            top: 0;
+            z-index: 1;
+            font-weight: bold;
+            background-color: #009879;
+            border-bottom: 2px solid #dddddd;
         }
 
-        table, th, td {
-            border-collapse: collapse;
-            padding: 1rem;
-            text-align: left;
+        .report__rows {
+            position: relative;
         }
 
-        thead th {
-            position: sticky;
-            top: 0;
+        .report__row {
+            position: absolute;
             left: 0;
+            height: 48px;
             cursor: pointer;
-            text-transform: capitalize;
-            font-weight: bold;
-            text-align: left;
-            background-color: #009879;
         }
 
-        thead tr {
-            border-bottom: 2px solid #dddddd;
+        .report__row.striped {
+            background-color: #0000000b;
         }
 
-        tbody tr:nth-child(even) {
-            background-color: #0000000b;
+        .report__row:hover {
+            background-color: #0098791a;
+        }
+
+        .report__cell {
+            padding: 0 1rem;
+            display: flex;
+            align-items: center;
+            overflow: hidden;
+            white-space: nowrap;
+            text-overflow: ellipsis;
+        }
+
+        .report__head .report__cell {
+            padding: 1rem;
+        }
+
+        .report__cell img {
+            width: 32px;
+            height: 32px;
+            margin-right: .5rem;
         }
 
         .severity {
             padding: .4rem 0;
             border-radius: 2rem;
             text-align: center;
+            width: 100%;
         }
 
         .severity.critical {
@@ -334,6 +416,7 @@ class HtmlProvider(object):
             padding: .4rem 0;
             border-radius: 2rem;
             text-align: center;
+            width: 100%;
         }
 
         .compliance.passed {
@@ -355,13 +438,207 @@ class HtmlProvider(object):
 
         return stylesheet
 
-    def generate_table_structure(self, processedData):
+    def generate_script(self):
         """
-        This function generates the HTML structure required for the tables
+        This function returns the JavaScript of the report. It inflates the embedded chunks with the browser's native
+        DecompressionStream, fills the search filters, and only renders the rows within (or near) the visible part of
+        the table so the report stays responsive with hundreds of thousands of findings
         """
 
-        dateNow = str(datetime.utcnow()).split(".")[0]
-        execSummary = self.generate_stats(processedData)
+        script = '''
+        (function () {
+            const COLUMNS = JSON.parse(document.getElementById("report-columns").textContent);
+            const ICONS = JSON.parse(document.getElementById("report-icons").textContent);
+            const FILTERS = ["Severity", "ComplianceStatus", "Provider", "AssetClass", "AssetService"];
+            const ROW_HEIGHT = 48;
+            const OVERSCAN = 10;
+            const columnIndex = {};
+            COLUMNS.forEach(function (column, index) { columnIndex[column[0]] = index; });
+
+            const viewport = document.getElementById("report-viewport");
+            const canvas = document.getElementById("report-rows");
+            const searchBox = document.getElementById("report-search");
+            const counter = document.getElementById("report-count");
+            const details = document.getElementById("report-details");
+
+            const rows = [];
+            const searchText = [];
+            let visibleRows = [];
+            let filterTimer = null;
+            let renderPending = false;
+
+            function displayValue(value) {
+                return value === null || value === undefined ? "" : String(value);
+            }
+
+            function badge(className, value) {
+                const element = document.createElement("p");
+                element.className = className + " " + displayValue(value).toLowerCase();
+                element.textContent = displayValue(value);
+                return element;
+            }
+
+            function createRow(row, position) {
+                const element = document.createElement("div");
+                element.className = "report__row";
+                element.style.top = (position * ROW_HEIGHT) + "px";
+                // Stripes follow the position in the table rather than the DOM, which only holds the rendered rows
+                if (position % 2 === 1) {
+                    element.classList.add("striped");
+                }
+                COLUMNS.forEach(function (column, index) {
+                    const cell = document.createElement("div");
+                    const value = row[index];
+                    cell.className = "report__cell";
+                    if (column[0] === "Severity") {
+                        cell.appendChild(badge("severity", value));
+                    } else if (column[0] === "ComplianceStatus") {
+                        cell.appendChild(badge("compliance", value));
+                    } else {
+                        if (column[0] === "AssetService" && ICONS[value]) {
+                            const image = document.createElement("img");
+                            image.src = ICONS[value];
+                            image.loading = "lazy";
+                            cell.appendChild(image);
+                        }
+                        cell.appendChild(document.createTextNode(displayValue(value)));
+                        cell.title = displayValue(value);
+                    }
+                    element.appendChild(cell);
+                });
+                element.addEventListener("click", function () { showDetails(row); });
+                return element;
+            }
+
+            function showDetails(row) {
+                const list = document.createElement("dl");
+                COLUMNS.forEach(function (column, index) {
+                    const term = document.createElement("dt");
+                    const description = document.createElement("dd");
+                    term.textContent = column[1];
+                    description.textContent = displayValue(row[index]);
+                    list.appendChild(term);
+                    list.appendChild(description);
+                });
+                details.replaceChildren(list);
+                details.hidden = false;
+            }
+
+            function render() {
+                renderPending = false;
+                const top = Math.max(0, viewport.scrollTop - canvas.offsetTop);
+                const first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+                const last = Math.min(visibleRows.length, Math.ceil((top + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+                const fragment = document.createDocumentFragment();
+                for (let position = first; position < last; position++) {
+                    fragment.appendChild(createRow(rows[visibleRows[position]], position));
+                }
+                canvas.replaceChildren(fragment);
+            }
+
+            function scheduleRender() {
+                if (!renderPending) {
+                    renderPending = true;
+                    window.requestAnimationFrame(render);
+                }
+            }
+
+            function applyFilters() {
+                const query = searchBox.value.trim().toLowerCase();
+                const selected = [];
+                FILTERS.forEach(function (column) {
+                    const value = document.getElementById("filter-" + column).value;
+                    if (value !== "") {
+                        selected.push([columnIndex[column], value]);
+                    }
+                });
+
+                visibleRows = [];
+                for (let index = 0; index < rows.length; index++) {
+                    if (query && searchText[index].indexOf(query) === -1) {
+                        continue;
+                    }
+                    if (selected.some(function (filter) { return displayValue(rows[index][filter[0]]) !== filter[1]; })) {
+                        continue;
+                    }
+                    visibleRows.push(index);
+                }
+
+                counter.textContent = visibleRows.length + " of " + rows.length + " findings";
+                canvas.style.height = (visibleRows.length * ROW_HEIGHT) + "px";
+                render();
+            }
+
+            function fillFilters() {
+                FILTERS.forEach(function (column) {
+                    const select = document.getElementById("filter-" + column);
+                    const values = new Set();
+                    rows.forEach(function (row) { values.add(displayValue(row[columnIndex[column]])); });
+                    // Severities are already in report order, everything else is sorted alphabetically
+                    const options = Array.from(values);
+                    if (column !== "Severity") {
+                        options.sort();
+                    }
+                    options.forEach(function (value) {
+                        const option = document.createElement("option");
+                        option.value = value;
+                        option.textContent = value;
+                        select.appendChild(option);
+                    });
+                    select.addEventListener("change", applyFilters);
+                });
+            }
+
+            async function inflateChunk(element) {
+                const bytes = Uint8Array.from(atob(element.textContent), function (character) { return character.charCodeAt(0); });
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+                return JSON.parse(await new Response(stream).text());
+            }
+
+            async function loadChunks() {
+                if (!("DecompressionStream" in window)) {
+                    counter.textContent = "This report requires a browser which supports DecompressionStream";
+                    return;
+                }
+                for (const chunk of Array.from(document.querySelectorAll("script.report-chunk"))) {
+                    const chunkRows = await inflateChunk(chunk);
+                    chunkRows.forEach(function (row) {
+                        rows.push(row);
+                        searchText.push(row.map(displayValue).join("\\u0001").toLowerCase());
+                    });
+                    // The encoded chunk is no longer needed once its rows are loaded
+                    chunk.remove();
+                    applyFilters();
+                }
+                fillFilters();
+            }
+
+            searchBox.addEventListener("input", function () {
+                window.clearTimeout(filterTimer);
+                filterTimer = window.setTimeout(applyFilters, 200);
+            });
+            viewport.addEventListener("scroll", scheduleRender);
+            window.addEventListener("resize", scheduleRender);
+
+            loadChunks();
+        })();
+        '''
+
+        return script
+
+    def generate_table_structure(self, dateNow, execSummary):
+        """
+        This function generates the HTML structure required for the table, the rows are rendered by the report script
+        """
+
+        headerCells = "".join(
+            f'<div class="report__cell">{header}</div>' for _, header in HTML_REPORT_COLUMNS
+        )
+        filterSelects = "".join(
+            f'<select id="filter-{column}" aria-label="{header}"><option value="">All {header}</option></select>'
+            for column, header in HTML_REPORT_COLUMNS
+            if column in ("Severity", "ComplianceStatus", "Provider", "AssetClass", "AssetService")
+        )
 
         tableStructure = f'''
             <main class="table">
@@ -369,92 +646,80 @@ class HtmlProvider(object):
                     <h1>ElectricEye Executive Report as of {dateNow}</h1>
                     <p class="writeup">{execSummary}</p>
                 </section>
-                <section class="table__body">
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Finding ID</th>
-                                <th>Created At</th>
-                                <th>Severity</th>
-                                <th>Title</th>
-                                <th>Description</th>
-                                <th>Provider</th>
-                                <th>Provider Account ID</th>
-                                <th>Asset Region</th>
-                                <th>Asset Class</th>
-                                <th>Asset Service</th>
-                                <th>Asset Component</th>
-                                <th>Resource ID</th>
-                                <th>Finding State</th>
-                                <th>Compliance Status</th>
-                            </tr>
-                        </thead>
-                    <tbody>
-        '''
-        # After this section, multiple table rows need to be added, before it's closed out
-        tableClosure = f'''
-                    </tbody>
-                </table>
-            </section>
-        </main>
+                <section class="table__controls">
+                    <input type="search" id="report-search" placeholder="Search findings" aria-label="Search findings">
+                    {filterSelects}
+                    <span id="report-count">Loading findings...</span>
+                </section>
+                <section class="table__details" id="report-details" hidden></section>
+                <section class="table__body" id="report-viewport">
+                    <div class="report__head">{headerCells}</div>
+                    <div class="report__rows" id="report-rows"></div>
+                </section>
+            </main>
         '''
 
-        return tableStructure, tableClosure
+        return tableStructure
 
     def get_image_tag(self, service):
         """
         This function returns an <img> tag from a public source to match an AssetService based on records in a YAML
         """
 
-        for asset in ICONOGRAPHY:
-            if asset["AssetService"] == service:
-                if asset["ImageTag"] == "placeholder":
-                    return None
-                else:
-                    return asset["ImageTag"]
-        
-        return None
+        imageTag = ICONOGRAPHY_TAGS.get(service)
+        if imageTag == "placeholder":
+            return None
+
+        return imageTag
 
     def generate_stats(self, processedData):
         """
         This functions analyzes a group of ElectricEye findings and will return high level stats about it for an executive summary
-        in the report and return the value to the table generator function to embed it as an HTML object
+        in the report and return the value to the table generator function to embed it as an HTML object. All of the stats
+        are gathered in a single pass over the report rows
         """
 
+        complianceCounts = {"PASSED": 0, "FAILED": 0}
+        severityCounts = {severity: 0 for severity in SEVERITY_ORDER}
+        uniqueResource = set()
+        uniqueClasses = set()
+        uniqueServices = set()
+        uniqueComponents = set()
+        uniqueAccounts = set()
+        uniqueRegions = set()
+
+        complianceIndex = COLUMN_INDEX["ComplianceStatus"]
+        severityIndex = COLUMN_INDEX["Severity"]
+        resourceIndex = COLUMN_INDEX["ResourceId"]
+        classIndex = COLUMN_INDEX["AssetClass"]
+        serviceIndex = COLUMN_INDEX["AssetService"]
+        componentIndex = COLUMN_INDEX["AssetComponent"]
+        accountIndex = COLUMN_INDEX["ProviderAccountId"]
+        regionIndex = COLUMN_INDEX["AssetRegion"]
+
+        for row in processedData:
+            complianceStatus = row[complianceIndex]
+            if complianceStatus in complianceCounts:
+                complianceCounts[complianceStatus] += 1
+            severity = row[severityIndex]
+            if severity in severityCounts:
+                severityCounts[severity] += 1
+            uniqueResource.add(row[resourceIndex])
+            uniqueClasses.add(row[classIndex])
+            uniqueServices.add(row[serviceIndex])
+            uniqueComponents.add(row[componentIndex])
+            uniqueAccounts.add(row[accountIndex])
+            uniqueRegions.add(row[regionIndex])
+
         # Total
         totalFindings = len(processedData)
-        # Compliance Passed v Failed
-        totalPassed = [finding for finding in processedData if finding["ComplianceStatus"] == "PASSED"]
-        totalFailed = [finding for finding in processedData if finding["ComplianceStatus"] == "FAILED"]
-
-        passingPercentage = (len(totalPassed) / totalFindings) * 100
+        passingPercentage = (complianceCounts["PASSED"] / totalFindings) * 100 if totalFindings else 0
         roundedPercentage = f"{round(passingPercentage, 2)}%"
-        # Severity Status
-        criticalsFindings = [finding for finding in processedData if finding["Severity"] == "CRITICAL"]
-        highFindings = [finding for finding in processedData if finding["Severity"] == "HIGH"]
-        mediumFindings = [finding for finding in processedData if finding["Severity"] == "MEDIUM"]
-        lowFindings = [finding for finding in processedData if finding["Severity"] == "LOW"]
-        infoFindings = [finding for finding in processedData if finding["Severity"] == "INFORMATIONAL"]
-        # Resource IDs
-        #allResources = [d.get("ResourceId") for d in processedData]
-        uniqueResource = list(set(d.get("ResourceId") for d in processedData))
-        # Assets
-        #allServices = [d.get("AssetService") for d in processedData]
-        uniqueClasses = list(set(d.get("AssetClass") for d in processedData))
-        uniqueServices = list(set(d.get("AssetService") for d in processedData))
-        #allComponents = [d.get("AssetComponent") for d in processedData]
-        uniqueComponents = list(set(d.get("AssetComponent") for d in processedData))
-        # Accounts
-        uniqueAccounts = list(set(d.get("ProviderAccountId") for d in processedData))
-        # Regions
-        uniqueRegions = list(set(d.get("AssetRegion") for d in processedData))
 
         executiveReport = f'ElectricEye Auditors scanned {len(uniqueResource)} total Assets across {len(uniqueAccounts)} Provider Account(s) in {len(uniqueRegions)} Region(s)/Zone(s) \
-            and generated {totalFindings} Findings. Of all findings, {len(totalFailed)} failed and {len(totalPassed)} passed for an ElectricEye Findings Passing Score of {roundedPercentage}. \
-            Of these findings the severities are {len(criticalsFindings)} Critical, {len(highFindings)} High, {len(mediumFindings)} Medium, {len(lowFindings)} Low, and {len(infoFindings)} Informational. \
+            and generated {totalFindings} Findings. Of all findings, {complianceCounts["FAILED"]} failed and {complianceCounts["PASSED"]} passed for an ElectricEye Findings Passing Score of {roundedPercentage}. \
+            Of these findings the severities are {severityCounts["CRITICAL"]} Critical, {severityCounts["HIGH"]} High, {severityCounts["MEDIUM"]} Medium, {severityCounts["LOW"]} Low, and {severityCounts["INFORMATIONAL"]} Informational. \
             There are {len(uniqueClasses)} Asset Classes (categories) across the Provider Accounts & Regions, comprising {len(uniqueServices)} distinct Asset Services and {len(uniqueComponents)} distinct \
             Asset Components. It is recommended to work backwards from resources with the highest amount of failed findings and Assets with important business- or mission-criticality.'
-        
-        return executiveReport
 
-# EOF
\ No newline at end of file
+        return executiveReport
@@ -17,8 +17,8 @@
 #KIND, either express or implied.  See the License for the
 #specific language governing permissions and limitations
 #under the License.
-import json
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.json_stream_writer import JsonStreamWriter
 from os import path
 
 here = path.abspath(path.dirname(__file__))
@@ -27,82 +27,100 @@ here = path.abspath(path.dirname(__file__))
 class JsonProvider(object):
     __provider__ = "json_normalized"
 
+    def __init__(self):
+        self.writer = None
+        # Finding IDs already written, this is to prevent duplicates across every batch
+        self.allIds = set()
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write to file!")
             exit(0)
-        # create a new empty list to store flattened findings
-        newFindings = []
-        # create another list to hold Finding IDs, this is to prevent duplicates by looking up values later on
-        allIds = []
 
         print(f"Writing {len(findings)} findings to Normalized JSON file (final total may be different due to dedupe)")
-        
-        # create output file based on inputs
-        jsonfile = f"{here}/{output_file}_normalized.json"
-        print(f"Output file named: {jsonfile}")
 
-        # Use another list comprehension to remove `ProductFields.AssetDetails` from non-Asset reporting outputs
-        noDetails = [
-            {**d, "ProductFields": {k: v for k, v in d["ProductFields"].items() if k != "AssetDetails"}} for d in findings
-        ]
+        self.write_batch(findings, output_file, **kwargs)
+
+        return self.close(output_file, **kwargs)
 
-        del findings
+    def write_batch(self, findings: list, output_file: str, ndjson: bool = False, compression: str = None, **kwargs):
+        """
+        Flattens a batch of findings and appends the ones not written yet to the file, which is created with the first batch
+        """
+        if self.writer is None:
+            # create output file based on inputs
+            self.writer = JsonStreamWriter(
+                f"{here}/{output_file}_normalized.json",
+                ndjson=ndjson,
+                compression=compression
+            )
+            print(f"Output file named: {self.writer.fileName}")
 
         # loop the findings and create a flatter structure - better for indexing without the nested lists
-        for fi in noDetails:
+        for fi in findings:
             findingId = str(fi["Id"])
-            # some values may not always be present (Details, etc.) - write in fake values to handle this
-            try:
-                resourceDetails = str(fi["Resources"][0]["Details"])
-            except KeyError:
-                resourceDetails = {}
-
-            try:
-                # create the new dict which will receive parsed values
-                fDict = {
-                    "SchemaVersion": str(fi["SchemaVersion"]),
-                    "Id": findingId,
-                    "ProductArn": str(fi["ProductArn"]),
-                    "GeneratorId": str(fi["GeneratorId"]),
-                    "AwsAccountId": str(fi["AwsAccountId"]),
-                    "Types": str(fi["Types"]),
-                    "FirstObservedAt": str(fi["FirstObservedAt"]),
-                    "CreatedAt": str(fi["CreatedAt"]),
-                    "UpdatedAt": str(fi["UpdatedAt"]),
-                    "SeverityLabel": str(fi["Severity"]["Label"]),
-                    "Confidence": int(fi["Confidence"]),
-                    "Title": str(fi["Title"]),
-                    "Description": str(fi["Description"]),
-                    "RecommendationText": str(fi["Remediation"]["Recommendation"]["Text"]),
-                    "RecommendationUrl": str(fi["Remediation"]["Recommendation"]["Url"]),
-                    "ProductFields": str(fi["ProductFields"]),
-                    "ResourceType": str(fi["Resources"][0]["Type"]),
-                    "ResourceId": str(fi["Resources"][0]["Id"]),
-                    "ResourcePartition": str(fi["Resources"][0]["Partition"]),
-                    "ResourceRegion": str(fi["Resources"][0]["Region"]),
-                    "ResourceDetails": str(resourceDetails),
-                    "ComplianceStatus": str(fi["Compliance"]["Status"]),
-                    "ComplianceRelatedRequirements": str(fi["Compliance"]["RelatedRequirements"]),
-                    "WorkflowStatus": str(fi["Workflow"]["Status"]),
-                    "RecordState": str(fi["RecordState"])
-                }
-                # append new dict to list if we have not already
-                if findingId not in allIds:
-                    newFindings.append(fDict)
-                    # write finding ID to list for later check
-                    allIds.append(findingId)
+            if findingId in self.allIds:
                 continue
-            except KeyError as e:
-                print(f"Issue with Finding ID {findingId} due to missing value {e}")
-        # once complete with parsing findings - write to file and purge findings from memory
-        del noDetails
 
-        print(f"Wrote {len(allIds)} findings to Normalized JSON file")
+            fDict = self.normalize_finding(fi)
+            if fDict is not None:
+                self.writer.write(fDict)
+                # write finding ID to the set for later check
+                self.allIds.add(findingId)
+
+        return True
+
+    def close(self, output_file: str, **kwargs):
+        if self.writer is None:
+            self.write_batch([], output_file, **kwargs)
+
+        self.writer.close()
+
+        print(f"Wrote {len(self.allIds)} findings to Normalized JSON file")
 
-        del allIds
+        return True
 
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(newFindings, jsonfile, indent=4)
+    def normalize_finding(self, fi: dict):
+        """
+        Returns a flattened finding without `ProductFields.AssetDetails` (which is only for Asset reporting outputs), or
+        None when the finding is missing a required value
+        """
+        findingId = str(fi["Id"])
+        # some values may not always be present (Details, etc.) - write in fake values to handle this
+        try:
+            resourceDetails = str(fi["Resources"][0]["Details"])
+        except KeyError:
+            resourceDetails = {}
 
-        return True
\ No newline at end of file
+        try:
+            # create the new dict which will receive parsed values
+            return {
+                "SchemaVersion": str(fi["SchemaVersion"]),
+                "Id": findingId,
+                "ProductArn": str(fi["ProductArn"]),
+                "GeneratorId": str(fi["GeneratorId"]),
+                "AwsAccountId": str(fi["AwsAccountId"]),
+                "Types": str(fi["Types"]),
+                "FirstObservedAt": str(fi["FirstObservedAt"]),
+                "CreatedAt": str(fi["CreatedAt"]),
+                "UpdatedAt": str(fi["UpdatedAt"]),
+                "SeverityLabel": str(fi["Severity"]["Label"]),
+                "Confidence": int(fi["Confidence"]),
+                "Title": str(fi["Title"]),
+                "Description": str(fi["Description"]),
+                "RecommendationText": str(fi["Remediation"]["Recommendation"]["Text"]),
+                "RecommendationUrl": str(fi["Remediation"]["Recommendation"]["Url"]),
+                "ProductFields": str({k: v for k, v in fi["ProductFields"].items() if k != "AssetDetails"}),
+                "ResourceType": str(fi["Resources"][0]["Type"]),
+                "ResourceId": str(fi["Resources"][0]["Id"]),
+                "ResourcePartition": str(fi["Resources"][0]["Partition"]),
+                "ResourceRegion": str(fi["Resources"][0]["Region"]),
+                "ResourceDetails": str(resourceDetails),
+                "ComplianceStatus": str(fi["Compliance"]["Status"]),
+                "ComplianceRelatedRequirements": str(fi["Compliance"]["RelatedRequirements"]),
+                "WorkflowStatus": str(fi["Workflow"]["Status"]),
+                "RecordState": str(fi["RecordState"])
+            }
+        except KeyError as e:
+            print(f"Issue with Finding ID {findingId} due to missing value {e}")
+            return None
\ No newline at end of file
@@ -18,19 +18,18 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from os import path
 from processor.outputs.output_base import ElectricEyeOutput
-import json
-from base64 import b64decode
-
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
+from processor.json_stream_writer import JsonStreamWriter
 
 @ElectricEyeOutput
 class JsonProvider(object):
     __provider__ = "json"
 
+    def __init__(self):
+        self.writer = None
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write to file!")
@@ -38,73 +37,32 @@ class JsonProvider(object):
 
         print(f"Writing {len(findings)} findings to JSON file")
 
-        """# Use another list comprehension to remove `ProductFields.AssetDetails` from non-Asset reporting outputs
-        newFindings = [
-            {**d, "ProductFields": {k: v for k, v in d["ProductFields"].items() if k != "AssetDetails"}} for d in findings
-        ]
+        self.write_batch(findings, output_file, **kwargs)
 
-        del findings"""
+        return self.close(output_file, **kwargs)
 
+    def write_batch(self, findings: list, output_file: str, ndjson: bool = False, compression: str = None, **kwargs):
         """
-        This list comprhension will base64 decode and convert a string to JSON for all instances of `ProductFields.AssetDetails`
-        except where it is a None type (this is done for placeholders in Checks where the Asset doesn't exist) and it will also
-        skip over areas in the event that `ProductFields` is missing any Cloud Asset Management required fields
+        Appends a batch of findings, with their AssetDetails decoded and compliance controls mapped in, to the file which is
+        created with the first batch
         """
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        del findings
+        if self.writer is None:
+            # create output file based on inputs
+            self.writer = JsonStreamWriter(f"{output_file}.json", ndjson=ndjson, compression=compression, default=str)
+            print(f"Output file named: {self.writer.fileName}")
+
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
 
         # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = finding["Compliance"]["RelatedRequirements"]
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
-
-        
-        # create output file based on inputs
-        jsonfile = f"{output_file}.json"
-        print(f"Output file named: {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(
-                decodedFindings,
-                jsonfile,
-                indent=4,
-                default=str
-            )
-            
+        self.writer.write_records(complianceCrosswalk.expand_finding(finding) for finding in decodedFindings)
+
         return True
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
 
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
\ No newline at end of file
+    def close(self, output_file: str, **kwargs):
+        if self.writer is None:
+            self.write_batch([], output_file, **kwargs)
+
+        recordsWritten = self.writer.close()
+        print(f"Wrote {recordsWritten} findings to {self.writer.fileName}")
+
+        return True
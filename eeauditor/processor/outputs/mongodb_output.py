@@ -25,22 +25,34 @@ import os
 import sys
 import requests
 from pymongo import errors, MongoClient
-import json
-from base64 import b64decode
 from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
+from processor.mongodb_bulk import DEFAULT_MONGODB_BATCH_SIZE, MongodbBulkUpserter
 
 # Boto3 Clients
 ssm = boto3.client("ssm")
 asm = boto3.client("secretsmanager")
 
 here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
 
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 
+# Fields that dashboards and queries filter on most, these are indexed when connecting
+MONGODB_INDEXED_FIELDS = [
+    "ProductFields.Provider",
+    "ProductFields.ProviderAccountId",
+    "ProductFields.AssetClass",
+    "ProductFields.AssetService",
+    "Severity.Label",
+    "Compliance.Status",
+    "RecordState",
+    "Resources.Id",
+    "UpdatedAt"
+]
+
 @ElectricEyeOutput
 class MongodbProvider(object):
     __provider__ = "mongodb"
@@ -77,6 +89,8 @@ class MongodbProvider(object):
         mongodbPort = mongodbDetails["mongodb_port"]
         mongodbDatabaseName = mongodbDetails["mongodb_database_name"]
         mongodbCollectionName = mongodbDetails["mongodb_collection_name"]
+        # Optional, older TOML files will not have this value
+        mongodbBatchSize = mongodbDetails.get("mongodb_batch_size", DEFAULT_MONGODB_BATCH_SIZE)
 
         # Determine if a password if provided, and if so, retrieve it based on `credentials_location`
         if mongodbDetails["mongodb_password_in_use"] == True:
@@ -133,11 +147,63 @@ class MongodbProvider(object):
         self.password = password
         self.tlsPath = mongoTlsCertPath
 
+        if not isinstance(mongodbBatchSize, int) or mongodbBatchSize < 1:
+            print("The value for '[outputs.mongodb.mongodb_batch_size]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+        self.batchSize = mongodbBatchSize
+        self.client = None
+        self.upserter = None
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             print("There are not any findings to write!")
             exit(0)
-        
+
+        self.write_batch(findings)
+        del findings
+
+        return self.close()
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Upserts a batch of findings with unordered bulk writes, see `MongodbBulkUpserter`
+        """
+        if not findings:
+            return True
+
+        if self.upserter is None:
+            self.connect()
+
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
+
+        # Map in the new compliance controls
+        decodedFindings = [complianceCrosswalk.expand_finding(finding) for finding in decodedFindings]
+
+        print(f"Attempting to upsert {len(decodedFindings)} findings to MongoDB.")
+
+        # use the Finding "Id" as the MongoDB "_id"
+        self.upserter.upsert(decodedFindings)
+
+        return True
+
+    def close(self, **kwargs):
+        """
+        Closes the connection and returns False when any finding failed to be upserted
+        """
+        if self.upserter is None:
+            print("There are not any findings to write!")
+            return True
+
+        self.client.close()
+
+        print(f"Completed upserting findings to MongoDB: {self.upserter.summary()}.")
+
+        return self.upserter.failed == 0
+
+    def connect(self):
+        """
+        Connects to MongoDB / AWS DocumentDB, creates the indexes for commonly queried fields and prepares the bulk upserter
+        """
         # There are different possible connection objects based on if Passwords are used and if TLS is enabled for AWS DocDB
 
         # Self-hosted, no password
@@ -158,61 +224,17 @@ class MongodbProvider(object):
 
         try:
             # Connect to MongoDB
-            client = MongoClient(connectionString)
-            db = client[self.dbName]
+            self.client = MongoClient(connectionString)
+            db = self.client[self.dbName]
             collection = db[self.collName]
-        except errors.ConnectionError as e:
+            upserter = MongodbBulkUpserter(collection, "Id", self.batchSize)
+            upserter.create_indexes(MONGODB_INDEXED_FIELDS)
+        except errors.ConnectionFailure as e:
             print(f"Connection or credential issue with MongoDB/AWS DocumentDB!")
             raise e
-        
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        del findings
-
-        # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = finding["Compliance"]["RelatedRequirements"]
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
-
-        print(f"Attempting to upsert {len(decodedFindings)} findings to MongoDB.")
 
-        for doc in decodedFindings:
-            try:
-                # use the Finding "Id" as the MongoDB "_id"
-                doc["_id"] = doc["Id"]
-                filter = {'_id': doc['_id']}
-                update = {'$set': doc}
-                collection.update_one(filter, update, upsert=True)
-            except errors as e:
-                print(f"Encountered an error during update_one() operation: {e}")
-            except KeyError as ke:
-                raise ke
+        self.upserter = upserter
 
-        return True
-    
     def get_credential_from_aws_ssm(self, value, configurationName):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
@@ -253,18 +275,6 @@ class MongodbProvider(object):
             raise e
         
         return credential
-
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
-
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
 # EOF
 
 """
@@ -25,45 +25,18 @@ import sys
 from typing import NamedTuple
 from os import path, environ
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
 import json
-from base64 import b64decode
 from datetime import datetime
-from botocore.exceptions import ClientError
+from processor.aws_batch_sender import DEFAULT_BATCH_MAX_WORKERS, AwsBatchSender
 
 logger = logging.getLogger("OCSF_to_KDF_Output")
 
-# NOTE TO SELF: Updated this and FAQ.md as new standards are added
-SUPPORTED_FRAMEWORKS = [
-    "NIST CSF V1.1",
-    "NIST SP 800-53 Rev. 4",
-    "AICPA TSC",
-    "ISO 27001:2013",
-    "CIS Critical Security Controls V8",
-    "NIST SP 800-53 Rev. 5",
-    "NIST SP 800-171 Rev. 2",
-    "CSA Cloud Controls Matrix V4.0",
-    "CMMC 2.0",
-    "UK NCSC Cyber Essentials V2.2",
-    "HIPAA Security Rule 45 CFR Part 164 Subpart C",
-    "FFIEC Cybersecurity Assessment Tool",
-    "NERC Critical Infrastructure Protection",
-    "NYDFS 23 NYCRR Part 500",
-    "UK NCSC Cyber Assessment Framework V3.1",
-    "PCI-DSS V4.0",
-    "NZISM V3.5",
-    "ISO 27001:2022",
-    "Critical Risk Profile V1.2",
-    "ECB CROE",
-    "Equifax SCF V1.0",
-    "FBI CJIS Security Policy V5.9",
-    "CIS Amazon Web Services Foundations Benchmark V1.5",
-    "CIS Amazon Web Services Foundations Benchmark V2.0",
-    "CIS Amazon Web Services Foundations Benchmark V3.0",
-    "MITRE ATT&CK",
-    "CIS AWS Database Services Benchmark V1.0",
-    "CIS Microsoft Azure Foundations Benchmark V2.0.0",
-    "CIS Snowflake Foundations Benchmark V1.0.0"
-]
+# PutRecordBatch accepts up to 500 records and 4 MiB per call, with each record being no larger than 1,000 KiB
+FIREHOSE_MAX_BATCH_RECORDS = 500
+FIREHOSE_MAX_BATCH_BYTES = 4194304
+FIREHOSE_MAX_RECORD_BYTES = 1024000
 
 class SeverityAccountTypeComplianceMapping(NamedTuple):
     severityId: int
@@ -81,10 +54,6 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
-
 @ElectricEyeOutput
 class OcsfFirehoseOutput(object):
     __provider__ = "ocsf_kdf"
@@ -112,6 +81,7 @@ class OcsfFirehoseOutput(object):
         awsRegion = sqsDetails["kinesis_firehose_region"]
         if awsRegion is None or awsRegion == "":
             awsRegion = boto3.Session().region_name
+        maxWorkers = sqsDetails.get("kinesis_firehose_max_workers", DEFAULT_BATCH_MAX_WORKERS)
 
         # Ensure that values are provided for all variable - use all() and a list comprehension to check the vars
         # empty strings will trigger `if not`
@@ -119,8 +89,22 @@ class OcsfFirehoseOutput(object):
             logger.error("An empty value was detected in '[outputs.firehose]'. Review the TOML file and try again!")
             sys.exit(2)
 
+        if not isinstance(maxWorkers, int) or maxWorkers < 1:
+            logger.error("The value for '[outputs.firehose.kinesis_firehose_max_workers]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+
         self.deliveryStream = deliveryStream
+        self.newlineDelimited = bool(sqsDetails.get("kinesis_firehose_newline_delimited", False))
         self.firehose = boto3.client("firehose", region_name=awsRegion)
+        self.sender = AwsBatchSender(
+            self.put_record_batch_to_firehose,
+            maxEntries=FIREHOSE_MAX_BATCH_RECORDS,
+            maxBytes=FIREHOSE_MAX_BATCH_BYTES,
+            maxEntryBytes=FIREHOSE_MAX_RECORD_BYTES,
+            maxWorkers=maxWorkers,
+            serviceName="Kinesis Data Firehose"
+        )
+        self.findingsProcessed = 0
 
     def write_findings(self, findings: list, **kwargs):
         if len(findings) == 0:
@@ -132,97 +116,72 @@ class OcsfFirehoseOutput(object):
             len(findings)
         )
 
-        """# Use another list comprehension to remove `ProductFields.AssetDetails` from non-Asset reporting outputs
-        newFindings = [
-            {**d, "ProductFields": {k: v for k, v in d["ProductFields"].items() if k != "AssetDetails"}} for d in findings
-        ]
-
-        del findings"""
+        self.write_batch(findings, **kwargs)
+        return self.close(**kwargs)
 
+    def write_batch(self, findings: list, **kwargs):
         """
-        This list comprhension will base64 decode and convert a string to JSON for all instances of `ProductFields.AssetDetails`
-        except where it is a None type (this is done for placeholders in Checks where the Asset doesn't exist) and it will also
-        skip over areas in the event that `ProductFields` is missing any Cloud Asset Management required fields
+        Maps a batch of findings into OCSF Compliance Findings and queues them up as Firehose records
         """
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        del findings
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
 
         # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = list(finding["Compliance"]["RelatedRequirements"])
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
+        decodedFindings = [complianceCrosswalk.expand_finding(finding) for finding in decodedFindings]
 
         ocsfFindings = self.ocsf_compliance_finding_mapping(decodedFindings)
 
         del decodedFindings
 
-        firehose = self.firehose
-
-        # TODO: Make this more performant, because woah dawg, this shit's stupid!
-        for i in range(0, len(ocsfFindings), 25):
-            encodedRecords = []
-            records = ocsfFindings[i : i + 25]
-            for record in records:
-                encodedRecords.append({"Data": json.dumps(record).encode("utf-8")})
-            del records
-
-            try:
-                response = firehose.put_record_batch(
-                    DeliveryStreamName=self.deliveryStream,
-                    Records=encodedRecords
-                )
-                if response["FailedPutCount"] > 0:
-                    logger.warning(
-                        "Failed to deliver %s records",
-                        response["FailedPutCount"]
-                    )
-            except ClientError as e:
-                logger.warning(
-                    "Error with sending batch to Firehose due to: %s",
-                    e.response["Error"]["Message"]
-                )
-                continue
-
-        print("Finished write OCSF Compliance Findings to Kinesis Data Firehose.")
-            
+        self.findingsProcessed += len(ocsfFindings)
+        self.sender.send(self.encode_record(record) for record in ocsfFindings)
+
         return True
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
+
+    def close(self, **kwargs):
+        delivered, failed = self.sender.close()
+
+        print(
+            f"Finished writing OCSF Compliance Findings to Kinesis Data Firehose. {delivered} of {self.findingsProcessed} records delivered in {self.sender.calls} PutRecordBatch calls, {failed} failed."
+        )
+
+        return failed == 0
+
+    def encode_record(self, record: dict):
         """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
+        Returns a tuple of a Firehose record for an OCSF finding and its size, records are optionally newline-delimited
+        so that destinations such as Amazon S3 receive JSON Lines instead of concatenated JSON objects
         """
+        data = json.dumps(record, default=str)
+        if self.newlineDelimited:
+            data += "\n"
+        data = data.encode("utf-8")
+
+        return {"Data": data}, len(data)
+
+    def put_record_batch_to_firehose(self, batch: list):
+        """
+        Sends a batch of records with a single PutRecordBatch call and returns a tuple of the records to retry, which are
+        the ones with an `ErrorCode` in the positionally matched `RequestResponses`, and the permanently failed records
+        """
+        response = self.firehose.put_record_batch(
+            DeliveryStreamName=self.deliveryStream,
+            Records=batch
+        )
+
+        if response["FailedPutCount"] == 0:
+            return [], []
+
+        retryRecords = [
+            record for record, result in zip(batch, response["RequestResponses"]) if result.get("ErrorCode")
+        ]
+        logger.warning(
+            "Failed to deliver %s of %s records, retrying them.",
+            len(retryRecords),
+            len(batch)
+        )
+
+        return retryRecords, []
 
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
-        
     def compliance_finding_ocsf_normalization(self, severityLabel: str, cloudProvider: str, complianceStatusLabel: str) -> SeverityAccountTypeComplianceMapping:
         """
         Normalizes the following ASFF Severity, Cloud Account Provider, and Compliance values into OCSF
@@ -345,12 +304,8 @@ class OcsfFirehoseOutput(object):
             procssedTime = self.iso8061_to_epochseconds(timeNow)
 
             # check if the compliance.requirements start with the control frameworks and append the unique ones into a list for compliance.stnadards
-            standard = []
             requirements = finding["Compliance"]["RelatedRequirements"]
-            for control in requirements:
-                for framework in SUPPORTED_FRAMEWORKS:
-                    if str(control).startswith(framework) and framework not in standard:
-                        standard.append(framework)
+            standard = complianceCrosswalk.get_standards(requirements)
 
             asffToOcsf = self.compliance_finding_ocsf_normalization(
                 severityLabel=finding["Severity"]["Label"],
@@ -21,47 +21,14 @@
 import logging
 import sys
 from typing import NamedTuple
-from os import path
 from processor.outputs.output_base import ElectricEyeOutput
-import json
-from base64 import b64decode
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
+from processor.json_stream_writer import JsonStreamWriter
 from datetime import datetime
 
 logger = logging.getLogger("OCSF_V1.1.0_Output")
 
-# NOTE TO SELF: Updated this and FAQ.md as new standards are added
-SUPPORTED_FRAMEWORKS = [
-    "NIST CSF V1.1",
-    "NIST SP 800-53 Rev. 4",
-    "AICPA TSC",
-    "ISO 27001:2013",
-    "CIS Critical Security Controls V8",
-    "NIST SP 800-53 Rev. 5",
-    "NIST SP 800-171 Rev. 2",
-    "CSA Cloud Controls Matrix V4.0",
-    "CMMC 2.0",
-    "UK NCSC Cyber Essentials V2.2",
-    "HIPAA Security Rule 45 CFR Part 164 Subpart C",
-    "FFIEC Cybersecurity Assessment Tool",
-    "NERC Critical Infrastructure Protection",
-    "NYDFS 23 NYCRR Part 500",
-    "UK NCSC Cyber Assessment Framework V3.1",
-    "PCI-DSS V4.0",
-    "NZISM V3.5",
-    "ISO 27001:2022",
-    "Critical Risk Profile V1.2",
-    "ECB CROE",
-    "Equifax SCF V1.0",
-    "FBI CJIS Security Policy V5.9",
-    "CIS Amazon Web Services Foundations Benchmark V1.5",
-    "CIS Amazon Web Services Foundations Benchmark V2.0",
-    "CIS Amazon Web Services Foundations Benchmark V3.0",
-    "MITRE ATT&CK",
-    "CIS AWS Database Services Benchmark V1.0",
-    "CIS Microsoft Azure Foundations Benchmark V2.0.0",
-    "CIS Snowflake Foundations Benchmark V1.0.0"
-]
-
 class SeverityAccountTypeComplianceMapping(NamedTuple):
     severityId: int
     severity: str
@@ -78,14 +45,13 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
-
 @ElectricEyeOutput
 class OcsfV110Output(object):
     __provider__ = "ocsf_v1_1_0"
 
+    def __init__(self):
+        self.writer = None
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             logger.error("There are not any findings to write to file!")
@@ -96,67 +62,41 @@ class OcsfV110Output(object):
             len(findings)
         )
 
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
+        self.write_batch(findings, output_file, **kwargs)
+
+        return self.close(output_file, **kwargs)
+
+    def write_batch(self, findings: list, output_file: str, ndjson: bool = False, compression: str = None, **kwargs):
+        """
+        Maps a batch of findings into OCSF Compliance Findings and appends them to the file, which is created with the first batch
+        """
+        if self.writer is None:
+            # create output file based on inputs
+            self.writer = JsonStreamWriter(
+                f"{output_file}_ocsf_v1-1-0_compliance_findings.json",
+                ndjson=ndjson,
+                compression=compression,
+                default=str
+            )
+            logger.info(f"Output file named: {self.writer.fileName}")
 
-        del findings
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
 
         # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = list(finding["Compliance"]["RelatedRequirements"])
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
+        decodedFindings = [complianceCrosswalk.expand_finding(finding) for finding in decodedFindings]
 
-        ocsfFindings = self.ocsf_compliance_finding_mapping(decodedFindings)
+        self.writer.write_records(self.ocsf_compliance_finding_mapping(decodedFindings))
 
-        del decodedFindings
-        
-        # create output file based on inputs
-        jsonfile = f"{output_file}_ocsf_v1-1-0_compliance_findings.json"
-        logger.info(f"Output file named: {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(
-                ocsfFindings,
-                jsonfile,
-                indent=4,
-                default=str
-            )
-            
         return True
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
 
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
+    def close(self, output_file: str, **kwargs):
+        if self.writer is None:
+            self.write_batch([], output_file, **kwargs)
+
+        recordsWritten = self.writer.close()
+        logger.info(f"Wrote {recordsWritten} OCSF Compliance Findings to {self.writer.fileName}")
+
+        return True
         
     def asff_to_ocsf_normalization(self, severityLabel: str, cloudProvider: str, complianceStatusLabel: str) -> SeverityAccountTypeComplianceMapping:
         """
@@ -259,12 +199,8 @@ class OcsfV110Output(object):
         for finding in findings:
 
             # check if the compliance.requirements start with the control frameworks and append the unique ones into a list for compliance.stnadards
-            standard = []
             requirements = finding["Compliance"]["RelatedRequirements"]
-            for control in requirements:
-                for framework in SUPPORTED_FRAMEWORKS:
-                    if str(control).startswith(framework) and framework not in standard:
-                        standard.append(framework)
+            standard = complianceCrosswalk.get_standards(requirements)
 
             asffToOcsf = self.asff_to_ocsf_normalization(
                 severityLabel=finding["Severity"]["Label"],
@@ -21,48 +21,15 @@
 import logging
 import sys
 from typing import NamedTuple
-from os import path
 from processor.outputs.output_base import ElectricEyeOutput
-import json
-from base64 import b64decode
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
+from processor.json_stream_writer import JsonStreamWriter
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("OCSF_V1.4.0_Output")
 
-# NOTE TO SELF: Updated this and FAQ.md as new standards are added
-SUPPORTED_FRAMEWORKS = [
-    "NIST CSF V1.1",
-    "NIST SP 800-53 Rev. 4",
-    "AICPA TSC",
-    "ISO 27001:2013",
-    "CIS Critical Security Controls V8",
-    "NIST SP 800-53 Rev. 5",
-    "NIST SP 800-171 Rev. 2",
-    "CSA Cloud Controls Matrix V4.0",
-    "CMMC 2.0",
-    "UK NCSC Cyber Essentials V2.2",
-    "HIPAA Security Rule 45 CFR Part 164 Subpart C",
-    "FFIEC Cybersecurity Assessment Tool",
-    "NERC Critical Infrastructure Protection",
-    "NYDFS 23 NYCRR Part 500",
-    "UK NCSC Cyber Assessment Framework V3.1",
-    "PCI-DSS V4.0",
-    "NZISM V3.5",
-    "ISO 27001:2022",
-    "Critical Risk Profile V1.2",
-    "ECB CROE",
-    "Equifax SCF V1.0",
-    "FBI CJIS Security Policy V5.9",
-    "CIS Amazon Web Services Foundations Benchmark V1.5",
-    "CIS Amazon Web Services Foundations Benchmark V2.0",
-    "CIS Amazon Web Services Foundations Benchmark V3.0",
-    "MITRE ATT&CK",
-    "CIS AWS Database Services Benchmark V1.0",
-    "CIS Microsoft Azure Foundations Benchmark V2.0.0",
-    "CIS Snowflake Foundations Benchmark V1.0.0"
-]
-
 class SeverityAccountTypeComplianceMapping(NamedTuple):
     severityId: int
     severity: str
@@ -79,14 +46,13 @@ class ActivityStatusTypeMapping(NamedTuple):
     typeUid: int
     typeName: str
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
-
 @ElectricEyeOutput
 class OcsfV140Output(object):
     __provider__ = "ocsf_v1_4_0"
 
+    def __init__(self):
+        self.writer = None
+
     def write_findings(self, findings: list, output_file: str, **kwargs):
         if len(findings) == 0:
             logger.error("There are not any findings to write to file!")
@@ -97,67 +63,41 @@ class OcsfV140Output(object):
             len(findings)
         )
 
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
+        self.write_batch(findings, output_file, **kwargs)
 
-        del findings
+        return self.close(output_file, **kwargs)
+
+    def write_batch(self, findings: list, output_file: str, ndjson: bool = False, compression: str = None, **kwargs):
+        """
+        Maps a batch of findings into OCSF v1.4.0 events and appends them to the file, which is created with the first batch
+        """
+        if self.writer is None:
+            # create output file based on inputs
+            self.writer = JsonStreamWriter(
+                f"{output_file}_ocsf_v1-4-0_events.json",
+                ndjson=ndjson,
+                compression=compression,
+                default=str
+            )
+            logger.info(f"Output file named: {self.writer.fileName}")
+
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
 
         # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = list(finding["Compliance"]["RelatedRequirements"])
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
+        decodedFindings = [complianceCrosswalk.expand_finding(finding) for finding in decodedFindings]
 
-        ocsfFindings = self.ocsf_compliance_finding_mapping(decodedFindings)
+        self.writer.write_records(self.ocsf_compliance_finding_mapping(decodedFindings))
 
-        del decodedFindings
-        
-        # create output file based on inputs
-        jsonfile = f"{output_file}_ocsf_v1-4-0_events.json"
-        logger.info(f"Output file named: {jsonfile}")
-        
-        with open(jsonfile, "w") as jsonfile:
-            json.dump(
-                ocsfFindings,
-                jsonfile,
-                indent=4,
-                default=str
-            )
-            
         return True
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
 
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
+    def close(self, output_file: str, **kwargs):
+        if self.writer is None:
+            self.write_batch([], output_file, **kwargs)
+
+        recordsWritten = self.writer.close()
+        logger.info(f"Wrote {recordsWritten} OCSF v1.4.0 events to {self.writer.fileName}")
+
+        return True
         
     def compliance_finding_ocsf_normalization(self, severityLabel: str, cloudProvider: str, complianceStatusLabel: str) -> SeverityAccountTypeComplianceMapping:
         """
@@ -281,12 +221,8 @@ class OcsfV140Output(object):
             procssedTime = self.iso8061_to_epochseconds(timeNow)
 
             # check if the compliance.requirements start with the control frameworks and append the unique ones into a list for compliance.stnadards
-            standard = []
             requirements = finding["Compliance"]["RelatedRequirements"]
-            for control in requirements:
-                for framework in SUPPORTED_FRAMEWORKS:
-                    if str(control).startswith(framework) and framework not in standard:
-                        standard.append(framework)
+            standard = complianceCrosswalk.get_standards(requirements)
 
             asffToOcsf = self.compliance_finding_ocsf_normalization(
                 severityLabel=finding["Severity"]["Label"],
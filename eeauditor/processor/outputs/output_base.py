@@ -24,7 +24,11 @@ from sys import exit as sysexit
 logger = logging.getLogger("OutputBase")
 
 class ElectricEyeOutput(object):
-    """Class to be used as a decorator to register all output providers"""
+    """
+    Class to be used as a decorator to register all output providers. Every provider implements `write_findings()` which
+    receives every finding at once. Providers that can write incrementally also implement `write_batch()`, which is called
+    with consecutive fixed-size lists of findings, and `close()` which is called once after the last batch
+    """
 
     _outputs = {}
 
@@ -43,6 +47,11 @@ class ElectricEyeOutput(object):
             )
             sysexit(2)
 
+    @staticmethod
+    def supports_streaming(provider):
+        """Returns True if a provider (class or instance) implements the incremental write_batch/close protocol"""
+        return callable(getattr(provider, "write_batch", None)) and callable(getattr(provider, "close", None))
+
     @classmethod
     def get_all_providers(cls):
         """Return a list of all the possible output providers"""
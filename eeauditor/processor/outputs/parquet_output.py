@@ -0,0 +1,381 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import tomli
+import sys
+import os
+import json
+import uuid
+from datetime import datetime
+from urllib.parse import quote
+from processor.outputs.output_base import ElectricEyeOutput
+from processor.cam_aggregator import CamAccumulator
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
+
+# Defaults for the optional [outputs.parquet] section of the TOML file
+DEFAULT_PARQUET_PARTITION_COLUMNS = ["provider", "provider_type", "scan_date"]
+DEFAULT_PARQUET_ROW_GROUP_SIZE = 50000
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_CHOICES = ["none", "snappy", "gzip", "brotli", "lz4", "zstd"]
+
+# Columns of the findings dataset and their Arrow type names, "timestamp" is microseconds in UTC and "list" is a list of strings
+PARQUET_FINDINGS_COLUMNS = {
+    "id": "string",
+    "product_arn": "string",
+    "types": "list",
+    "first_observed_at": "timestamp",
+    "created_at": "timestamp",
+    "updated_at": "timestamp",
+    "severity_label": "string",
+    "title": "string",
+    "description": "string",
+    "remediation_recommendation_text": "string",
+    "remediation_recommendation_url": "string",
+    "product_name": "string",
+    "provider": "string",
+    "provider_type": "string",
+    "provider_account_id": "string",
+    "asset_region": "string",
+    "asset_class": "string",
+    "asset_service": "string",
+    "asset_component": "string",
+    "asset_details": "string",
+    "resource_type": "string",
+    "resource_id": "string",
+    "resource_partition": "string",
+    "resource_region": "string",
+    "resource_details": "string",
+    "compliance_status": "string",
+    "compliance_related_requirements": "list",
+    "workflow_status": "string",
+    "record_state": "string",
+    "scan_date": "date"
+}
+
+# Columns of the CAM dataset and their Arrow type names
+PARQUET_CAM_COLUMNS = {
+    "asset_id": "string",
+    "first_observed_at": "timestamp",
+    "provider": "string",
+    "provider_type": "string",
+    "provider_account_id": "string",
+    "asset_region": "string",
+    "asset_details": "string",
+    "asset_class": "string",
+    "asset_service": "string",
+    "asset_component": "string",
+    "informational_severity_findings": "int64",
+    "low_severity_findings": "int64",
+    "medium_severity_findings": "int64",
+    "high_severity_findings": "int64",
+    "critical_severity_findings": "int64"
+}
+
+# Low cardinality string columns which are dictionary encoded in the Parquet files, the long free-text and JSON columns are not
+PARQUET_DICTIONARY_COLUMNS = [
+    "product_arn", "severity_label", "title", "remediation_recommendation_text", "remediation_recommendation_url",
+    "product_name", "provider", "provider_type", "provider_account_id", "asset_region", "asset_class", "asset_service",
+    "asset_component", "resource_type", "resource_partition", "resource_region", "compliance_status", "workflow_status",
+    "record_state"
+]
+
+def parse_timestamp(value):
+    """
+    Parses an ISO-8601 ASFF timestamp into a datetime, returns None when the value is missing or malformed
+    """
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+@ElectricEyeOutput
+class ParquetProvider(object):
+    __provider__ = "parquet"
+
+    def __init__(self):
+        # pyarrow is an optional dependency, only needed when this Output is selected
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            print("The 'pyarrow' package is required for the Parquet Output, install it with 'pip install pyarrow' and try again!")
+            sys.exit(2)
+
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+
+        if os.environ["TOML_FILE_PATH"] == "None":
+            # Get the absolute path of the current directory
+            currentDir = os.path.abspath(os.path.dirname(__file__))
+            # Go two directories back to /eeauditor/
+            twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
+            # TOML is located in /eeauditor/ directory
+            tomlFile = f"{twoBack}/external_providers.toml"
+        else:
+            tomlFile = os.environ["TOML_FILE_PATH"]
+
+        with open(tomlFile, "rb") as f:
+            data = tomli.load(f)
+
+        # Variable for the entire [outputs.parquet] section, every setting is optional
+        parquetDetails = data.get("outputs", {}).get("parquet", {})
+
+        partitionColumns = parquetDetails.get("parquet_partition_columns", DEFAULT_PARQUET_PARTITION_COLUMNS)
+        rowGroupSize = parquetDetails.get("parquet_row_group_size", DEFAULT_PARQUET_ROW_GROUP_SIZE)
+        compression = parquetDetails.get("parquet_compression", DEFAULT_PARQUET_COMPRESSION)
+        useDictionary = parquetDetails.get("parquet_use_dictionary", True)
+        includeCam = parquetDetails.get("parquet_include_cam", False)
+
+        if not isinstance(partitionColumns, list) or not all(column in PARQUET_FINDINGS_COLUMNS for column in partitionColumns):
+            print(f"The value for '[outputs.parquet.parquet_partition_columns]' must be a list of findings columns from {list(PARQUET_FINDINGS_COLUMNS)}. Review the TOML file and try again!")
+            sys.exit(2)
+
+        if not isinstance(rowGroupSize, int) or rowGroupSize < 1:
+            print("The value for '[outputs.parquet.parquet_row_group_size]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+
+        if compression not in PARQUET_COMPRESSION_CHOICES:
+            print(f"Invalid option for '[outputs.parquet.parquet_compression]'. Must be one of {str(PARQUET_COMPRESSION_CHOICES)}.")
+            sys.exit(2)
+
+        self.partitionColumns = partitionColumns
+        self.rowGroupSize = rowGroupSize
+        self.compression = compression
+        self.useDictionary = useDictionary
+        self.findingsSchema = self.create_schema(
+            {column: arrowType for column, arrowType in PARQUET_FINDINGS_COLUMNS.items() if column not in partitionColumns}
+        )
+        self.camSchema = self.create_schema(PARQUET_CAM_COLUMNS)
+        self.accumulator = CamAccumulator() if includeCam else None
+        # Each run writes its own files into the partitions so scans can be appended to the same dataset over time
+        self.runId = uuid.uuid4().hex
+        # Rows waiting to be written and the open ParquetWriter, per partition
+        self.partitionRows = {}
+        self.partitionWriters = {}
+        self.outputDirectory = None
+        self.findingsWritten = 0
+
+    def write_findings(self, findings: list, output_file: str, **kwargs):
+        if len(findings) == 0:
+            print("There are not any findings to write to file!")
+            exit(0)
+
+        self.write_batch(findings, output_file, **kwargs)
+
+        return self.close(output_file, **kwargs)
+
+    def write_batch(self, findings: list, output_file: str, **kwargs):
+        """
+        Flattens a batch of findings into typed rows and adds them to their partitions, every partition with a full row
+        group worth of rows is written out right away
+        """
+        if self.outputDirectory is None:
+            self.outputDirectory = f"{output_file}_parquet"
+            print(f"Writing findings to the Parquet dataset in {self.outputDirectory}")
+
+        if self.accumulator is not None:
+            self.accumulator.add_findings(findings)
+
+        decodedFindings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
+
+        for finding in decodedFindings:
+            row = self.flatten_finding(finding)
+            partition = tuple(row.pop(column) for column in self.partitionColumns)
+
+            rows = self.partitionRows.get(partition)
+            if rows is None:
+                rows = self.partitionRows[partition] = []
+            rows.append(row)
+
+            if len(rows) >= self.rowGroupSize:
+                self.write_row_group(partition)
+
+        return True
+
+    def close(self, output_file: str, **kwargs):
+        if self.outputDirectory is None:
+            self.write_batch([], output_file, **kwargs)
+
+        for partition in list(self.partitionRows):
+            self.write_row_group(partition)
+
+        for writer in self.partitionWriters.values():
+            writer.close()
+
+        print(f"Wrote {self.findingsWritten} findings into {len(self.partitionWriters)} partitions of {self.outputDirectory}/findings")
+
+        if self.accumulator is not None and self.accumulator.findingsProcessed > 0:
+            self.write_cam_dataset()
+
+        return True
+
+    def create_schema(self, columns: dict):
+        """
+        Creates the Arrow schema for a dict of column names and their Arrow type names
+        """
+        pa = self.pa
+        arrowTypes = {
+            "string": pa.string(),
+            "list": pa.list_(pa.string()),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+            "date": pa.date32(),
+            "int64": pa.int64()
+        }
+
+        return pa.schema([(column, arrowTypes[arrowType]) for column, arrowType in columns.items()])
+
+    def flatten_finding(self, finding: dict) -> dict:
+        """
+        Flattens Severity, Compliance, ProductFields and the first Resource of a finding into the findings columns
+        """
+        productFields = finding.get("ProductFields", {})
+        resource = finding["Resources"][0]
+        assetDetails = productFields.get("AssetDetails")
+        resourceDetails = resource.get("Details")
+        createdAt = parse_timestamp(finding.get("CreatedAt"))
+
+        return {
+            "id": finding["Id"],
+            "product_arn": finding.get("ProductArn"),
+            "types": finding.get("Types"),
+            "first_observed_at": parse_timestamp(finding.get("FirstObservedAt")),
+            "created_at": createdAt,
+            "updated_at": parse_timestamp(finding.get("UpdatedAt")),
+            "severity_label": finding["Severity"]["Label"],
+            "title": finding.get("Title"),
+            "description": finding.get("Description"),
+            "remediation_recommendation_text": finding.get("Remediation", {}).get("Recommendation", {}).get("Text"),
+            "remediation_recommendation_url": finding.get("Remediation", {}).get("Recommendation", {}).get("Url"),
+            "product_name": productFields.get("ProductName"),
+            "provider": productFields.get("Provider"),
+            "provider_type": productFields.get("ProviderType"),
+            "provider_account_id": productFields.get("ProviderAccountId"),
+            "asset_region": productFields.get("AssetRegion"),
+            "asset_class": productFields.get("AssetClass"),
+            "asset_service": productFields.get("AssetService"),
+            "asset_component": productFields.get("AssetComponent"),
+            "asset_details": json.dumps(assetDetails, default=str) if assetDetails else None,
+            "resource_type": resource.get("Type"),
+            "resource_id": resource.get("Id"),
+            "resource_partition": resource.get("Partition"),
+            "resource_region": resource.get("Region"),
+            "resource_details": json.dumps(resourceDetails, default=str) if resourceDetails else None,
+            "compliance_status": finding.get("Compliance", {}).get("Status"),
+            "compliance_related_requirements": complianceCrosswalk.expand_requirements(
+                finding.get("Compliance", {}).get("RelatedRequirements", [])
+            ),
+            "workflow_status": finding.get("Workflow", {}).get("Status"),
+            "record_state": finding.get("RecordState"),
+            "scan_date": createdAt.date() if createdAt else None
+        }
+
+    def get_partition_path(self, partition: tuple) -> str:
+        """
+        Returns the Hive-style (column=value) directory of a partition, values are URI encoded as pyarrow, Athena and Spark
+        expect
+        """
+        segments = [
+            f"{column}={quote(str(value) if value is not None else '__HIVE_DEFAULT_PARTITION__', safe='')}"
+            for column, value in zip(self.partitionColumns, partition)
+        ]
+
+        return os.path.join(self.outputDirectory, "findings", *segments)
+
+    def write_row_group(self, partition: tuple):
+        """
+        Writes the buffered rows of a partition as a row group, the partition's file is opened with its first row group
+        """
+        rows = self.partitionRows.pop(partition, None)
+        if not rows:
+            return
+
+        writer = self.partitionWriters.get(partition)
+        if writer is None:
+            partitionPath = self.get_partition_path(partition)
+            os.makedirs(partitionPath, exist_ok=True)
+            writer = self.partitionWriters[partition] = self.open_writer(
+                os.path.join(partitionPath, f"part-{self.runId}.parquet"), self.findingsSchema
+            )
+
+        writer.write_table(self.pa.Table.from_pylist(rows, schema=self.findingsSchema), row_group_size=self.rowGroupSize)
+        self.findingsWritten += len(rows)
+
+    def open_writer(self, fileName: str, schema):
+        """
+        Opens a ParquetWriter with the configured compression and dictionary encoding of the low cardinality columns
+        """
+        if self.useDictionary:
+            useDictionary = [column for column in PARQUET_DICTIONARY_COLUMNS if column in schema.names]
+        else:
+            useDictionary = False
+
+        return self.pq.ParquetWriter(
+            fileName,
+            schema,
+            compression=self.compression,
+            use_dictionary=useDictionary
+        )
+
+    def write_cam_dataset(self):
+        """
+        Writes the Cloud Asset Management (CAM) rollup, one row per Asset, next to the findings dataset
+        """
+        camDirectory = os.path.join(self.outputDirectory, "cam")
+        os.makedirs(camDirectory, exist_ok=True)
+        camFile = os.path.join(camDirectory, f"part-{self.runId}.parquet")
+
+        rows = []
+        for entry in self.accumulator.get_cam_entries():
+            assetDetails = entry["AssetDetails"]
+            rows.append(
+                {
+                    "asset_id": entry["AssetId"],
+                    "first_observed_at": parse_timestamp(entry["FirstObservedAt"]),
+                    "provider": entry["Provider"],
+                    "provider_type": entry["ProviderType"],
+                    "provider_account_id": entry["ProviderAccountId"],
+                    "asset_region": entry["AssetRegion"],
+                    "asset_details": json.dumps(assetDetails, default=str) if assetDetails else None,
+                    "asset_class": entry["AssetClass"],
+                    "asset_service": entry["AssetService"],
+                    "asset_component": entry["AssetComponent"],
+                    "informational_severity_findings": entry["InformationalSeverityFindings"],
+                    "low_severity_findings": entry["LowSeverityFindings"],
+                    "medium_severity_findings": entry["MediumSeverityFindings"],
+                    "high_severity_findings": entry["HighSeverityFindings"],
+                    "critical_severity_findings": entry["CriticalSeverityFindings"]
+                }
+            )
+
+        writer = self.open_writer(camFile, self.camSchema)
+        # Write the rollup in row group sized slices so the Arrow table never holds more than one row group
+        for start in range(0, len(rows), self.rowGroupSize):
+            writer.write_table(
+                self.pa.Table.from_pylist(rows[start:start + self.rowGroupSize], schema=self.camSchema),
+                row_group_size=self.rowGroupSize
+            )
+        writer.close()
+
+        print(f"Wrote {len(rows)} Assets to {camFile}")
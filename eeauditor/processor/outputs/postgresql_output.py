@@ -19,7 +19,6 @@
 #under the License.
 
 import boto3
-from os import path
 import tomli
 import sys
 import os
@@ -27,18 +26,24 @@ import json
 import psycopg2 as psql
 from botocore.exceptions import ClientError
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.postgresql_upsert import DEFAULT_POSTGRESQL_BATCH_SIZE, PostgresqlBulkUpserter
 
 # Boto3 Clients
 ssm = boto3.client("ssm")
 asm = boto3.client("secretsmanager")
 
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
-
 # These Constants define legitimate values for certain parameters within the external_providers.toml file
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 
+# Columns of the findings Table, in the order rows are upserted
+POSTGRESQL_COLUMNS = [
+    "id", "product_arn", "types", "first_observed_at", "created_at", "updated_at", "severity_label", "title", "description",
+    "remediation_recommendation_text", "remediation_recommendation_url", "product_name", "provider", "provider_type",
+    "provider_account_id", "asset_region", "asset_class", "asset_service", "asset_component", "resource_id", "resource",
+    "compliance_status", "compliance_related_requirements", "workflow_status", "record_state"
+]
+
 @ElectricEyeOutput
 class PostgresProvider(object):
     __provider__ = "postgresql"
@@ -74,6 +79,8 @@ class PostgresProvider(object):
         databaseName = postgresqlDetails["postgresql_database_name"]
         endpoint = postgresqlDetails["postgresql_endpoint"]
         port = postgresqlDetails["postgresql_port"]
+        # Optional, older TOML files will not have this value
+        batchSize = postgresqlDetails.get("postgresql_batch_size", DEFAULT_POSTGRESQL_BATCH_SIZE)
 
         # Parse Password
         if self.credentialsLocation == "CONFIG_FILE":
@@ -102,98 +109,42 @@ class PostgresProvider(object):
         self.port = port
         self.password = password
 
+        if not isinstance(batchSize, int) or batchSize < 1:
+            print("The value for '[outputs.postgresql.postgresql_batch_size]' must be a positive integer. Review the TOML file and try again!")
+            sys.exit(2)
+        self.batchSize = batchSize
+        self.engine = None
+        self.cursor = None
+        self.upserter = None
+        self.findingsWritten = 0
+
     def write_findings(self, findings: list, **kwargs):
-        processedFindings = self.processing_findings_for_upsert(findings)
-        if len(processedFindings) == 0:
+        if len(findings) == 0:
             print("There are not any findings to write!")
             exit(0)
 
+        self.write_batch(findings)
         del findings
 
-        try:
-            engine = psql.connect(
-                user=self.userName,
-                database=self.databaseName,
-                host=self.endpoint,
-                port=self.port,
-                password=self.password,
-            )
+        return self.close()
 
-            cursor = engine.cursor()
-
-            # Create a Table based on the provided Table name that contains a majority of the ASFF details
-            # Types and Compliance Requirements will be preserved as TEXT[] as they're just a list of strings
-            # The Resources block will be written as a JSONB (json bytes) but the "resource_id" will also be parsed
-            # All timestamps are already UTC ISO 8061 - TIMESTAMP WITH TIME ZONE (TIMESTAMPTZ) will preserve this
-            cursor.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.tableName} (
-                    id TEXT PRIMARY KEY,
-                    product_arn TEXT,
-                    types TEXT[],
-                    first_observed_at TIMESTAMP WITH TIME ZONE,
-                    created_at TIMESTAMP WITH TIME ZONE,
-                    updated_at TIMESTAMP WITH TIME ZONE,
-                    severity_label TEXT,
-                    title TEXT,
-                    description TEXT,
-                    remediation_recommendation_text TEXT,
-                    remediation_recommendation_url TEXT,
-                    product_name TEXT,
-                    provider TEXT,
-                    provider_type TEXT,
-                    provider_account_id TEXT,
-                    asset_region TEXT,
-                    asset_class TEXT,
-                    asset_service TEXT,
-                    asset_component TEXT,
-                    resource_id TEXT,
-                    resource JSONB,
-                    compliance_status TEXT,
-                    compliance_related_requirements TEXT[],
-                    workflow_status TEXT,
-                    record_state TEXT
-                )
-            """)
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Upserts a batch of findings in bulk through a staging table, see `PostgresqlBulkUpserter`. Every `batchSize`
+        findings are committed on their own
+        """
+        if not findings:
+            return True
+
+        processedFindings = self.processing_findings_for_upsert(findings)
+
+        try:
+            if self.upserter is None:
+                self.connect()
 
             print(f"Attempting to write {len(processedFindings)} findings to PostgreSQL.")
-            for f in processedFindings:
-                # The Finding ID is our primary key, on conflicts we will overwrite every single value for the specific ID except
-                # for ASFF FirstObservedAt (first_observed_at) and ASFF CreatedAt (created_at) every other value will be preserved
-                cursor.execute(f"""
-                    INSERT INTO {self.tableName} (id, product_arn, types, first_observed_at, created_at, updated_at, severity_label, title, description, remediation_recommendation_text, remediation_recommendation_url, product_name, provider, provider_type, provider_account_id, asset_region, asset_class, asset_service, asset_component, resource_id, resource, compliance_status, compliance_related_requirements, workflow_status, record_state)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE
-                        SET product_arn = excluded.product_arn,
-                            types = excluded.types,
-                            updated_at = excluded.updated_at,
-                            severity_label = excluded.severity_label,
-                            title = excluded.title,
-                            description = excluded.description,
-                            remediation_recommendation_text = excluded.remediation_recommendation_text,
-                            remediation_recommendation_url = excluded.remediation_recommendation_url,
-                            product_name = excluded.product_name,
-                            provider = excluded.provider,
-                            provider_type = excluded.provider_type,
-                            provider_account_id = excluded.provider_account_id,
-                            asset_region = excluded.asset_region,
-                            asset_class = excluded.asset_class,
-                            asset_service = excluded.asset_service,
-                            asset_component = excluded.asset_component,
-                            resource_id = excluded.resource_id,
-                            resource = excluded.resource,
-                            compliance_status = excluded.compliance_status,
-                            compliance_related_requirements = excluded.compliance_related_requirements,
-                            workflow_status = excluded.workflow_status,
-                            record_state = excluded.record_state,
-                            first_observed_at = CASE
-                                                    WHEN {self.tableName}.first_observed_at < excluded.first_observed_at THEN {self.tableName}.first_observed_at
-                                                    ELSE excluded.first_observed_at
-                                                END,
-                            created_at = CASE
-                                                WHEN {self.tableName}.created_at < excluded.created_at THEN {self.tableName}.created_at
-                                                ELSE excluded.created_at
-                                            END;
-                    """,
+            self.findingsWritten += self.upserter.upsert(
+                [
                     (
                         f["Id"],
                         f["ProductArn"],
@@ -220,24 +171,91 @@ class PostgresProvider(object):
                         f["ComplianceRelatedRequirements"],
                         f["WorkflowStatus"],
                         f["RecordState"]
-                    )
-                )
-
-            # commit the changes
-            engine.commit()
-            # close communication with the postgres server (rds)
-            cursor.close()
-            
-            print("Completed writing all findings to PostgreSQL.")
-
+                    ) for f in processedFindings
+                ]
+            )
         except psql.OperationalError as oe:
             print("Cannot connect to your PostgreSQL database. Review your network configuraions and database parameters and try again.")
             raise oe
         except Exception as e:
             raise e
-        
+
+        return True
+
+    def close(self, **kwargs):
+        if self.engine is None:
+            print("There are not any findings to write!")
+            return True
+
+        # close communication with the postgres server (rds)
+        self.cursor.close()
+        self.engine.close()
+
+        print(f"Completed writing {self.findingsWritten} findings to PostgreSQL.")
+
         return True
 
+    def connect(self):
+        """
+        Connects to PostgreSQL, creates the findings Table if it does not exist and prepares the bulk upserter
+        """
+        self.engine = psql.connect(
+            user=self.userName,
+            database=self.databaseName,
+            host=self.endpoint,
+            port=self.port,
+            password=self.password,
+        )
+
+        self.cursor = self.engine.cursor()
+
+        # Create a Table based on the provided Table name that contains a majority of the ASFF details
+        # Types and Compliance Requirements will be preserved as TEXT[] as they're just a list of strings
+        # The Resources block will be written as a JSONB (json bytes) but the "resource_id" will also be parsed
+        # All timestamps are already UTC ISO 8061 - TIMESTAMP WITH TIME ZONE (TIMESTAMPTZ) will preserve this
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.tableName} (
+                id TEXT PRIMARY KEY,
+                product_arn TEXT,
+                types TEXT[],
+                first_observed_at TIMESTAMP WITH TIME ZONE,
+                created_at TIMESTAMP WITH TIME ZONE,
+                updated_at TIMESTAMP WITH TIME ZONE,
+                severity_label TEXT,
+                title TEXT,
+                description TEXT,
+                remediation_recommendation_text TEXT,
+                remediation_recommendation_url TEXT,
+                product_name TEXT,
+                provider TEXT,
+                provider_type TEXT,
+                provider_account_id TEXT,
+                asset_region TEXT,
+                asset_class TEXT,
+                asset_service TEXT,
+                asset_component TEXT,
+                resource_id TEXT,
+                resource JSONB,
+                compliance_status TEXT,
+                compliance_related_requirements TEXT[],
+                workflow_status TEXT,
+                record_state TEXT
+            )
+        """)
+        self.engine.commit()
+
+        # The Finding ID is our primary key, on conflicts we will overwrite every single value for the specific ID except
+        # for ASFF FirstObservedAt (first_observed_at) and ASFF CreatedAt (created_at) which keep the earliest value
+        self.upserter = PostgresqlBulkUpserter(
+            self.engine,
+            self.cursor,
+            self.tableName,
+            POSTGRESQL_COLUMNS,
+            conflictColumn="id",
+            earliestColumns=["first_observed_at", "created_at"],
+            batchSize=self.batchSize
+        )
+
     def get_credential_from_aws_ssm(self, value, configurationName):
         """
         Retrieves a TOML variable from AWS Systems Manager Parameter Store and returns it
@@ -292,20 +310,7 @@ class PostgresProvider(object):
         processedFindings = []
 
         for finding in findings:
-            complianceRelatedRequirements = finding["Compliance"]["RelatedRequirements"]
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
+            complianceRelatedRequirements = complianceCrosswalk.expand_requirements(finding["Compliance"]["RelatedRequirements"])
 
             try:
                 processedFindings.append(
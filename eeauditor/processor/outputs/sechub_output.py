@@ -18,35 +18,112 @@
 #specific language governing permissions and limitations
 #under the License.
 
+import json
 import boto3
+from botocore.config import Config
 from processor.outputs.output_base import ElectricEyeOutput
+from processor.aws_batch_sender import AwsBatchSender
+
+# BatchImportFindings accepts up to 100 findings and 6 MB per request, with each finding being no larger than 240 KB
+SECURITYHUB_MAX_BATCH_FINDINGS = 100
+SECURITYHUB_MAX_BATCH_BYTES = 6000000
+SECURITYHUB_MAX_FINDING_BYTES = 240000
+# BatchImportFindings is limited to 10 TPS (burst of 30), a few workers keep it busy without spending retries on throttling
+SECURITYHUB_MAX_WORKERS = 3
+# FailedFindings with these error codes will fail the same way every time they are sent
+SECURITYHUB_PERMANENT_ERROR_CODES = ["InvalidInput", "AccessDenied", "AccessDeniedException", "InvalidAccessException"]
+# Security Hub's upper-limit for top-level strings (e.g., Description) is 1024 characters
+SECURITYHUB_MAX_STRING_LENGTH = 1018
 
 @ElectricEyeOutput
 class SecHubProvider(object):
     __provider__ = "sechub"
 
+    def __init__(self):
+        self.sechub = None
+        self.findingsWritten = 0
+        self.sender = AwsBatchSender(
+            self.batch_import_findings_to_sechub,
+            maxEntries=SECURITYHUB_MAX_BATCH_FINDINGS,
+            maxBytes=SECURITYHUB_MAX_BATCH_BYTES,
+            maxEntryBytes=SECURITYHUB_MAX_FINDING_BYTES,
+            maxWorkers=SECURITYHUB_MAX_WORKERS,
+            serviceName="AWS Security Hub"
+        )
+
     def write_findings(self, findings: list, **kwargs):
         print(f"Writing {len(findings)} results to AWS Security Hub")
-        if findings:
-            sechub = boto3.client("securityhub")
-
-            # Use a list comprehension to flatten the Description if the length exceeds Security Hub's upper-limit of 1024
-            maxDescriptionLength = 1018
-            modifiedDescriptionFindings = [
-                {k: (v[:maxDescriptionLength] + '...' if isinstance(v, str) and len(v) > maxDescriptionLength else v) for k, v in d.items()} for d in findings
-            ]
-            # Use another list comprehension to remove `ProductFields.AssetDetails` from non-Asset reporting outputs
-            newFindings = [
-                {**d, "ProductFields": {k: v for k, v in d["ProductFields"].items() if k != "AssetDetails"}} for d in modifiedDescriptionFindings
-            ]
-
-            del findings
-            del modifiedDescriptionFindings
-
-            # Security Hub supports batches of up to 100 findings for the "BIF" API
-            for i in range(0, len(newFindings), 100):
-                sechub.batch_import_findings(
-                    Findings=newFindings[i : i + 100]
-                )
+        self.write_batch(findings)
         
-        return True
\ No newline at end of file
+        return self.close()
+
+    def write_batch(self, findings: list, **kwargs):
+        """
+        Queues up a batch of findings to be imported into Security Hub, findings are trimmed one at a time as they are
+        packed into requests the API accepts
+        """
+        if not findings:
+            return True
+
+        if self.sechub is None:
+            # Adaptive retries rate limit every worker sharing the client once Security Hub starts throttling
+            self.sechub = boto3.client(
+                "securityhub",
+                config=Config(
+                    retries={"mode": "adaptive", "max_attempts": 10},
+                    max_pool_connections=SECURITYHUB_MAX_WORKERS
+                )
+            )
+
+        self.sender.send(self.create_sechub_finding(finding) for finding in findings)
+        self.findingsWritten += len(findings)
+
+        return True
+
+    def close(self, **kwargs):
+        delivered, failed = self.sender.close()
+
+        print(f"Wrote {delivered} of {self.findingsWritten} results to AWS Security Hub, {failed} failed")
+
+        return failed == 0
+
+    def create_sechub_finding(self, finding: dict):
+        """
+        Returns a tuple of a finding with its long top-level strings (e.g., Description) truncated and without
+        `ProductFields.AssetDetails`, which is meant for Asset reporting outputs, and its size in the request
+        """
+        sechubFinding = {
+            k: (v[:SECURITYHUB_MAX_STRING_LENGTH] + "..." if isinstance(v, str) and len(v) > SECURITYHUB_MAX_STRING_LENGTH else v)
+            for k, v in finding.items()
+        }
+        sechubFinding["ProductFields"] = {k: v for k, v in finding["ProductFields"].items() if k != "AssetDetails"}
+
+        return sechubFinding, len(json.dumps(sechubFinding, separators=(",", ":"), default=str).encode("utf-8"))
+
+    def batch_import_findings_to_sechub(self, batch: list):
+        """
+        Imports a batch of findings with a single BatchImportFindings call and returns a tuple of the FailedFindings to
+        retry and the ones which will never be accepted
+        """
+        response = self.sechub.batch_import_findings(Findings=batch)
+
+        if response.get("FailedCount", 0) == 0:
+            return [], []
+
+        findingsById = {}
+        for finding in batch:
+            findingsById.setdefault(finding["Id"], []).append(finding)
+
+        retryFindings = []
+        failedFindings = []
+        for failure in response.get("FailedFindings", []):
+            failed = findingsById.get(failure["Id"], [])
+            if failure.get("ErrorCode") in SECURITYHUB_PERMANENT_ERROR_CODES:
+                print(f"AWS Security Hub rejected finding {failure['Id']} due to: {failure.get('ErrorCode')} - {failure.get('ErrorMessage')}")
+                failedFindings.extend(failed)
+            else:
+                retryFindings.extend(failed)
+            # Duplicate Ids within a batch are each reported, only pick up every finding once
+            findingsById.pop(failure["Id"], None)
+
+        return retryFindings, failedFindings
@@ -38,8 +38,6 @@ asm = boto3.client("secretsmanager")
 CREDENTIALS_LOCATION_CHOICES = ["AWS_SSM", "AWS_SECRETS_MANAGER", "CONFIG_FILE"]
 
 here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
 
 @ElectricEyeOutput
 class SlackProvider(object):
@@ -406,20 +404,6 @@ class SlackProvider(object):
             #severity = finding["Severity"]["Label"]
             #findingState = finding["RecordState"]
             relatedControls = ""
-            complianceRelatedRequirements = list(finding["Compliance"]["RelatedRequirements"])
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if str(control).startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
             
             for control in finding["Compliance"]["RelatedRequirements"]:
                 relatedControls += f"`{control}` \n "
@@ -537,16 +521,4 @@ class SlackProvider(object):
 
         return aBlockyListOfSlackBlocks
 
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
-
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
-
 ## EOF
\ No newline at end of file
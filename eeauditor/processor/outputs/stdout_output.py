@@ -18,89 +18,78 @@
 #specific language governing permissions and limitations
 #under the License.
 
-from os import path
-from processor.outputs.output_base import ElectricEyeOutput
-import base64
+import tomli
+import os
+import sys
 import json
-
-here = path.abspath(path.dirname(__file__))
-with open(f"{here}/mapped_compliance_controls.json") as jsonfile:
-    CONTROLS_CROSSWALK = json.load(jsonfile)
+from processor.outputs.output_base import ElectricEyeOutput
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import get_decoded_findings
 
 @ElectricEyeOutput
 class StdoutProvider(object):
     __provider__ = "stdout"
 
-    def write_findings(self, findings: list, output_file: str, **kwargs):
-        checkedIds = []
+    def __init__(self):
+        if os.environ["TOML_FILE_PATH"] == "None":
+            # Get the absolute path of the current directory
+            currentDir = os.path.abspath(os.path.dirname(__file__))
+            # Go two directories back to /eeauditor/
+            twoBack = os.path.abspath(os.path.join(currentDir, "../../"))
+            # TOML is located in /eeauditor/ directory
+            tomlFile = f"{twoBack}/external_providers.toml"
+        else:
+            tomlFile = os.environ["TOML_FILE_PATH"]
 
-        """
-        noDetails = [
-            {**d, "ProductFields": {k: v for k, v in d["ProductFields"].items() if k != "AssetDetails"}} for d in findings
-        ]
-        del findings
+        with open(tomlFile, "rb") as f:
+            data = tomli.load(f)
 
-        for finding in noDetails:
-        """
+        # Variable for the entire [outputs.stdout] section, every setting is optional
+        stdoutDetails = data.get("outputs", {}).get("stdout", {})
+
+        includeAssetDetails = stdoutDetails.get("stdout_include_asset_details", True)
+
+        if not isinstance(includeAssetDetails, bool):
+            print("The value for '[outputs.stdout.stdout_include_asset_details]' must be a boolean. Review the TOML file and try again!")
+            sys.exit(2)
+
+        self.includeAssetDetails = includeAssetDetails
+        # Finding IDs already printed, this is used to ignore duplicate Finding IDs across every batch
+        self.checkedIds = set()
+
+    def write_findings(self, findings: list, output_file: str, **kwargs):
+        self.write_batch(findings, **kwargs)
 
+        return self.close(**kwargs)
+
+    def write_batch(self, findings: list, **kwargs):
         """
-        This list comprhension will base64 decode and convert a string to JSON for all instances of `ProductFields.AssetDetails`
-        except where it is a None type (this is done for placeholders in Checks where the Asset doesn't exist) and it will also
-        skip over areas in the event that `ProductFields` is missing any Cloud Asset Management required fields
+        Prints every finding of a batch with an ID which has not been printed yet, one compact JSON document per line.
+        When AssetDetails are not included they are dropped without ever being decoded
         """
-        decodedFindings = [
-            {**d, "ProductFields": {**d["ProductFields"],
-                "AssetDetails": json.loads(base64.b64decode(d["ProductFields"]["AssetDetails"]).decode("utf-8"))
-                    if d["ProductFields"]["AssetDetails"] is not None
-                    else None
-            }} if "AssetDetails" in d["ProductFields"]
-            else d
-            for d in findings
-        ]
-
-        del findings
-
-        # Map in the new compliance controls
-        for finding in decodedFindings:
-            complianceRelatedRequirements = finding["Compliance"]["RelatedRequirements"]
-            newControls = []
-            nistCsfControls = [control for control in complianceRelatedRequirements if control.startswith("NIST CSF V1.1")]
-            for control in nistCsfControls:
-                crosswalkedControls = self.nist_csf_v_1_1_controls_crosswalk(control)
-                # Not every single NIST CSF Control maps across to other frameworks
-                if crosswalkedControls:
-                    for crosswalk in crosswalkedControls:
-                        if crosswalk not in newControls:
-                            newControls.append(crosswalk)
-                else:
-                    continue
-
-            complianceRelatedRequirements.extend(newControls)
-            
-            del finding["Compliance"]["RelatedRequirements"]
-            finding["Compliance"]["RelatedRequirements"] = complianceRelatedRequirements
-
-            parsedFinding = json.loads(json.dumps(finding, default=str))
-            # This is used to ignore duplicate Finding IDs
-            if parsedFinding["Id"] not in checkedIds:
-                checkedIds.append(parsedFinding["Id"])
-                print(json.dumps(finding))
-            else:
-                del parsedFinding
+        if self.includeAssetDetails:
+            findings = get_decoded_findings(findings, kwargs.get("decodedFindings"))
+
+        lines = []
+        for finding in findings:
+            if finding["Id"] in self.checkedIds:
                 continue
-    
-        del checkedIds
-        
+            self.checkedIds.add(finding["Id"])
+
+            if not self.includeAssetDetails and "AssetDetails" in finding["ProductFields"]:
+                finding = {**finding, "ProductFields": {
+                    k: v for k, v in finding["ProductFields"].items() if k != "AssetDetails"
+                }}
+
+            # Map in the new compliance controls
+            lines.append(json.dumps(complianceCrosswalk.expand_finding(finding), default=str))
+
+        if lines:
+            print("\n".join(lines))
+
         return True
-    
-    def nist_csf_v_1_1_controls_crosswalk(self, nistCsfSubcategory):
-        """
-        This function returns a list of additional control framework control IDs that mapped into a provided
-        NIST CSF V1.1 Subcategory (control)
-        """
 
-        # Not every single NIST CSF Control maps across to other frameworks
-        try:
-            return CONTROLS_CROSSWALK[nistCsfSubcategory]
-        except KeyError:
-            return []
\ No newline at end of file
+    def close(self, **kwargs):
+        self.checkedIds = set()
+
+        return True
@@ -0,0 +1,117 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from psycopg2.extras import execute_values
+
+# Findings are merged from the staging table and committed this many at a time unless the TOML overrides it
+DEFAULT_POSTGRESQL_BATCH_SIZE = 5000
+
+class PostgresqlBulkUpserter(object):
+    """
+    Upserts rows in bulk: every batch is loaded into a temporary staging table with execute_values() and merged into the
+    target table with a single INSERT ... SELECT ... ON CONFLICT statement, then committed. Rows repeating a key within a
+    batch are collapsed so the last one wins, and the `earliestColumns` (e.g., first_observed_at) always keep the
+    earliest value across the batch and the existing row - the same result as upserting every row one at a time
+    """
+
+    def __init__(self, engine, cursor, tableName: str, columns: list[str], conflictColumn: str, earliestColumns: list[str], batchSize: int = DEFAULT_POSTGRESQL_BATCH_SIZE):
+        self.engine = engine
+        self.cursor = cursor
+        self.tableName = tableName
+        self.stagingTableName = f"{tableName}_staging"
+        self.columns = columns
+        self.conflictColumn = conflictColumn
+        self.earliestColumns = earliestColumns
+        self.batchSize = batchSize
+        self.stagingTableCreated = False
+
+    def create_staging_table(self):
+        """
+        Creates the (per connection) temporary staging table with the same columns as the target table, plus a sequence
+        to tell which of the rows sharing a key came last. Rows are dropped from it on every commit
+        """
+        self.cursor.execute(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {self.stagingTableName} (LIKE {self.tableName}) ON COMMIT DELETE ROWS
+        """)
+        self.cursor.execute(f"""
+            ALTER TABLE {self.stagingTableName} ADD COLUMN IF NOT EXISTS electriceye_staging_seq BIGSERIAL
+        """)
+        self.stagingTableCreated = True
+
+    def merge_statement(self) -> str:
+        """
+        Returns the INSERT ... SELECT ... ON CONFLICT statement which merges the staging table into the target table
+        """
+        selectColumns = []
+        updateColumns = []
+        for column in self.columns:
+            if column in self.earliestColumns:
+                selectColumns.append(f"MIN({column}) OVER (PARTITION BY {self.conflictColumn}) AS {column}")
+                updateColumns.append(
+                    f"""{column} = CASE
+                                        WHEN {self.tableName}.{column} < excluded.{column} THEN {self.tableName}.{column}
+                                        ELSE excluded.{column}
+                                    END"""
+                )
+            else:
+                selectColumns.append(column)
+                if column != self.conflictColumn:
+                    updateColumns.append(f"{column} = excluded.{column}")
+
+        columnList = ", ".join(self.columns)
+        selectList = ", ".join(selectColumns)
+        updateList = ",\n                ".join(updateColumns)
+
+        return f"""
+            INSERT INTO {self.tableName} ({columnList})
+            SELECT DISTINCT ON ({self.conflictColumn}) {selectList}
+            FROM {self.stagingTableName}
+            ORDER BY {self.conflictColumn}, electriceye_staging_seq DESC
+            ON CONFLICT ({self.conflictColumn}) DO UPDATE
+                SET {updateList}
+        """
+
+    def upsert(self, rows: list[tuple]) -> int:
+        """
+        Upserts rows (tuples in the same order as `columns`), committing every `batchSize` rows. Returns the number of
+        rows written to the target table
+        """
+        if not self.stagingTableCreated:
+            self.create_staging_table()
+
+        mergeStatement = self.merge_statement()
+        columnList = ", ".join(self.columns)
+        written = 0
+
+        for i in range(0, len(rows), self.batchSize):
+            batch = rows[i:i + self.batchSize]
+            execute_values(
+                self.cursor,
+                f"INSERT INTO {self.stagingTableName} ({columnList}) VALUES %s",
+                batch,
+                page_size=len(batch)
+            )
+            self.cursor.execute(mergeStatement)
+            written += self.cursor.rowcount
+            # committing also empties the staging table
+            self.engine.commit()
+
+        return written
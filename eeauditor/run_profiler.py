@@ -0,0 +1,179 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import csv
+import json
+import logging
+import threading
+from time import perf_counter
+
+logger = logging.getLogger("RunProfiler")
+
+# Columns written to the run report for every Check, the JSON report also rolls these up per Auditor, Account & Region
+RUN_REPORT_COLUMNS = ["Provider", "Auditor", "Check", "Account", "Region", "Seconds", "Findings", "ApiCalls", "Failures"]
+# Counters which are summed when rolling up the run report
+RUN_REPORT_COUNTERS = ["Seconds", "Findings", "ApiCalls", "Failures"]
+
+class RunProfiler(object):
+    """
+    Records wall time, findings emitted, failures and provider SDK (botocore) API calls for every Check that runs. API calls
+    are counted through botocore event hooks and attributed to the Check running on the calling thread, anything called
+    outside of a Check (e.g., Support or Shield eligibility lookups) is attributed to the "ElectricEye" Auditor
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    @staticmethod
+    def get_auditor_name(check) -> str:
+        """
+        Returns the name of the Auditor (plugin module) a Check was loaded from
+        """
+        return check.__module__.rsplit(".", 1)[-1]
+
+    def get_stats(self, provider: str, auditor: str, checkName: str, account: str, region: str) -> dict:
+        key = (provider, auditor, checkName, account, region)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {
+                    "Provider": provider,
+                    "Auditor": auditor,
+                    "Check": checkName,
+                    "Account": account,
+                    "Region": region,
+                    "Seconds": 0.0,
+                    "Findings": 0,
+                    "ApiCalls": 0,
+                    "Failures": 0
+                }
+                self._stats[key] = stats
+
+        return stats
+
+    def instrument(self, findings, provider: str, check, checkName: str, account: str, region: str):
+        """
+        Wraps the generator returned by a Check and yields its findings. Only the time spent inside of the Check is
+        measured, not the time the Outputs spend on the findings in between
+        """
+        stats = self.get_stats(provider, self.get_auditor_name(check), checkName, account, region)
+        findings = iter(findings)
+
+        while True:
+            previous = getattr(self._current, "stats", None)
+            self._current.stats = stats
+            start = perf_counter()
+            try:
+                finding = next(findings)
+            except StopIteration:
+                return
+            except Exception:
+                stats["Failures"] += 1
+                raise
+            finally:
+                stats["Seconds"] += perf_counter() - start
+                self._current.stats = previous
+
+            if finding is not None:
+                stats["Findings"] += 1
+            yield finding
+
+    def count_api_call(self, **kwargs):
+        """
+        botocore "before-parameter-build" event handler, this is emitted once per API call (not per retry attempt)
+        """
+        stats = getattr(self._current, "stats", None)
+        if stats is not None:
+            stats["ApiCalls"] += 1
+            return
+
+        stats = self.get_stats("AWS", "ElectricEye", "None", "", "")
+        with self._lock:
+            stats["ApiCalls"] += 1
+
+    def register_session(self, session):
+        """
+        Counts every API call made by clients created from a boto3 Session, this must be called before any clients
+        are created from the Session as clients copy the event hooks of their Session
+        """
+        session.events.register("before-parameter-build", self.count_api_call)
+
+    def get_check_rows(self) -> list[dict]:
+        """
+        Returns the stats of every Check, slowest first
+        """
+        with self._lock:
+            rows = [dict(stats) for stats in self._stats.values()]
+
+        for row in rows:
+            row["Seconds"] = round(row["Seconds"], 4)
+
+        return sorted(rows, key=lambda row: row["Seconds"], reverse=True)
+
+    @staticmethod
+    def roll_up(rows: list[dict], groupBy: list[str]) -> list[dict]:
+        """
+        Sums the counters of the Check stats by the given columns, slowest first
+        """
+        groups = {}
+        for row in rows:
+            key = tuple(row[column] for column in groupBy)
+            group = groups.get(key)
+            if group is None:
+                group = {column: row[column] for column in groupBy}
+                group.update({counter: 0 for counter in RUN_REPORT_COUNTERS})
+                group["Checks"] = 0
+                groups[key] = group
+            for counter in RUN_REPORT_COUNTERS:
+                group[counter] += row[counter]
+            group["Checks"] += 1
+
+        for group in groups.values():
+            group["Seconds"] = round(group["Seconds"], 4)
+
+        return sorted(groups.values(), key=lambda group: group["Seconds"], reverse=True)
+
+    def write_report(self, reportFile: str):
+        """
+        Writes the run report, files ending in .csv receive one row per Check, any other file receives a JSON document
+        with the per-Check stats and their roll ups per Auditor, Account and Region
+        """
+        rows = self.get_check_rows()
+
+        if reportFile.lower().endswith(".csv"):
+            with open(reportFile, "w", newline="") as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=RUN_REPORT_COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            report = {
+                "Totals": self.roll_up(rows, ["Provider"]),
+                "Auditors": self.roll_up(rows, ["Provider", "Auditor"]),
+                "Accounts": self.roll_up(rows, ["Provider", "Account"]),
+                "Regions": self.roll_up(rows, ["Provider", "Region"]),
+                "Checks": rows
+            }
+            with open(reportFile, "w") as jsonfile:
+                json.dump(report, jsonfile, indent=2)
+
+        logger.info("Wrote run report for %s Checks to %s", len(rows), reportFile)
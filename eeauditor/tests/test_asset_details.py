@@ -0,0 +1,49 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import json
+
+from . import context
+from asset_details import ASSET_DETAILS_CACHE_KEY, encode_asset_details
+from check_executor import SingleFlightCache
+
+
+def test_assets_are_encoded_once_per_run():
+    cache = {}
+    secgroup = {"GroupId": "sg-123", "IpPermissions": [{"IpProtocol": "-1"}]}
+
+    assetB64 = encode_asset_details(cache, secgroup, "arn:aws:ec2:us-east-1:111122223333:security-group/sg-123")
+
+    assert assetB64 == base64.b64encode(json.dumps(secgroup, default=str).encode("utf-8"))
+    assert encode_asset_details(cache, secgroup, "arn:aws:ec2:us-east-1:111122223333:security-group/sg-123") is assetB64
+    assert cache[ASSET_DETAILS_CACHE_KEY].hits == 1
+
+    # a re-fetched Asset under the same ARN is encoded again
+    refetched = {**secgroup, "IpPermissions": []}
+    assert json.loads(base64.b64decode(encode_asset_details(cache, refetched, "arn:aws:ec2:us-east-1:111122223333:security-group/sg-123"))) == refetched
+
+
+def test_single_flight_cache_is_not_held():
+    cache = SingleFlightCache()
+    instance = {"InstanceId": "i-123"}
+
+    assert encode_asset_details(cache, instance) is encode_asset_details(cache, instance)
+    assert cache.held_keys() == set()
@@ -0,0 +1,189 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import json
+
+import boto3
+from botocore.stub import Stubber
+
+from . import context
+from processor.aws_batch_sender import AwsBatchSender, pack_batches
+from processor.outputs.amazon_sqs_output import AmazonSqsProvider
+from processor.outputs.ocsf_to_firehose_output import OcsfFirehoseOutput
+from processor.outputs.sechub_output import SecHubProvider
+
+
+def test_pack_batches_respects_count_and_size():
+    entries = [(index, size) for index, size in enumerate([40, 40, 40, 90, 10, 10, 10])]
+    assert list(pack_batches(entries, maxEntries=3, maxBytes=100)) == [[0, 1], [2], [3, 4], [5, 6]]
+
+
+def test_sender_retries_only_failed_entries():
+    calls = []
+
+    def send_batch(batch):
+        calls.append(list(batch))
+        # the first call fails "b" with a retryable error and "c" permanently
+        if len(calls) == 1:
+            return ["b"], ["c"]
+        return [], []
+
+    sender = AwsBatchSender(send_batch, maxEntries=10, maxBytes=100, maxWorkers=2, baseDelay=0)
+    sender.send([("a", 1), ("b", 1), ("c", 1), ("oversized", 101)])
+
+    assert sender.close() == (2, 2)
+    assert calls == [["a", "b", "c"], ["b"]]
+    assert sender.calls == 2
+
+
+def test_sender_gives_up_after_max_attempts():
+    sender = AwsBatchSender(lambda batch: (batch, []), maxEntries=10, maxBytes=100, maxAttempts=3, baseDelay=0)
+    sender.send([("a", 1)])
+
+    assert sender.close() == (0, 1)
+    assert sender.calls == 3
+
+
+def test_sqs_output_sends_message_batches(tmp_path, monkeypatch):
+    tomlFile = tmp_path / "external_providers.toml"
+    tomlFile.write_text(
+        '[outputs.amazon_sqs]\n'
+        'amazon_sqs_queue_url = "https://sqs.us-east-1.amazonaws.com/111111111111/electriceye"\n'
+        'amazon_sqs_batch_size = 1000\n'
+        'amazon_sqs_queue_region = "us-east-1"\n'
+        'amazon_sqs_max_workers = 1\n'
+    )
+    monkeypatch.setenv("TOML_FILE_PATH", str(tomlFile))
+
+    provider = AmazonSqsProvider()
+    assert provider.queueBatchSize == 10
+    provider.sender.baseDelay = 0
+
+    findings = [{"Id": str(index), "ProductFields": {"AssetDetails": None}} for index in range(12)]
+    bodies = [json.dumps(finding) for finding in findings]
+
+    with Stubber(provider.sqs) as stubber:
+        stubber.add_response(
+            "send_message_batch",
+            {"Successful": [], "Failed": [{"Id": "3", "SenderFault": False, "Code": "InternalError"}]},
+            {
+                "QueueUrl": provider.queueUrl,
+                "Entries": [{"Id": str(index), "MessageBody": body, "DelaySeconds": 1} for index, body in enumerate(bodies[:10])]
+            }
+        )
+        # with a single worker the failed message is retried before the next batch goes out
+        stubber.add_response(
+            "send_message_batch",
+            {"Successful": [], "Failed": []},
+            {"QueueUrl": provider.queueUrl, "Entries": [{"Id": "0", "MessageBody": bodies[3], "DelaySeconds": 1}]}
+        )
+        stubber.add_response(
+            "send_message_batch",
+            {"Successful": [], "Failed": []},
+            {
+                "QueueUrl": provider.queueUrl,
+                "Entries": [{"Id": str(index), "MessageBody": body, "DelaySeconds": 1} for index, body in enumerate(bodies[10:])]
+            }
+        )
+        assert provider.write_findings(findings)
+        stubber.assert_no_pending_responses()
+
+
+def test_firehose_output_retries_failed_request_responses(tmp_path, monkeypatch):
+    tomlFile = tmp_path / "external_providers.toml"
+    tomlFile.write_text(
+        '[outputs.firehose]\n'
+        'kinesis_firehose_delivery_stream_name = "electriceye"\n'
+        'kinesis_firehose_region = "us-east-1"\n'
+        'kinesis_firehose_max_workers = 1\n'
+        'kinesis_firehose_newline_delimited = true\n'
+    )
+    monkeypatch.setenv("TOML_FILE_PATH", str(tomlFile))
+
+    provider = OcsfFirehoseOutput()
+    provider.sender.baseDelay = 0
+    records = [provider.encode_record({"finding_info": {"uid": str(index)}}) for index in range(3)]
+    assert records[0] == ({"Data": b'{"finding_info": {"uid": "0"}}\n'}, 31)
+
+    with Stubber(provider.firehose) as stubber:
+        stubber.add_response(
+            "put_record_batch",
+            {
+                "FailedPutCount": 1,
+                "RequestResponses": [{"RecordId": "a"}, {"ErrorCode": "ServiceUnavailableException"}, {"RecordId": "c"}]
+            },
+            {"DeliveryStreamName": "electriceye", "Records": [record for record, _ in records]}
+        )
+        stubber.add_response(
+            "put_record_batch",
+            {"FailedPutCount": 0, "RequestResponses": [{"RecordId": "b"}]},
+            {"DeliveryStreamName": "electriceye", "Records": [records[1][0]]}
+        )
+        provider.sender.send(records)
+        assert provider.sender.close() == (3, 0)
+        stubber.assert_no_pending_responses()
+
+
+def test_sechub_output_retries_failed_findings():
+    provider = SecHubProvider()
+    provider.sender.baseDelay = 0
+    provider.write_batch([])
+    asff = {
+        "SchemaVersion": "2018-10-08",
+        "ProductArn": "arn:aws:securityhub:us-east-1:111111111111:product/111111111111/default",
+        "GeneratorId": "test",
+        "AwsAccountId": "111111111111",
+        "CreatedAt": "2024-01-01T00:00:00Z",
+        "UpdatedAt": "2024-01-01T00:00:00Z",
+        "Title": "test",
+        "Resources": [{"Type": "AwsEc2Instance", "Id": "i-1"}]
+    }
+    findings = [
+        {**asff, "Id": "ok", "Description": "a" * 2000, "ProductFields": {"Provider": "AWS", "AssetDetails": "e30="}},
+        {**asff, "Id": "retry", "Description": "b", "ProductFields": {"Provider": "AWS"}},
+        {**asff, "Id": "invalid", "Description": "c", "ProductFields": {"Provider": "AWS"}}
+    ]
+    expected = [provider.create_sechub_finding(finding)[0] for finding in findings]
+    assert expected[0]["Description"] == "a" * 1018 + "..."
+    assert expected[0]["ProductFields"] == {"Provider": "AWS"}
+
+    provider.sechub = boto3.client("securityhub", region_name="us-east-1")
+    with Stubber(provider.sechub) as stubber:
+        stubber.add_response(
+            "batch_import_findings",
+            {
+                "FailedCount": 2,
+                "SuccessCount": 1,
+                "FailedFindings": [
+                    {"Id": "retry", "ErrorCode": "LimitExceeded", "ErrorMessage": "slow down"},
+                    {"Id": "invalid", "ErrorCode": "InvalidInput", "ErrorMessage": "nope"}
+                ]
+            },
+            {"Findings": expected}
+        )
+        stubber.add_response(
+            "batch_import_findings",
+            {"FailedCount": 0, "SuccessCount": 1, "FailedFindings": []},
+            {"Findings": [expected[1]]}
+        )
+        provider.write_batch(findings)
+        assert provider.close() is False
+        assert (provider.sender.delivered, provider.sender.failed) == (2, 1)
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,73 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import os
+
+from . import context
+from aws_endpoints import AwsEndpointIndex
+
+endpoint_data = {
+    "partitions": [
+        {
+            "partition": "aws",
+            "services": {
+                "ec2": {"endpoints": {"us-east-1": {}, "us-east-2": {}}},
+                "iam": {"endpoints": {"aws-global": {}}},
+                "api.ecr": {"endpoints": {"us-east-1": {}, "eu-west-1": {}}},
+                "elasticloadbalancing": {"endpoints": {"us-east-2": {}}},
+            },
+        },
+        {
+            "partition": "aws-us-gov",
+            "services": {
+                "ec2": {"endpoints": {"us-gov-west-1": {}}},
+            },
+        },
+    ]
+}
+
+
+def test_endpoint_index_availability():
+    index = AwsEndpointIndex.from_endpoint_data(endpoint_data)
+    assert index.is_service_available("aws", "ec2", "us-east-1") is True
+    assert index.is_service_available("aws", "ec2", "eu-west-1") is False
+    assert index.is_service_available("aws-us-gov", "ec2", "us-gov-west-1") is True
+    # "api." prefixed endpoints are normalized
+    assert index.is_service_available("aws", "ecr", "eu-west-1") is True
+    # global services are available in every region
+    assert index.is_service_available("aws", "iam", "ap-south-1") is True
+    # plugin name overrides
+    assert index.is_service_available("aws", "globalaccelerator", "ap-south-1") is True
+    assert index.is_service_available("aws", "imagebuilder", "us-east-2") is True
+    assert index.is_service_available("aws", "elasticloadbalancingv2", "us-east-2") is True
+    assert index.is_service_available("aws", "fis", "us-east-1") is True
+    assert index.is_service_available("aws", "fis", "ap-southeast-3") is False
+    # unknown services and partitions
+    assert index.is_service_available("aws", "notaservice", "us-east-1") is False
+    assert index.is_service_available("aws-cn", "ec2", "cn-north-1") is False
+
+
+def test_endpoint_index_cache_round_trip(tmp_path):
+    index = AwsEndpointIndex.load(cacheDir=str(tmp_path))
+    cacheFiles = os.listdir(tmp_path)
+    assert len(cacheFiles) == 1
+    cached = AwsEndpointIndex.load(cacheDir=str(tmp_path))
+    assert cached.index == index.index
+    assert cached.is_service_available("aws", "ec2", "us-east-1") is True
@@ -0,0 +1,75 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from concurrent.futures import ThreadPoolExecutor
+
+from . import context
+import aws_inventory
+from check_executor import SingleFlightCache
+
+
+class FakePaginator(object):
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self, **kwargs):
+        return iter(self.pages)
+
+
+class FakeClient(object):
+    def __init__(self, session):
+        self.session = session
+
+    def get_paginator(self, operation):
+        self.session.calls.append(operation)
+        if operation == "describe_instances":
+            return FakePaginator(
+                [{"Reservations": [{"Instances": [{"InstanceId": "i-1"}, {"InstanceId": "i-2"}]}]}]
+            )
+        return FakePaginator([{"InstanceInformationList": [{"InstanceId": "i-2", "PingStatus": "Online"}]}])
+
+
+class FakeSession(object):
+    def __init__(self):
+        self.inventory = SingleFlightCache()
+        self.calls = []
+
+    def client(self, service, **kwargs):
+        return FakeClient(self)
+
+
+def test_inventory_is_enumerated_once_per_session():
+    session = FakeSession()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: aws_inventory.describe_instances(session), range(16)))
+
+    assert session.calls == ["describe_instances"]
+    assert all(r is results[0] for r in results)
+    assert [i["InstanceId"] for i in results[0]] == ["i-1", "i-2"]
+
+
+def test_managed_instance_information():
+    session = FakeSession()
+
+    assert aws_inventory.get_managed_instance_information(session, "i-1") == []
+    assert aws_inventory.get_managed_instance_information(session, "i-2")[0]["PingStatus"] == "Online"
+    aws_inventory.get_managed_instance_information(session, "i-1")
+    assert session.calls == ["describe_instance_information"]
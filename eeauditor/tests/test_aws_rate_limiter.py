@@ -0,0 +1,52 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from . import context
+from aws_rate_limiter import AwsRateLimiter
+
+
+def needs_retry_kwargs(errorCode=None):
+    parsed = {"Error": {"Code": errorCode}} if errorCode else {}
+    return {
+        "response": (None, parsed),
+        "attempts": 1,
+        "operation": None,
+        "caught_exception": None,
+        "request_dict": {"context": {}}
+    }
+
+
+def test_limiter_is_shared_per_service():
+    limiter = AwsRateLimiter()
+
+    assert limiter.get_limiter("before-send.ec2.DescribeInstances") is limiter.get_limiter("needs-retry.ec2.DescribeVolumes")
+    assert limiter.get_limiter("before-send.ec2.DescribeInstances") is not limiter.get_limiter("before-send.iam.ListRoles")
+
+
+def test_throttling_enables_only_the_throttled_service():
+    limiter = AwsRateLimiter()
+
+    limiter.on_receiving_response("needs-retry.ec2.DescribeInstances", **needs_retry_kwargs())
+    assert limiter.get_limiter("before-send.ec2.DescribeInstances")._enabled is False
+
+    limiter.on_receiving_response("needs-retry.ec2.DescribeVolumes", **needs_retry_kwargs("RequestLimitExceeded"))
+    assert limiter.get_limiter("before-send.ec2.DescribeInstances")._enabled is True
+    assert limiter.get_limiter("before-send.iam.ListRoles")._enabled is False
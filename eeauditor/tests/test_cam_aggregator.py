@@ -0,0 +1,66 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import base64
+import json
+
+from . import context
+from processor.cam_aggregator import CamAccumulator
+
+
+def make_finding(assetId, severity, firstObserved, assetDetails=None):
+    return {
+        "Resources": [{"Id": assetId}],
+        "FirstObservedAt": firstObserved,
+        "Severity": {"Label": severity},
+        "ProductFields": {
+            "Provider": "AWS",
+            "ProviderAccountId": "111111111111",
+            "AssetClass": "Compute",
+            "AssetDetails": base64.b64encode(json.dumps(assetDetails).encode("utf-8")).decode("utf-8") if assetDetails else None
+        }
+    }
+
+
+def test_findings_are_grouped_per_asset_across_batches():
+    accumulator = CamAccumulator()
+    accumulator.add_findings(
+        [
+            make_finding("i-1", "LOW", "2024-01-02T00:00:00+00:00", {"InstanceId": "i-1"}),
+            make_finding("i-2", "CRITICAL", "2024-01-01T00:00:00+00:00")
+        ]
+    )
+    accumulator.add_findings(
+        [
+            make_finding("i-1", "HIGH", "2024-01-01T00:00:00+00:00", {"InstanceId": "ignored"}),
+            make_finding("i-1", "LOW", "2024-01-03T00:00:00+00:00")
+        ]
+    )
+
+    entries = accumulator.get_cam_entries()
+    assert [entry["AssetId"] for entry in entries] == ["i-1", "i-2"]
+    assert entries[0]["AssetDetails"] == {"InstanceId": "i-1"}
+    assert entries[0]["FirstObservedAt"] == "2024-01-01T00:00:00+00:00"
+    assert entries[0]["LowSeverityFindings"] == 2
+    assert entries[0]["HighSeverityFindings"] == 1
+    assert entries[1]["CriticalSeverityFindings"] == 1
+    assert entries[1]["AssetDetails"] is None
+    assert accumulator.findingsProcessed == 4
@@ -0,0 +1,124 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import threading
+import time
+from functools import partial
+
+from . import context
+from check_executor import SingleFlightCache, run_ordered
+
+
+def slow_unit(index, sleepFor):
+    time.sleep(sleepFor)
+    for n in range(3):
+        yield {"Id": f"unit-{index}-finding-{n}", "Thread": threading.current_thread().name}
+
+
+def test_run_ordered_serial_is_inline():
+    units = [partial(slow_unit, i, 0) for i in range(3)]
+    results = list(run_ordered(units, maxWorkers=1))
+    assert [r["Id"] for r in results] == [f"unit-{i}-finding-{n}" for i in range(3) for n in range(3)]
+    assert {r["Thread"] for r in results} == {threading.current_thread().name}
+
+
+def test_run_ordered_parallel_keeps_order():
+    # later units finish first, findings must still come back in submission order
+    units = [partial(slow_unit, i, 0.05 * (10 - i)) for i in range(10)]
+    results = list(run_ordered(units, maxWorkers=5))
+    assert [r["Id"] for r in results] == [f"unit-{i}-finding-{n}" for i in range(10) for n in range(3)]
+    assert all(r["Thread"].startswith("ElectricEye") for r in results)
+
+
+def test_single_flight_cache_fills_once():
+    cache = SingleFlightCache()
+    calls = []
+
+    def describe_things(cache):
+        response = cache.get("describe_things")
+        if response:
+            return response
+        calls.append(1)
+        time.sleep(0.1)
+        cache["describe_things"] = ["thing"]
+        return cache["describe_things"]
+
+    def check(index):
+        try:
+            yield {"Id": index, "Things": describe_things(cache)}
+        finally:
+            cache.release_held()
+
+    units = [partial(check, i) for i in range(8)]
+    results = list(run_ordered(units, maxWorkers=8))
+    assert [r["Id"] for r in results] == list(range(8))
+    assert all(r["Things"] == ["thing"] for r in results)
+    assert len(calls) == 1
+
+
+def test_single_flight_cache_releases_unfilled_keys():
+    cache = SingleFlightCache(lockTimeout=5)
+    assert cache.get("never_filled") is None
+    cache.release_held()
+
+    waited = []
+
+    def other_thread():
+        waited.append(cache.get("never_filled"))
+        cache["never_filled"] = "filled"
+
+    worker = threading.Thread(target=other_thread)
+    worker.start()
+    worker.join(timeout=5)
+    assert waited == [None]
+    assert cache.get("never_filled") == "filled"
+
+
+def test_single_flight_cache_nested_keys_in_opposite_orders():
+    cache = SingleFlightCache(lockTimeout=60)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def fill_nested(name, outerKey, innerKey):
+        assert cache.get(outerKey) is None
+        # both threads now hold their outer key and ask for the key the other thread holds
+        barrier.wait()
+        inner = cache.get(innerKey)
+        if inner is None:
+            inner = f"{innerKey}-from-{name}"
+            cache[innerKey] = inner
+        cache[outerKey] = f"{outerKey}-from-{name}"
+        results[name] = inner
+        cache.release_held()
+
+    workers = [
+        threading.Thread(target=fill_nested, args=("first", "key_a", "key_b")),
+        threading.Thread(target=fill_nested, args=("second", "key_b", "key_a"))
+    ]
+    startTime = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=10)
+
+    assert time.time() - startTime < 5
+    assert not any(worker.is_alive() for worker in workers)
+    assert set(results) == {"first", "second"}
+    assert cache["key_a"] and cache["key_b"]
@@ -0,0 +1,80 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import json
+
+from . import context
+from check_manifest import CheckManifest
+
+AUDITOR_SOURCE = '''
+from check_register import CheckRegister
+import nmap3
+
+registry = CheckRegister()
+
+def helper(cache, session):
+    return {}
+
+@registry.register_check("ec2")
+def first_check(cache, session, awsAccountId, awsRegion, awsPartition):
+    """[EC2.1] First Check"""
+    yield {}
+
+@registry.register_check("ec2")
+def second_check(cache, session, awsAccountId, awsRegion, awsPartition):
+    yield {}
+'''
+
+
+def test_manifest_is_parsed_without_importing(tmp_path):
+    auditors = tmp_path / "aws"
+    auditors.mkdir()
+    (auditors / "__init__.py").write_text("")
+    (auditors / "Amazon_EC2_Auditor.py").write_text(AUDITOR_SOURCE)
+
+    manifest = CheckManifest.load(str(auditors), cacheDir=str(tmp_path / "cache"))
+    checks = manifest.get_checks()
+
+    assert list(checks["ec2"]) == ["first_check", "second_check"]
+    assert checks["ec2"]["first_check"]["description"] == "[EC2.1] First Check"
+    assert checks["ec2"]["second_check"]["description"] is None
+    assert checks["ec2"]["first_check"]["provider"] == "aws"
+    assert manifest.find_auditors("second_check") == ["Amazon_EC2_Auditor"]
+    assert manifest.find_auditors("helper") == []
+
+
+def test_manifest_is_rebuilt_when_source_changes(tmp_path):
+    auditors = tmp_path / "aws"
+    auditors.mkdir()
+    auditorFile = auditors / "Amazon_EC2_Auditor.py"
+    auditorFile.write_text(AUDITOR_SOURCE)
+    cacheDir = tmp_path / "cache"
+
+    CheckManifest.load(str(auditors), cacheDir=str(cacheDir))
+    cached = json.loads((cacheDir / "check-manifest-aws.json").read_text())
+    assert len(cached["auditors"]["Amazon_EC2_Auditor"]["checks"]) == 2
+    assert cached["auditors"]["Amazon_EC2_Auditor"]["provider"] == "aws"
+
+    auditorFile.write_text(AUDITOR_SOURCE.replace('def second_check', 'def renamed_check'))
+    manifest = CheckManifest.load(str(auditors), cacheDir=str(cacheDir))
+
+    assert manifest.find_auditors("renamed_check") == ["Amazon_EC2_Auditor"]
+    assert manifest.find_auditors("second_check") == []
@@ -0,0 +1,93 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import datetime
+
+from botocore.config import Config
+
+from . import context
+from cloud_utils import AWS_CLIENT_MAX_POOL_CONNECTIONS, AwsCredentialBroker, AwsSession
+
+
+class FakeSts(object):
+    def __init__(self, lifetime):
+        self.lifetime = lifetime
+        self.calls = 0
+
+    def assume_role(self, RoleArn, RoleSessionName):
+        self.calls += 1
+        return {
+            "Credentials": {
+                "AccessKeyId": f"AKIA{self.calls}",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": datetime.datetime.now(datetime.timezone.utc) + self.lifetime
+            }
+        }
+
+
+def test_role_is_assumed_once_per_account():
+    broker = AwsCredentialBroker()
+    broker._sts = FakeSts(datetime.timedelta(hours=1))
+    roleArn = "arn:aws:iam::111111111111:role/ElectricEye"
+
+    sessions = [broker.create_session(roleArn, region) for region in ["us-east-1", "us-west-2", "eu-west-1"]]
+
+    assert broker._sts.calls == 1
+    assert [s.region_name for s in sessions] == ["us-east-1", "us-west-2", "eu-west-1"]
+    assert sessions[1].get_credentials().access_key == "AKIA1"
+
+
+def test_credentials_refresh_before_expiry():
+    broker = AwsCredentialBroker()
+    broker._sts = FakeSts(datetime.timedelta(minutes=1))
+    session = broker.create_session("arn:aws:iam::111111111111:role/ElectricEye", "us-east-1")
+
+    assert session.get_credentials().access_key == "AKIA2"
+    assert broker._sts.calls == 2
+
+
+def test_brokered_credentials_take_precedence_over_the_environment(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIAENVIRONMENT")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secret")
+    broker = AwsCredentialBroker()
+    broker._sts = FakeSts(datetime.timedelta(hours=1))
+    roleArn = "arn:aws:iam::111111111111:role/ElectricEye"
+
+    first = broker.create_session(roleArn, "us-east-1").get_credentials()
+    second = broker.create_session(roleArn, "us-west-2").get_credentials()
+
+    assert first is second
+    assert first is broker.get_credentials(roleArn)
+    assert first.access_key == "AKIA1"
+    assert first.method == "sts-assume-role"
+
+
+def test_clients_are_pooled_per_service_and_config():
+    session = AwsSession(region_name="us-east-1", aws_access_key_id="AKIA", aws_secret_access_key="secret")
+    adaptive = Config(retries={"max_attempts": 10, "mode": "adaptive"})
+
+    assert session.client("ec2") is session.client("ec2")
+    assert session.client("ec2") is not session.client("ec2", region_name="us-west-2")
+    assert session.client("ssm", config=adaptive) is session.client(
+        "ssm", config=Config(retries={"max_attempts": 10, "mode": "adaptive"})
+    )
+    assert session.client("ssm", config=adaptive) is not session.client("ssm")
+    assert session.client("ssm", config=adaptive).meta.config.max_pool_connections == AWS_CLIENT_MAX_POOL_CONNECTIONS
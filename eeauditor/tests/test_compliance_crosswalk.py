@@ -0,0 +1,59 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+from . import context
+from processor.compliance_crosswalk import SUPPORTED_FRAMEWORKS, complianceCrosswalk
+
+
+def test_expand_requirements_appends_deduplicated_crosswalk():
+    requirements = ["NIST CSF V1.1 DE.AE-1", "NIST CSF V1.1 DE.AE-1", "NIST SP 800-53 Rev. 4 AC-1"]
+    expanded = complianceCrosswalk.expand_requirements(requirements)
+
+    crosswalked = complianceCrosswalk.nist_csf_v_1_1_controls_crosswalk("NIST CSF V1.1 DE.AE-1")
+    assert crosswalked
+    assert expanded[:3] == requirements
+    assert expanded[3:] == list(dict.fromkeys(crosswalked))
+    # Callers get their own copy and the finding itself is left alone
+    expanded.append("mutated")
+    assert "mutated" not in complianceCrosswalk.expand_requirements(requirements)
+    assert len(requirements) == 3
+
+
+def test_unmapped_subcategory_expands_to_nothing():
+    assert complianceCrosswalk.nist_csf_v_1_1_controls_crosswalk("NIST CSF V1.1 XX.YY-1") == ()
+    assert complianceCrosswalk.expand_requirements(["NIST CSF V1.1 XX.YY-1"]) == ["NIST CSF V1.1 XX.YY-1"]
+
+
+def test_get_standards_matches_prefix_scan():
+    requirements = [
+        "NIST SP 800-53 Rev. 5 AC-4",
+        "NIST CSF V1.1 DE.AE-1",
+        "NIST SP 800-53 Rev. 5 AC-3",
+        "CIS Amazon Web Services Foundations Benchmark V3.0 1.1",
+        "Not A Framework 1.1"
+    ]
+    expected = []
+    for control in requirements:
+        for framework in SUPPORTED_FRAMEWORKS:
+            if control.startswith(framework) and framework not in expected:
+                expected.append(framework)
+
+    assert complianceCrosswalk.get_standards(requirements) == expected
+    assert complianceCrosswalk.get_control_frameworks("Not A Framework 1.1") == ()
@@ -0,0 +1,82 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import json
+
+from . import context
+from processor.compliance_crosswalk import complianceCrosswalk
+from processor.decoded_findings import DecodedFindings, get_decoded_findings
+
+
+def make_finding(index, assetDetails):
+    return {
+        "Id": str(index),
+        "ProductFields": {
+            "Provider": "AWS",
+            "AssetDetails": base64.b64encode(json.dumps(assetDetails).encode("utf-8")).decode("utf-8") if assetDetails else None
+        },
+        "Compliance": {"RelatedRequirements": ["NIST CSF V1.1 DE.AE-1"]}
+    }
+
+
+def test_findings_are_decoded_lazily_and_once():
+    findings = [make_finding(0, {"InstanceId": "i-1"}), make_finding(1, None), {"Id": "2", "ProductFields": {}}]
+    view = DecodedFindings(findings)
+
+    assert view.decoded == [None, None, None]
+    first = view[0]
+    assert first["ProductFields"]["AssetDetails"] == {"InstanceId": "i-1"}
+    assert view.decoded[1] is None
+    assert view[0] is first
+    assert list(view)[1]["ProductFields"]["AssetDetails"] is None
+    assert view[2] is findings[2]
+    assert view[:2][0] is first
+    # the original finding keeps its encoded AssetDetails for the other Outputs
+    assert isinstance(findings[0]["ProductFields"]["AssetDetails"], str)
+
+
+def test_shared_view_is_only_reused_for_the_same_findings():
+    findings = [make_finding(0, None)]
+    view = DecodedFindings(findings)
+
+    assert get_decoded_findings(findings, view) is view
+    assert get_decoded_findings(list(findings), view) is not view
+    assert get_decoded_findings(findings).findings is findings
+
+
+def test_expand_finding_leaves_the_shared_finding_alone():
+    view = DecodedFindings([make_finding(0, None)])
+    expanded = complianceCrosswalk.expand_finding(view[0])
+
+    assert len(expanded["Compliance"]["RelatedRequirements"]) > 1
+    assert view[0]["Compliance"]["RelatedRequirements"] == ["NIST CSF V1.1 DE.AE-1"]
+
+
+def test_shared_asset_details_are_decoded_once():
+    assetDetails = base64.b64encode(json.dumps({"GroupId": "sg-123"}).encode("utf-8"))
+    findings = [
+        {"Id": str(index), "ProductFields": {"AssetDetails": assetDetails}} for index in range(3)
+    ] + [make_finding(3, {"GroupId": "sg-123"})]
+    view = DecodedFindings(findings)
+
+    assert view[0]["ProductFields"]["AssetDetails"] is view[2]["ProductFields"]["AssetDetails"]
+    assert view[3]["ProductFields"]["AssetDetails"] == view[0]["ProductFields"]["AssetDetails"]
+    assert view[3]["ProductFields"]["AssetDetails"] is not view[0]["ProductFields"]["AssetDetails"]
@@ -0,0 +1,165 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+from . import context
+from finding_builder import FindingTemplate, intern_requirements
+from processor.outputs.json_normalized_output import JsonProvider
+
+
+def get_template(**kwargs):
+    return FindingTemplate(
+        title=kwargs.get("title", "[Test.1] Test Assets should be compliant"),
+        types=["Software and Configuration Checks/AWS Security Best Practices"],
+        remediationText="Make the Test Asset compliant",
+        remediationUrl="https://example.com/remediation",
+        relatedRequirements=["NIST CSF V1.1 PR.AC-3", "AICPA TSC CC6.6"],
+        assetClass="Networking",
+        assetService="Amazon VPC",
+        assetComponent="Security Group",
+        resourceType="AwsEc2SecurityGroup"
+    )
+
+def build(template, resourceId, passed):
+    return template.build(
+        findingId=f"{resourceId}/test-check",
+        productArn="arn:aws:securityhub:us-east-1:111111111111:product/111111111111/default",
+        awsAccountId="111111111111",
+        timestamp="2024-01-01T00:00:00+00:00",
+        severity="INFORMATIONAL" if passed else "HIGH",
+        description=f"{resourceId} is compliant" if passed else f"{resourceId} is not compliant",
+        providerAccountId="111111111111",
+        assetRegion="us-east-1",
+        assetDetails=b"e30=",
+        resourceId=resourceId,
+        resourcePartition="aws",
+        resourceRegion="us-east-1",
+        resourceDetails={"AwsEc2SecurityGroup": {"GroupId": resourceId}},
+        passed=passed
+    )
+
+def get_hand_written_finding():
+    return {
+        "SchemaVersion": "2018-10-08",
+        "Id": "sg-1/test-check",
+        "ProductArn": "arn:aws:securityhub:us-east-1:111111111111:product/111111111111/default",
+        "GeneratorId": "sg-1/test-check",
+        "AwsAccountId": "111111111111",
+        "Types": ["Software and Configuration Checks/AWS Security Best Practices"],
+        "FirstObservedAt": "2024-01-01T00:00:00+00:00",
+        "CreatedAt": "2024-01-01T00:00:00+00:00",
+        "UpdatedAt": "2024-01-01T00:00:00+00:00",
+        "Severity": {"Label": "HIGH"},
+        "Confidence": 99,
+        "Title": "[Test.1] Test Assets should be compliant",
+        "Description": "sg-1 is not compliant",
+        "Remediation": {
+            "Recommendation": {
+                "Text": "Make the Test Asset compliant",
+                "Url": "https://example.com/remediation"
+            }
+        },
+        "ProductFields": {
+            "ProductName": "ElectricEye",
+            "Provider": "AWS",
+            "ProviderType": "CSP",
+            "ProviderAccountId": "111111111111",
+            "AssetRegion": "us-east-1",
+            "AssetDetails": b"e30=",
+            "AssetClass": "Networking",
+            "AssetService": "Amazon VPC",
+            "AssetComponent": "Security Group"
+        },
+        "Resources": [
+            {
+                "Type": "AwsEc2SecurityGroup",
+                "Id": "sg-1",
+                "Partition": "aws",
+                "Region": "us-east-1",
+                "Details": {"AwsEc2SecurityGroup": {"GroupId": "sg-1"}}
+            }
+        ],
+        "Compliance": {
+            "Status": "FAILED",
+            "RelatedRequirements": ["NIST CSF V1.1 PR.AC-3", "AICPA TSC CC6.6"]
+        },
+        "Workflow": {"Status": "NEW"},
+        "RecordState": "ACTIVE"
+    }
+
+def test_build_matches_a_hand_written_finding():
+    finding = build(get_template(), "sg-1", passed=False)
+    expected = get_hand_written_finding()
+
+    # Same values and value types (e.g., RelatedRequirements is a list), and the same key order
+    assert finding == expected
+    assert isinstance(finding["Compliance"]["RelatedRequirements"], list)
+    assert list(finding) == list(expected)
+    assert list(finding["ProductFields"]) == list(expected["ProductFields"])
+
+def test_json_normalized_matches_a_hand_written_finding():
+    provider = JsonProvider()
+
+    assert provider.normalize_finding(build(get_template(), "sg-1", passed=False)) == provider.normalize_finding(
+        get_hand_written_finding()
+    )
+
+def test_findings_share_the_static_parts():
+    template = get_template()
+    first = build(template, "sg-1", passed=True)
+    second = build(template, "sg-2", passed=True)
+    failing = build(template, "sg-3", passed=False)
+
+    assert first["Remediation"] is second["Remediation"]
+    assert first["Types"] is second["Types"]
+    assert first["Compliance"] is second["Compliance"]
+    assert first["Compliance"]["Status"] == "PASSED"
+    assert first["Workflow"] == {"Status": "RESOLVED"}
+    assert first["RecordState"] == "ARCHIVED"
+    assert failing["Compliance"]["RelatedRequirements"] is first["Compliance"]["RelatedRequirements"]
+    # Per-resource fields are never shared
+    assert first["ProductFields"] is not second["ProductFields"]
+    assert first["Resources"] is not second["Resources"]
+
+def test_requirements_are_interned_across_templates():
+    requirements = intern_requirements(["NIST CSF V1.1 PR.AC-3", "AICPA TSC CC6.6"])
+
+    assert requirements == ["NIST CSF V1.1 PR.AC-3", "AICPA TSC CC6.6"]
+    assert get_template().relatedRequirements is requirements
+    assert get_template(title="[Test.2] Other").relatedRequirements is requirements
+
+def test_title_override_and_no_resource_details():
+    finding = get_template().build(
+        findingId="acct/test-check",
+        productArn="arn",
+        awsAccountId="111111111111",
+        timestamp="2024-01-01T00:00:00+00:00",
+        severity="LOW",
+        description="test",
+        providerAccountId="111111111111",
+        assetRegion="aws-global",
+        assetDetails=None,
+        resourceId="acct",
+        resourcePartition="aws",
+        resourceRegion="aws-global",
+        title="[Test.9] Generated Title"
+    )
+
+    assert finding["Title"] == "[Test.9] Generated Title"
+    assert "Details" not in finding["Resources"][0]
@@ -0,0 +1,53 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+from . import context
+from processor.outputs.html_compliance_output import JsonProvider, get_control_objectives
+
+
+def test_control_objectives_are_indexed_by_framework_and_control():
+    controlObjectives = get_control_objectives()
+
+    assert get_control_objectives() is controlObjectives
+    assert "CIS Critical Security Controls V8 1.1" in controlObjectives["CIS Critical Security Controls V8"]
+    # techniques and their mitigations share a control title
+    assert len(controlObjectives["MITRE ATT&CK"]["MITRE ATT&CK T1206"]) == 2
+
+
+def test_control_table_joins_objectives_with_asset_data():
+    provider = JsonProvider()
+    processedFindings = [
+        {"ComplianceRelatedRequirements": ["CIS Critical Security Controls V8 1.1", "MITRE ATT&CK T1206"]},
+        {"ComplianceRelatedRequirements": ["MITRE ATT&CK T1206", "CIS Critical Security Controls V8 1.2"]}
+    ]
+    assert provider.get_unique_controls(processedFindings) == [
+        "CIS Critical Security Controls V8 1.1", "MITRE ATT&CK T1206", "CIS Critical Security Controls V8 1.2"
+    ]
+
+    assetData = {"ResourcesImpacted": 2, "PassingControls": 1}
+    table = provider.generate_control_table(
+        "CIS Critical Security Controls V8",
+        {"CIS Critical Security Controls V8 1.1", "CIS Critical Security Controls V8 1.2"},
+        {"CIS Critical Security Controls V8 1.1": assetData}
+    )
+
+    assert [row["ControlTitle"] for row in table] == ["CIS Critical Security Controls V8 1.1"]
+    assert table[0]["ControlDescription"].startswith("Establish and Maintain Detailed Enterprise Asset Inventory")
+    assert table[0]["ResourcesImpacted"] == 2
@@ -0,0 +1,80 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import gzip
+import json
+import re
+
+from . import context
+from processor.outputs import html_output
+from processor.outputs.html_output import HTML_REPORT_COLUMNS, HtmlProvider
+
+
+def make_finding(index, severity, complianceStatus):
+    return {
+        "Id": f"finding-{index}",
+        "CreatedAt": "2022-03-15T10:00:00.000000+00:00",
+        "Severity": {"Label": severity},
+        "Title": "</script><script>alert(1)</script>" if index == 0 else "Example check",
+        "Description": "Example description",
+        "ProductFields": {
+            "Provider": "AWS",
+            "ProviderAccountId": f"11112222333{index % 2}",
+            "AssetRegion": "us-east-1",
+            "AssetClass": "Compute",
+            "AssetService": "Amazon EC2",
+            "AssetComponent": "Instance"
+        },
+        "Resources": [{"Id": f"asset-{index % 3}"}],
+        "RecordState": "ACTIVE",
+        "Compliance": {"Status": complianceStatus}
+    }
+
+
+def test_report_embeds_severity_ordered_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_output, "here", str(tmp_path))
+    monkeypatch.setattr(html_output, "HTML_REPORT_CHUNK_ROWS", 2)
+
+    provider = HtmlProvider()
+    provider.write_batch([make_finding(0, "LOW", "PASSED"), make_finding(1, "CRITICAL", "FAILED"), {"Id": "incomplete"}])
+    provider.write_batch([make_finding(2, "INFORMATIONAL", "PASSED"), make_finding(3, "HIGH", "FAILED")])
+    provider.close("report")
+
+    html = (tmp_path / "report_executive_report.html").read_text()
+    chunks = re.findall(r'class="report-chunk">([^<]*)</script>', html)
+    rows = [row for chunk in chunks for row in json.loads(gzip.decompress(base64.b64decode(chunk)))]
+
+    assert len(chunks) == 2
+    assert [row[0] for row in rows] == ["finding-1", "finding-3", "finding-0", "finding-2"]
+    assert rows[0][1] == "15 March 2022"
+    assert len(rows[0]) == len(HTML_REPORT_COLUMNS)
+    # finding values are only ever embedded encoded, so they cannot break out of the page
+    assert "alert(1)" not in html
+
+
+def test_generate_stats():
+    provider = HtmlProvider()
+    rows = provider.process_data([make_finding(0, "LOW", "PASSED"), make_finding(1, "CRITICAL", "FAILED"), make_finding(2, "LOW", "FAILED")])
+    stats = provider.generate_stats(rows)
+
+    assert "scanned 3 total Assets across 2 Provider Account(s) in 1 Region(s)/Zone(s)" in stats
+    assert "2 failed and 1 passed for an ElectricEye Findings Passing Score of 33.33%" in stats
+    assert "1 Critical, 0 High, 0 Medium, 2 Low, and 0 Informational" in stats
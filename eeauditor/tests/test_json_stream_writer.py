@@ -0,0 +1,48 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import gzip
+import json
+
+from . import context
+from processor.json_stream_writer import JsonStreamWriter
+
+
+def test_array_mode_matches_indented_json_dump(tmp_path):
+    records = [{"Id": "1", "Compliance": {"RelatedRequirements": ["a", "b"]}, "Empty": {}}, {"Id": "2", "List": []}]
+    for expected in (records, records[:1], []):
+        fileName = str(tmp_path / "output.json")
+        writer = JsonStreamWriter(fileName)
+        writer.write_records(expected)
+        assert writer.close() == len(expected)
+
+        with open(fileName) as f:
+            assert f.read() == json.dumps(expected, indent=4)
+
+
+def test_ndjson_mode_writes_one_record_per_line_compressed(tmp_path):
+    writer = JsonStreamWriter(str(tmp_path / "output.json"), ndjson=True, compression="gzip")
+    writer.write({"Id": "1"})
+    writer.write({"Id": "2"})
+    writer.close()
+
+    assert writer.fileName == str(tmp_path / "output.ndjson.gz")
+    with gzip.open(writer.fileName, "rt") as f:
+        assert [json.loads(line) for line in f] == [{"Id": "1"}, {"Id": "2"}]
@@ -0,0 +1,82 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+
+from . import context
+from processor.mongodb_bulk import MongodbBulkUpserter
+from processor.outputs.mongodb_output import MongodbProvider
+
+
+class FakeCollection(object):
+    def __init__(self, failingIds=()):
+        self.failingIds = failingIds
+        self.batches = []
+
+    def bulk_write(self, operations, ordered):
+        assert ordered is False
+        self.batches.append(operations)
+        ids = [op._filter["_id"] for op in operations]
+        failures = [{"index": i, "errmsg": f"bad {_id}"} for i, _id in enumerate(ids) if _id in self.failingIds]
+        details = {"nUpserted": len(ids) - len(failures), "nModified": 0, "nMatched": 0, "writeErrors": failures}
+        if failures:
+            raise BulkWriteError(details)
+        return BulkWriteResult(details, True)
+
+
+def test_documents_are_upserted_in_unordered_batches():
+    collection = FakeCollection()
+    upserter = MongodbBulkUpserter(collection, "Id", batchSize=2)
+    upserter.upsert([{"Id": str(i)} for i in range(5)])
+
+    assert [len(batch) for batch in collection.batches] == [2, 2, 1]
+    assert upserter.upserted == 5
+    assert upserter.failed == 0
+
+
+def test_failures_are_counted_per_batch():
+    collection = FakeCollection(failingIds=("1", "4"))
+    upserter = MongodbBulkUpserter(collection, "Id", batchSize=2)
+    upserter.upsert([{"Id": str(i)} for i in range(5)])
+
+    assert len(collection.batches) == 3
+    assert upserter.failed == 2
+    assert upserter.upserted == 3
+
+
+class FakeClient(object):
+    def close(self):
+        pass
+
+
+def test_provider_close_reports_failed_documents():
+    # skip the TOML and connection setup, the Output writes through an upserter on a fake collection
+    provider = MongodbProvider.__new__(MongodbProvider)
+    provider.client = FakeClient()
+    provider.upserter = MongodbBulkUpserter(FakeCollection(failingIds=("finding-1",)), "Id", batchSize=2)
+    findings = [
+        {"Id": f"finding-{i}", "ProductFields": {}, "Compliance": {"Status": "PASSED", "RelatedRequirements": []}}
+        for i in range(3)
+    ]
+
+    assert provider.write_batch(findings) is True
+    assert provider.close() is False
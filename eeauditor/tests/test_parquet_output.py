@@ -0,0 +1,100 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import json
+
+import pytest
+
+from . import context
+from processor.outputs.parquet_output import ParquetProvider
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def make_finding(index, provider, severity):
+    return {
+        "Id": f"finding-{index}",
+        "ProductArn": "arn:aws:securityhub:us-east-1:111122223333:product/111122223333/default",
+        "Types": ["Software and Configuration Checks"],
+        "FirstObservedAt": "2024-05-01T10:00:00.000000+00:00",
+        "CreatedAt": "2024-05-01T10:00:00.000000+00:00",
+        "UpdatedAt": "2024-05-01T10:00:00.000000+00:00",
+        "Severity": {"Label": severity},
+        "Title": "Example check",
+        "Description": "Example description",
+        "Remediation": {"Recommendation": {"Text": "Fix it", "Url": "https://example.com"}},
+        "ProductFields": {
+            "ProductName": "ElectricEye",
+            "Provider": provider,
+            "ProviderType": "CSP",
+            "ProviderAccountId": "111122223333",
+            "AssetRegion": "us-east-1",
+            "AssetDetails": base64.b64encode(json.dumps({"Index": index}).encode("utf-8")).decode("utf-8"),
+            "AssetClass": "Compute",
+            "AssetService": "Amazon EC2",
+            "AssetComponent": "Instance"
+        },
+        "Resources": [{"Type": "AwsEc2Instance", "Id": f"asset-{index % 2}", "Partition": "aws", "Region": "us-east-1"}],
+        "Compliance": {"Status": "PASSED", "RelatedRequirements": ["NIST CSF V1.1 DE.AE-1"]},
+        "Workflow": {"Status": "RESOLVED"},
+        "RecordState": "ARCHIVED"
+    }
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    tomlFile = tmp_path / "external_providers.toml"
+    tomlFile.write_text(
+        "[outputs.parquet]\n"
+        "parquet_partition_columns = [\"provider\", \"scan_date\"]\n"
+        "parquet_row_group_size = 2\n"
+        "parquet_include_cam = true\n"
+    )
+    monkeypatch.setenv("TOML_FILE_PATH", str(tomlFile))
+    monkeypatch.chdir(tmp_path)
+    return ParquetProvider()
+
+
+def test_findings_are_partitioned_and_written_in_row_groups(provider, tmp_path):
+    provider.write_batch([make_finding(i, "AWS", "LOW") for i in range(3)], "scan")
+    provider.write_batch([make_finding(3, "GCP", "HIGH"), make_finding(4, "AWS", "HIGH")], "scan")
+    provider.close("scan")
+
+    awsFile = pq.ParquetFile(tmp_path / "scan_parquet/findings/provider=AWS/scan_date=2024-05-01" / f"part-{provider.runId}.parquet")
+    assert awsFile.metadata.num_rows == 4
+    assert awsFile.metadata.num_row_groups == 2
+
+    table = awsFile.read()
+    assert "provider" not in table.column_names
+    assert str(table.schema.field("created_at").type) == "timestamp[us, tz=UTC]"
+    row = table.to_pylist()[0]
+    assert row["severity_label"] == "LOW"
+    assert json.loads(row["asset_details"]) == {"Index": 0}
+    assert row["compliance_related_requirements"][0] == "NIST CSF V1.1 DE.AE-1"
+    assert len(row["compliance_related_requirements"]) > 1
+
+    gcpTable = pq.read_table(tmp_path / "scan_parquet/findings/provider=GCP")
+    assert gcpTable.column("id").to_pylist() == ["finding-3"]
+
+    cam = pq.read_table(tmp_path / "scan_parquet/cam").to_pylist()
+    assert [entry["asset_id"] for entry in cam] == ["asset-0", "asset-1"]
+    assert cam[0]["low_severity_findings"] == 2
+    assert cam[1]["high_severity_findings"] == 1
@@ -0,0 +1,42 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+from . import context
+from processor.postgresql_upsert import PostgresqlBulkUpserter
+
+
+def test_merge_statement_keeps_earliest_columns():
+    upserter = PostgresqlBulkUpserter(
+        None,
+        None,
+        "findings",
+        ["id", "first_observed_at", "title"],
+        conflictColumn="id",
+        earliestColumns=["first_observed_at"]
+    )
+    statement = " ".join(upserter.merge_statement().split())
+
+    assert "INSERT INTO findings (id, first_observed_at, title)" in statement
+    assert "SELECT DISTINCT ON (id) id, MIN(first_observed_at) OVER (PARTITION BY id) AS first_observed_at, title" in statement
+    assert "FROM findings_staging ORDER BY id, electriceye_staging_seq DESC" in statement
+    assert "title = excluded.title" in statement
+    assert "WHEN findings.first_observed_at < excluded.first_observed_at THEN findings.first_observed_at" in statement
+    assert "id = excluded.id" not in statement
@@ -0,0 +1,92 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+
+import csv
+import json
+
+from botocore.stub import Stubber
+
+from . import context
+from cloud_utils import AwsSession
+from run_profiler import RunProfiler
+
+
+def fake_check(client):
+    client.get_caller_identity()
+    yield {"Id": "finding-1"}
+    yield None
+    client.get_caller_identity()
+    yield {"Id": "finding-2"}
+
+
+def run_profiled_check(profiler):
+    session = AwsSession(region_name="us-east-1", aws_access_key_id="AKIA", aws_secret_access_key="secret")
+    profiler.register_session(session)
+    client = session.client("sts")
+    with Stubber(client) as stubber:
+        for _ in range(2):
+            stubber.add_response("get_caller_identity", {"Account": "111111111111"})
+        # an API call made outside of any Check
+        stubber.add_response("get_caller_identity", {"Account": "111111111111"})
+        findings = list(profiler.instrument(fake_check(client), "AWS", fake_check, "fake_check", "111111111111", "us-east-1"))
+        client.get_caller_identity()
+
+    return findings
+
+
+def test_instrument_counts_findings_and_api_calls():
+    profiler = RunProfiler()
+    findings = run_profiled_check(profiler)
+
+    assert len(findings) == 3
+    rows = {row["Check"]: row for row in profiler.get_check_rows()}
+    assert rows["fake_check"]["Findings"] == 2
+    assert rows["fake_check"]["ApiCalls"] == 2
+    assert rows["fake_check"]["Auditor"] == "test_run_profiler"
+    assert rows["None"]["ApiCalls"] == 1
+
+
+def test_failures_are_recorded_and_raised():
+    def failing_check():
+        yield {"Id": "finding-1"}
+        raise ValueError("boom")
+
+    profiler = RunProfiler()
+    try:
+        list(profiler.instrument(failing_check(), "AWS", failing_check, "failing_check", "111111111111", "us-east-1"))
+    except ValueError:
+        pass
+
+    assert profiler.get_check_rows()[0]["Failures"] == 1
+
+
+def test_write_report(tmp_path):
+    profiler = RunProfiler()
+    run_profiled_check(profiler)
+
+    profiler.write_report(str(tmp_path / "report.json"))
+    report = json.loads((tmp_path / "report.json").read_text())
+    assert sorted(row["Auditor"] for row in report["Auditors"]) == ["ElectricEye", "test_run_profiler"]
+    assert sum(row["ApiCalls"] for row in report["Regions"]) == 3
+
+    profiler.write_report(str(tmp_path / "report.csv"))
+    with open(tmp_path / "report.csv") as csvfile:
+        assert len(list(csv.DictReader(csvfile))) == 2
@@ -0,0 +1,86 @@
+#This file is part of ElectricEye.
+#SPDX-License-Identifier: Apache-2.0
+
+#Licensed to the Apache Software Foundation (ASF) under one
+#or more contributor license agreements.  See the NOTICE file
+#distributed with this work for additional information
+#regarding copyright ownership.  The ASF licenses this file
+#to you under the Apache License, Version 2.0 (the
+#"License"); you may not use this file except in compliance
+#with the License.  You may obtain a copy of the License at
+
+#http://www.apache.org/licenses/LICENSE-2.0
+
+#Unless required by applicable law or agreed to in writing,
+#software distributed under the License is distributed on an
+#"AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#KIND, either express or implied.  See the License for the
+#specific language governing permissions and limitations
+#under the License.
+
+import base64
+import json
+
+import pytest
+
+from . import context
+from processor.decoded_findings import DecodedFindings
+from processor.outputs.stdout_output import StdoutProvider
+
+
+def make_finding(index):
+    return {
+        "Id": f"finding-{index}",
+        "Title": "Example check",
+        "ProductFields": {
+            "ProductName": "ElectricEye",
+            "Provider": "AWS",
+            "AssetDetails": base64.b64encode(json.dumps({"Index": index}).encode("utf-8")).decode("utf-8")
+        },
+        "Compliance": {"Status": "PASSED", "RelatedRequirements": ["NIST CSF V1.1 DE.AE-1"]}
+    }
+
+
+def get_provider(tmp_path, monkeypatch, toml=""):
+    tomlFile = tmp_path / "external_providers.toml"
+    tomlFile.write_text(toml)
+    monkeypatch.setenv("TOML_FILE_PATH", str(tomlFile))
+    return StdoutProvider()
+
+
+def test_duplicate_ids_are_printed_once_across_batches(tmp_path, monkeypatch, capsys):
+    provider = get_provider(tmp_path, monkeypatch)
+    firstBatch = [make_finding(0), make_finding(1), make_finding(0)]
+    secondBatch = [make_finding(1), make_finding(2)]
+
+    assert provider.write_batch(firstBatch, decodedFindings=DecodedFindings(firstBatch)) is True
+    assert provider.write_batch(secondBatch, decodedFindings=DecodedFindings(secondBatch)) is True
+    assert provider.close() is True
+
+    printed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [finding["Id"] for finding in printed] == ["finding-0", "finding-1", "finding-2"]
+    assert printed[2]["ProductFields"]["AssetDetails"] == {"Index": 2}
+    # The compliance crosswalk is still mapped in
+    assert "NIST CSF V1.1 DE.AE-1" in printed[0]["Compliance"]["RelatedRequirements"]
+
+
+def test_asset_details_can_be_skipped_without_decoding(tmp_path, monkeypatch, capsys):
+    provider = get_provider(
+        tmp_path, monkeypatch, "[outputs.stdout]\nstdout_include_asset_details = false\n"
+    )
+    findings = [make_finding(0)]
+    decodedFindings = DecodedFindings(findings)
+
+    provider.write_findings(findings, output_file="", decodedFindings=decodedFindings)
+
+    printed = json.loads(capsys.readouterr().out)
+    assert "AssetDetails" not in printed["ProductFields"]
+    assert printed["ProductFields"]["Provider"] == "AWS"
+    # Nothing was decoded and the finding itself was not modified
+    assert decodedFindings.decoded == [None]
+    assert "AssetDetails" in findings[0]["ProductFields"]
+
+
+def test_invalid_asset_details_option_exits(tmp_path, monkeypatch):
+    with pytest.raises(SystemExit):
+        get_provider(tmp_path, monkeypatch, "[outputs.stdout]\nstdout_include_asset_details = \"no\"\n")